@@ -0,0 +1,131 @@
+"""Startup-time benchmark for the ``tsa`` command line.
+
+Each probe runs in a fresh interpreter several times and the median wall
+time is compared with its budget; the script exits with status 1 when any
+probe is over budget, printing the slowest imports reported by
+``python -X importtime`` to show what regressed.
+
+Usage::
+
+    uv run python benchmarks/import_time.py [--repeat 7] [--scale 1.0]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import click
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+
+BASELINE = "pass"
+
+# Probe name -> (Python code, budget in seconds). Budgets apply to the time
+# spent on top of a bare interpreter start.
+PROBES: dict[str, tuple[str, float]] = {
+    "import tsa": ("import tsa", 0.05),
+    "import tsa.analysis": ("import tsa.analysis", 0.05),
+    "tsa --help": (
+        "from cli.main import cli; cli(['--help'], standalone_mode=False)",
+        0.1,
+    ),
+}
+
+# Subcommands run by cron/systemd timers: their --help (what a scheduler's
+# dry run pays) must not load pandas, SQLModel or the analysis stack.
+for _command in ("populate-db", "create-tables", "downloader"):
+    PROBES[f"tsa {_command} --help"] = (
+        "from cli.main import cli; "
+        f"cli(['{_command}', '--help'], standalone_mode=False)",
+        0.1,
+    )
+
+
+def _environment() -> dict[str, str]:
+    environment = dict(os.environ)
+    paths = [str(SRC_PATH), environment.get("PYTHONPATH", "")]
+    environment["PYTHONPATH"] = os.pathsep.join(p for p in paths if p)
+    return environment
+
+
+def measure(code: str, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            env=_environment(),
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def slowest_imports(code: str, count: int = 10) -> list[tuple[int, str]]:
+    """Cumulative import time (us) of the slowest top-level imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=_environment(),
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and not name.startswith("   "):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+@click.command()
+@click.option("--repeat", default=7, show_default=True)
+@click.option(
+    "--scale",
+    default=1.0,
+    show_default=True,
+    help="Multiplica todos os orçamentos (máquinas mais lentas).",
+)
+@click.option(
+    "--output",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help="Grava os resultados em JSON.",
+)
+def main(repeat: int, scale: float, output: Path | None) -> None:
+    """Mede o tempo de inicialização da CLI e falha acima do orçamento."""
+    baseline = statistics.median(measure(BASELINE, repeat))
+    click.echo(f"{'python':<22} {baseline * 1000:8.1f} ms  (referência)")
+    results = {}
+    failed = []
+    for name, (code, budget) in PROBES.items():
+        median = statistics.median(measure(code, repeat))
+        own = median - baseline
+        limit = budget * scale
+        results[name] = {"median": median, "own": own, "budget": limit}
+        status = "ok" if own <= limit else "ACIMA DO ORÇAMENTO"
+        click.echo(
+            f"{name:<22} {own * 1000:8.1f} ms  (≤ {limit * 1000:.0f} ms)  {status}"
+        )
+        if own > limit:
+            failed.append(name)
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+    for name in failed:
+        click.echo(f"\nImportações mais lentas em '{name}':")
+        for micros, module in slowest_imports(PROBES[name][0]):
+            click.echo(f"  {micros / 1000:8.1f} ms  {module}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""Ingestion benchmark for ``populate-db``.
+
+Synthetic INMET files (see ``synthetic.py``) are loaded with the same
+functions ``populate-db`` uses, and each stage is timed separately:
+
+* ``encoding``: ``find_encoding``
+* ``metadata``: ``parse_metadata``
+* ``parse``: ``load_observations``
+* ``dimensions``: region, state, city and station lookups/inserts
+* ``insert``: building row dicts and inserting/committing them in chunks
+
+The default backend is the embedded SQLite database (``tsa.database.sqlite``)
+with its bulk-load tuning, so the suite runs anywhere; ``--backend postgres`` uses the
+configured database (prepared with ``tsa create-tables``) and removes the
+synthetic stations afterwards. Results
+are written as JSON so runs can be compared over time.
+
+Usage::
+
+    uv run python benchmarks/ingest.py [--stations 10] [--years 2]
+"""
+
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import click
+
+ROOT_PATH = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_PATH / "src"))
+
+from sqlalchemy import Engine, delete  # noqa: E402
+from sqlmodel import Session, SQLModel, select  # noqa: E402
+from synthetic import generate  # noqa: E402
+
+from cli.create_tables import _load_models  # noqa: E402
+from tsa.database.sqlite import bulk_load, sqlite_engine  # noqa: E402
+from tsa.instrumentation import RunMetrics  # noqa: E402
+
+STAGES = ["encoding", "metadata", "parse", "dimensions", "insert"]
+
+
+def postgres_engine() -> Engine:
+    from tsa import settings
+    from tsa.database.connector import Connector
+
+    return Connector(settings=settings.db).engine
+
+
+def remove_synthetic(session: Session, codes: set[str]) -> None:
+    from tsa.database.models import Observation, Station
+
+    station_ids = session.exec(
+        select(Station.id).where(Station.code.in_(codes))  # type: ignore[attr-defined]
+    ).all()
+    for statement in (
+        delete(Observation).where(Observation.station_id.in_(station_ids)),  # type: ignore[attr-defined]
+        delete(Station).where(Station.id.in_(station_ids)),  # type: ignore[union-attr]
+    ):
+        session.exec(statement)  # type: ignore[call-overload]
+    session.commit()
+
+
+def ingest(
+    session: Session, files: list[Path], metrics: RunMetrics, chunk_size: int
+) -> set[str]:
+    from tsa.database.repositories import ObservationRepository
+    from tsa.ingest import (
+        ensure_city,
+        ensure_region,
+        ensure_state,
+        ensure_station,
+        find_encoding,
+        load_observations,
+        observation_rows,
+        parse_metadata,
+    )
+
+    observations = ObservationRepository(session)
+
+    codes = set()
+    for path in files:
+        size = path.stat().st_size
+        with metrics.span("encoding", size=min(size, 10000)):
+            find_encoding(path)
+        with metrics.span("metadata"):
+            metadata = parse_metadata(path)
+        codes.add(metadata.station_code)
+        with metrics.span("parse", size=size) as parse:
+            frame = load_observations(path)
+            parse.rows += len(frame)
+        with metrics.span("dimensions"):
+            region = ensure_region(session, metadata.region_code)
+            state = ensure_state(session, metadata.state_code, region.id)
+            city_name = metadata.city_name or metadata.station_name
+            city = ensure_city(session, city_name, state.id)
+            station = ensure_station(session, metadata, state.id, city.id)
+        with metrics.span("insert", rows=len(frame)):
+            rows = observation_rows(frame, station.id)
+            for offset in range(0, len(rows), chunk_size):
+                observations.insert_rows(rows[offset : offset + chunk_size])
+                session.commit()
+    return codes
+
+
+def git_commit() -> str | None:
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=ROOT_PATH,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() or None
+
+
+@click.command()
+@click.option("--stations", default=10, show_default=True)
+@click.option("--years", default=2, show_default=True)
+@click.option(
+    "--backend",
+    type=click.Choice(["sqlite", "postgres"]),
+    default="sqlite",
+    show_default=True,
+    help="SQLite embutido ou o Postgres configurado em settings.",
+)
+@click.option("--chunk-size", default=500, show_default=True)
+@click.option("--seed", default=0, show_default=True)
+@click.option(
+    "--data-dir",
+    type=click.Path(path_type=Path, file_okay=False),
+    default=None,
+    help="Reaproveita/grava os CSVs sintéticos aqui em vez de um temporário.",
+)
+@click.option(
+    "--output",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help="Arquivo JSON (padrão: benchmarks/results/ingest-<data>.json).",
+)
+def main(
+    stations: int,
+    years: int,
+    backend: str,
+    chunk_size: int,
+    seed: int,
+    data_dir: Path | None,
+    output: Path | None,
+) -> None:
+    """Mede a vazão de cada etapa da carga com arquivos INMET sintéticos."""
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch_path = Path(scratch)
+        directory = data_dir or scratch_path / "data"
+        start = time.perf_counter()
+        files = sorted(directory.glob("*.CSV")) if data_dir else []
+        if not files:
+            files = generate(
+                directory, stations=stations, years=years, seed=seed
+            )
+        generation = time.perf_counter() - start
+        click.echo(f"{len(files)} arquivos sintéticos em {generation:.1f} s")
+
+        engine = (
+            sqlite_engine(scratch_path / "inmet.db")
+            if backend == "sqlite"
+            else postgres_engine()
+        )
+        if backend == "sqlite":
+            _load_models()
+            SQLModel.metadata.create_all(engine)
+        metrics = RunMetrics("ingest-benchmark")
+        metrics.attach(engine)
+        start = time.perf_counter()
+        with bulk_load(engine), Session(engine) as session:
+            codes = ingest(session, files, metrics, chunk_size)
+        total = time.perf_counter() - start
+        if backend == "postgres":
+            with Session(engine) as session:
+                remove_synthetic(session, codes)
+        engine.dispose()
+
+    rows = metrics.stages["insert"].rows
+    click.echo(f"{'etapa':<12} {'s':>9} {'linhas/s':>12} {'MB/s':>9}")
+    for name in STAGES:
+        summary = metrics.stages[name].summary()
+        rate = summary.get("rows_per_second", 0.0)
+        throughput = summary.get("bytes_per_second", 0.0) / 1e6
+        click.echo(
+            f"{name:<12} {summary['seconds']:9.3f} "
+            f"{rate if summary['rows'] else 0:12.0f} {throughput:9.2f}"
+        )
+    click.echo(f"{'total':<12} {total:9.3f} {rows / total:12.0f}")
+
+    results = {
+        "benchmark": "ingest",
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "stations": stations,
+            "years": years,
+            "files": len(files),
+            "backend": backend,
+            "chunk_size": chunk_size,
+            "seed": seed,
+        },
+        "generation_seconds": generation,
+        "total": {
+            "seconds": total,
+            "rows": rows,
+            "rows_per_second": rows / total if total else None,
+        },
+        "stages": {name: metrics.stages[name].summary() for name in STAGES},
+    }
+    if output is None:
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S")
+        output = ROOT_PATH / "benchmarks" / "results" / f"ingest-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    click.echo(f"Resultados gravados em {output}")
+
+
+if __name__ == "__main__":
+    main()
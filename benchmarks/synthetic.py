@@ -0,0 +1,236 @@
+"""Synthetic INMET station files for benchmarks.
+
+The files mimic the yearly CSVs of the INMET historical archive: an 8-line
+latin-1 metadata header, ``;`` separators, comma decimals, ``-9999`` for
+missing readings, radiation missing at night, multi-hour outages and the
+``INMET_<region>_<uf>_<code>_<city>_<start>_A_<end>.CSV`` naming that
+``infer_city_name`` relies on. Station codes start with ``Z``, which the
+archive does not use, so synthetic stations never collide with real ones.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+HEADER = [
+    "DATA (YYYY-MM-DD)",
+    "HORA (UTC)",
+    "PRECIPITAÇÃO TOTAL, HORÁRIO (mm)",
+    "PRESSAO ATMOSFERICA AO NIVEL DA ESTACAO, HORARIA (mB)",
+    "PRESSÃO ATMOSFERICA MAX.NA HORA ANT. (AUT) (mB)",
+    "PRESSÃO ATMOSFERICA MIN. NA HORA ANT. (AUT) (mB)",
+    "RADIACAO GLOBAL (KJ/m²)",
+    "TEMPERATURA DO AR - BULBO SECO, HORARIA (°C)",
+    "TEMPERATURA DO PONTO DE ORVALHO (°C)",
+    "TEMPERATURA MÁXIMA NA HORA ANT. (AUT) (°C)",
+    "TEMPERATURA MÍNIMA NA HORA ANT. (AUT) (°C)",
+    "TEMPERATURA ORVALHO MAX. NA HORA ANT. (AUT) (°C)",
+    "TEMPERATURA ORVALHO MIN. NA HORA ANT. (AUT) (°C)",
+    "UMIDADE REL. MAX. NA HORA ANT. (AUT) (%)",
+    "UMIDADE REL. MIN. NA HORA ANT. (AUT) (%)",
+    "UMIDADE RELATIVA DO AR, HORARIA (%)",
+    "VENTO, DIREÇÃO HORARIA (gr) (° (gr))",
+    "VENTO, RAJADA MAXIMA (m/s)",
+    "VENTO, VELOCIDADE HORARIA (m/s)",
+]
+
+STATES = [
+    ("N", "AM"),
+    ("N", "PA"),
+    ("NE", "BA"),
+    ("NE", "CE"),
+    ("NE", "PE"),
+    ("CO", "DF"),
+    ("CO", "GO"),
+    ("CO", "MT"),
+    ("SE", "MG"),
+    ("SE", "RJ"),
+    ("SE", "SP"),
+    ("S", "PR"),
+    ("S", "RS"),
+    ("S", "SC"),
+]
+
+CITIES = [
+    "SAO PAULO - MIRANTE",
+    "BRASILIA",
+    "BELO HORIZONTE - PAMPULHA",
+    "PORTO ALEGRE",
+    "MANAUS",
+    "SALVADOR",
+    "CAMPOS DO JORDAO",
+    "SAO JOSE DOS CAMPOS",
+    "FLORIANOPOLIS",
+    "GOIANIA",
+    "RECIFE",
+    "CURITIBA",
+]
+
+
+@dataclass(frozen=True)
+class SyntheticStation:
+    region: str
+    state: str
+    code: str
+    name: str
+    latitude: float
+    longitude: float
+    altitude: float
+    founded: str
+
+
+def make_stations(count: int, seed: int = 0) -> list[SyntheticStation]:
+    rng = np.random.default_rng(seed)
+    stations = []
+    for index in range(count):
+        region, state = STATES[index % len(STATES)]
+        city = CITIES[index % len(CITIES)]
+        name = city if index < len(CITIES) else f"{city} {index // len(CITIES)}"
+        stations.append(
+            SyntheticStation(
+                region=region,
+                state=state,
+                code=f"Z{index + 1:03d}",
+                name=name,
+                latitude=float(rng.uniform(-33.0, 4.0)),
+                longitude=float(rng.uniform(-73.0, -35.0)),
+                altitude=float(rng.uniform(0.0, 1600.0)),
+                founded="2000-05-07",
+            )
+        )
+    return stations
+
+
+def _decimal(value: float) -> str:
+    return f"{value:.8f}".rstrip("0").replace(".", ",")
+
+
+def metadata_lines(station: SyntheticStation) -> list[str]:
+    return [
+        f"REGIÃO:;{station.region}",
+        f"UF:;{station.state}",
+        f"ESTAÇÃO:;{station.name}",
+        f"CODIGO (WMO):;{station.code}",
+        f"LATITUDE:;{_decimal(station.latitude)}",
+        f"LONGITUDE:;{_decimal(station.longitude)}",
+        f"ALTITUDE:;{_decimal(station.altitude)}",
+        f"DATA DE FUNDAÇÃO (YYYY-MM-DD):;{station.founded}",
+    ]
+
+
+def file_name(station: SyntheticStation, year: int) -> str:
+    return (
+        f"INMET_{station.region}_{station.state}_{station.code}_"
+        f"{station.name}_01-01-{year}_A_31-12-{year}.CSV"
+    )
+
+
+def simulate(
+    station: SyntheticStation,
+    year: int,
+    rng: np.random.Generator,
+    *,
+    outages: float = 3.0,
+    missing: float = 0.01,
+) -> pd.DataFrame:
+    """One year of plausible hourly readings, ``NaN`` where missing."""
+    times = pd.date_range(f"{year}-01-01", f"{year + 1}-01-01", freq="h")[:-1]
+    n = len(times)
+    hour = times.hour.to_numpy()
+    day = times.dayofyear.to_numpy()
+    # Local solar time is about three hours behind UTC in Brazil.
+    solar = np.sin(2 * np.pi * (hour - 3 - 9) / 24)
+    season = np.cos(2 * np.pi * (day - 15) / 365.25)
+
+    temperature = (
+        24
+        - station.altitude / 160
+        + 4 * season
+        + 5 * solar
+        + rng.normal(0, 1, n)
+    )
+    spread = np.clip(4 + 3 * solar + rng.normal(0, 1, n), 0.2, None)
+    dew_point = temperature - spread
+    humidity = np.clip(100 * np.exp(-0.06 * spread), 10, 100)
+    pressure = 1013 - station.altitude / 8.3 + rng.normal(0, 1.5, n)
+    speed = rng.gamma(2.0, 1.2, n)
+    rain = np.where(rng.random(n) < 0.06, rng.exponential(2.5, n), 0.0)
+    radiation = np.where(
+        solar > 0, 3500 * solar * rng.uniform(0.3, 1.0, n), np.nan
+    )
+
+    data = {
+        "precipitation": rain,
+        "pressure": pressure,
+        "pressure_max": pressure + rng.uniform(0, 0.8, n),
+        "pressure_min": pressure - rng.uniform(0, 0.8, n),
+        "radiation": radiation,
+        "temperature": temperature,
+        "dew_point": dew_point,
+        "temperature_max": temperature + rng.uniform(0, 1.2, n),
+        "temperature_min": temperature - rng.uniform(0, 1.2, n),
+        "dew_point_max": dew_point + rng.uniform(0, 1, n),
+        "dew_point_min": dew_point - rng.uniform(0, 1, n),
+        "humidity_max": np.minimum(humidity + rng.uniform(0, 4, n), 100),
+        "humidity_min": np.maximum(humidity - rng.uniform(0, 4, n), 5),
+        "humidity": humidity,
+        "direction": rng.uniform(0, 360, n),
+        "gust": speed * rng.uniform(1.3, 2.5, n),
+        "speed": speed,
+    }
+    frame = pd.DataFrame(data)
+    values = frame.to_numpy()
+    values[rng.random(values.shape) < missing] = np.nan
+    for _ in range(rng.poisson(outages)):
+        start = int(rng.integers(0, n))
+        length = int(rng.geometric(1 / 72))
+        values[start : start + length] = np.nan
+    frame = pd.DataFrame(values.round(1), columns=list(data))
+    frame.insert(0, "hour", times.strftime("%H:%M"))
+    frame.insert(0, "date", times.strftime("%Y-%m-%d"))
+    return frame
+
+
+def write_station_year(
+    directory: Path,
+    station: SyntheticStation,
+    year: int,
+    rng: np.random.Generator,
+    **options: float,
+) -> Path:
+    path = directory / file_name(station, year)
+    frame = simulate(station, year, rng, **options)
+    body = frame.to_csv(
+        sep=";",
+        decimal=",",
+        na_rep="-9999",
+        header=False,
+        index=False,
+        lineterminator=";\n",
+    )
+    lines = [*metadata_lines(station), ";".join(HEADER) + ";"]
+    with path.open("w", encoding="latin-1", newline="") as fp:
+        fp.write("\n".join(lines) + "\n")
+        fp.write(body)
+    return path
+
+
+def generate(
+    directory: Path,
+    *,
+    stations: int,
+    years: int,
+    first_year: int = 2001,
+    seed: int = 0,
+    **options: float,
+) -> list[Path]:
+    """Write ``stations * years`` files into ``directory``."""
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    return [
+        write_station_year(directory, station, year, rng, **options)
+        for station in make_stations(stations, seed)
+        for year in range(first_year, first_year + years)
+    ]
@@ -0,0 +1,5 @@
+from tsa.logger import configure_logging
+
+# Every command line entry point imports this package first, so this is
+# where the application's logging gets configured.
+configure_logging()
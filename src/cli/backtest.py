@@ -0,0 +1,173 @@
+from datetime import datetime
+
+import click
+
+from tsa import settings
+from tsa.analysis.backtesting import (
+    WINDOWS,
+    Backtester,
+    BacktestModel,
+    BacktestPlan,
+    StructuralSpec,
+)
+from tsa.analysis.model_selection import SarimaOrder
+from tsa.database.connector import Connector
+from tsa.database.models import OBSERVATION_VARIABLES
+from tsa.database.repositories import (
+    BacktestFoldRepository,
+    ObservationRepository,
+    StationRepository,
+)
+
+
+def _ints(value: str, size: int) -> tuple[int, ...]:
+    parts = tuple(int(part) for part in value.split(","))
+    if len(parts) != size:
+        raise click.BadParameter(f"Esperados {size} inteiros em {value!r}.")
+    return parts
+
+
+@click.command()
+@click.option("--run", "run_name", required=True, help="Nome da rodada.")
+@click.option(
+    "--station",
+    "-s",
+    "station_codes",
+    multiple=True,
+    help="Código(s) das estações (padrão: todas).",
+)
+@click.option(
+    "--variable",
+    "-v",
+    type=click.Choice(OBSERVATION_VARIABLES),
+    default="air_temperature",
+    show_default=True,
+)
+@click.option("--start", type=click.DateTime(), required=True)
+@click.option(
+    "--end",
+    type=click.DateTime(),
+    required=True,
+    help="Fim (exclusivo) do período avaliado.",
+)
+@click.option(
+    "--model",
+    type=click.Choice(["sarima", "structural"]),
+    default="sarima",
+    show_default=True,
+)
+@click.option(
+    "--order", default="1,0,1", show_default=True, help="Ordem p,d,q."
+)
+@click.option(
+    "--seasonal-order",
+    default="1,0,1,24",
+    show_default=True,
+    help="Ordem sazonal P,D,Q,s.",
+)
+@click.option(
+    "--horizon",
+    "-h",
+    default=48,
+    show_default=True,
+    help="Horizonte de previsão (horas).",
+)
+@click.option(
+    "--step",
+    default=24,
+    show_default=True,
+    help="Horas entre origens consecutivas.",
+)
+@click.option(
+    "--initial-days",
+    default=365.0,
+    show_default=True,
+    help="Histórico antes da primeira origem (dias).",
+)
+@click.option(
+    "--window",
+    type=click.Choice(WINDOWS),
+    default="expanding",
+    show_default=True,
+)
+@click.option(
+    "--window-days",
+    type=float,
+    default=None,
+    help="Tamanho da janela móvel (padrão: --initial-days).",
+)
+@click.option(
+    "--refit-every",
+    default=30,
+    show_default=True,
+    help="Origens que compartilham um mesmo ajuste de parâmetros.",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Número de processos (padrão: número de CPUs).",
+)
+def main(
+    run_name: str,
+    station_codes: tuple[str, ...],
+    variable: str,
+    start: datetime,
+    end: datetime,
+    model: str,
+    order: str,
+    seasonal_order: str,
+    horizon: int,
+    step: int,
+    initial_days: float,
+    window: str,
+    window_days: float | None,
+    refit_every: int,
+    workers: int | None,
+) -> None:
+    """Avalia previsões em origens móveis (MAE, RMSE, CRPS), retomável."""
+    connector = Connector(settings=settings.db)
+    spec: BacktestModel = StructuralSpec()
+    if model == "sarima":
+        spec = SarimaOrder(*_ints(order, 3), *_ints(seasonal_order, 4))
+    plan = BacktestPlan(
+        initial_days=initial_days,
+        step_hours=step,
+        horizon=horizon,
+        window=window,  # type: ignore[arg-type]
+        window_days=window_days,
+        refit_every=refit_every,
+    )
+
+    with connector.get_session() as session:
+        codes = {
+            station.id: station.code
+            for station in StationRepository(session).list()
+            if station.id is not None
+            and (not station_codes or station.code in station_codes)
+        }
+        folds = BacktestFoldRepository(session)
+        backtester = Backtester(
+            ObservationRepository(session),
+            folds,
+            plan=plan,
+            max_workers=workers,
+        )
+        try:
+            backtester.run(
+                run_name, list(codes), variable, spec, start=start, end=end
+            )
+        except ValueError as e:
+            raise click.ClickException(str(e)) from e
+        summary = folds.summary(run_name)
+
+    for station_id, name, label, count, mae, rmse, crps in summary:
+        if count == 0:
+            click.echo(
+                f"{codes.get(station_id, station_id)} {name} {label}: sem dobras avaliadas."
+            )
+            continue
+        click.echo(
+            f"{codes.get(station_id, station_id)} {name} {label}: {count} dobras, "
+            f"MAE={mae:.3f} RMSE={rmse:.3f} CRPS={crps:.3f}"
+        )
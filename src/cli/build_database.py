@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import click
+
+from tsa import settings
+
+
+@click.command()
+@click.option(
+    "--data-dir",
+    type=click.Path(path_type=Path, file_okay=False),
+    default=settings.data_path,
+    show_default=True,
+    help="Diretório com os arquivos CSV do INMET.",
+)
+@click.option(
+    "--pattern",
+    default="*.CSV",
+    show_default=True,
+    help="Padrão glob utilizado para selecionar os arquivos.",
+)
+@click.option(
+    "--drop/--no-drop",
+    default=False,
+    show_default=True,
+    help="Se deve dropar as tabelas existentes antes de criar novas.",
+)
+@click.pass_context
+def main(ctx: click.Context, data_dir: Path, pattern: str, drop: bool) -> None:
+    """Cria as tabelas e popula o banco a partir dos CSVs."""
+    from cli import create_tables, populate_database
+
+    ctx.invoke(create_tables.main, drop=drop)
+    ctx.invoke(populate_database.main, data_dir=data_dir, pattern=pattern)
@@ -0,0 +1,67 @@
+import click
+
+from tsa import settings
+from tsa.analysis.climatology import ClimatologyStore, ReferencePeriod
+from tsa.database.connector import Connector
+from tsa.database.models import OBSERVATION_VARIABLES
+from tsa.database.repositories import ObservationRepository, StationRepository
+
+
+@click.command()
+@click.option(
+    "--station",
+    "-s",
+    "station_codes",
+    multiple=True,
+    help="Código(s) das estações (padrão: todas).",
+)
+@click.option(
+    "--variable",
+    "-v",
+    type=click.Choice(OBSERVATION_VARIABLES),
+    multiple=True,
+    default=["air_temperature"],
+    show_default=True,
+)
+@click.option("--start-year", default=2001, show_default=True)
+@click.option("--end-year", default=2020, show_default=True)
+@click.option(
+    "--window-days",
+    default=7,
+    show_default=True,
+    help="Dias de cada lado agrupados no cálculo das normais.",
+)
+@click.option(
+    "--rebuild/--no-rebuild",
+    default=False,
+    show_default=True,
+    help="Descarta o cache e recalcula todo o período de referência.",
+)
+def main(
+    station_codes: tuple[str, ...],
+    variable: tuple[str, ...],
+    start_year: int,
+    end_year: int,
+    window_days: int,
+    rebuild: bool,
+) -> None:
+    """Calcula ou atualiza as normais climatológicas das estações."""
+    connector = Connector(settings=settings.db)
+    period = ReferencePeriod(start_year, end_year)
+
+    with connector.get_session() as session:
+        station_ids = [
+            station.id
+            for station in StationRepository(session).list()
+            if station.id is not None
+            and (not station_codes or station.code in station_codes)
+        ]
+        store = ClimatologyStore(
+            ObservationRepository(session), window_days=window_days
+        )
+        for name in variable:
+            store.refresh(station_ids, name, period, rebuild=rebuild)
+    click.echo(
+        f"Normais {start_year}-{end_year} atualizadas para "
+        f"{len(station_ids)} estações."
+    )
@@ -0,0 +1,98 @@
+from datetime import datetime
+from pathlib import Path
+
+import click
+import numpy as np
+
+from tsa import settings
+from tsa.analysis.climatology import ClimatologyStore, ReferencePeriod
+from tsa.analysis.covariance import NetworkCovariance
+from tsa.database.connector import Connector
+from tsa.database.models import OBSERVATION_VARIABLES
+from tsa.database.repositories import ObservationRepository, StationRepository
+
+
+@click.command()
+@click.option(
+    "--variable",
+    "-v",
+    type=click.Choice(OBSERVATION_VARIABLES),
+    default="air_temperature",
+    show_default=True,
+)
+@click.option("--start", type=click.DateTime(), required=True)
+@click.option("--end", type=click.DateTime(), required=True)
+@click.option(
+    "--anomalies/--no-anomalies",
+    default=True,
+    show_default=True,
+    help="Usa anomalias em relação às normais climatológicas.",
+)
+@click.option("--start-year", default=2001, show_default=True)
+@click.option("--end-year", default=2020, show_default=True)
+@click.option(
+    "--chunk-days",
+    default=90,
+    show_default=True,
+    help="Tamanho dos blocos de tempo processados de uma vez (dias).",
+)
+@click.option(
+    "--rebuild/--no-rebuild",
+    default=False,
+    show_default=True,
+    help="Descarta o estado salvo e recalcula todo o período.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=settings.data_path / "correlation.npz",
+    show_default=True,
+    help="Arquivo .npz de saída.",
+)
+def main(
+    variable: str,
+    start: datetime,
+    end: datetime,
+    anomalies: bool,
+    start_year: int,
+    end_year: int,
+    chunk_days: int,
+    rebuild: bool,
+    output: Path,
+) -> None:
+    """Atualiza as matrizes de covariância e correlação entre estações."""
+    connector = Connector(settings=settings.db)
+
+    with connector.get_session() as session:
+        observations = ObservationRepository(session)
+        station_ids = [
+            station.id
+            for station in StationRepository(session).list()
+            if station.id is not None
+        ]
+        normals = None
+        if anomalies:
+            # Normals are binned in the same time chunks as the covariance
+            # pass, so neither ever holds the whole period in memory.
+            normals = ClimatologyStore(
+                observations, chunk_days=chunk_days
+            ).normals(
+                station_ids, variable, ReferencePeriod(start_year, end_year)
+            )
+        moments = NetworkCovariance(observations, chunk_days=chunk_days).update(
+            station_ids,
+            variable,
+            start=start,
+            end=end,
+            normals=normals,
+            rebuild=rebuild,
+        )
+    np.savez(
+        output,
+        station_ids=np.array(moments.station_ids),
+        count=moments.count,
+        covariance=moments.covariance(),
+        correlation=moments.correlation(),
+    )
+    click.echo(f"Matrizes de {len(station_ids)} estações salvas em {output}.")
@@ -2,15 +2,12 @@ from importlib import import_module
 from pkgutil import iter_modules
 
 import click
-from sqlmodel import Session, SQLModel, text
-
-from tsa import settings
-from tsa.database import models
-from tsa.database.connector import Connector
 
 
 def _load_models() -> None:
     """Ensure every model under tsa.database.model is imported."""
+    from tsa.database import models
+
     prefix = f"{models.__name__}."
     for module in iter_modules(models.__path__, prefix):
         import_module(module.name)
@@ -25,13 +22,21 @@ def _load_models() -> None:
 )
 def main(drop: bool) -> None:
     """Create every table declared in the SQLModel models."""
+    from sqlmodel import Session, SQLModel, text
+
+    from tsa import settings
+    from tsa.database.connector import Connector
+
     connector = Connector(settings=settings.db)
+    engine = connector.engine
 
     _load_models()
-    with Session(connector.engine) as session:
-        session.exec(text("CREATE SCHEMA IF NOT EXISTS inmet"))
-        session.commit()
+    # On SQLite the schema is the attached database file itself.
+    if not connector.is_sqlite:
+        with Session(engine) as session:
+            session.exec(text("CREATE SCHEMA IF NOT EXISTS inmet"))
+            session.commit()
     if drop:
-        SQLModel.metadata.drop_all(bind=connector.engine)
-    SQLModel.metadata.create_all(bind=connector.engine)
+        SQLModel.metadata.drop_all(bind=engine)
+    SQLModel.metadata.create_all(bind=engine)
     click.echo("Tabelas criadas com sucesso.")
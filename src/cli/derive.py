@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import click
+
+from tsa import settings
+from tsa.analysis.derived import DERIVED_VARIABLES, DerivedStage
+from tsa.database.connector import Connector
+from tsa.database.repositories import (
+    DerivedValueRepository,
+    ObservationRepository,
+    StationRepository,
+)
+
+
+@click.command()
+@click.option(
+    "--station",
+    "-s",
+    "station_codes",
+    multiple=True,
+    help="Código(s) das estações (padrão: todas).",
+)
+@click.option(
+    "--variable",
+    "-v",
+    type=click.Choice(list(DERIVED_VARIABLES)),
+    multiple=True,
+    help="Variável(is) derivada(s) (padrão: todas).",
+)
+@click.option("--start", type=click.DateTime(), default=None)
+@click.option("--end", type=click.DateTime(), default=None)
+@click.option(
+    "--chunk-days",
+    default=30,
+    show_default=True,
+    help="Tamanho dos blocos de tempo processados de uma vez (dias).",
+)
+def main(
+    station_codes: tuple[str, ...],
+    variable: tuple[str, ...],
+    start: datetime | None,
+    end: datetime | None,
+    chunk_days: int,
+) -> None:
+    """Recalcula as variáveis derivadas a partir das observações existentes."""
+    connector = Connector(settings=settings.db)
+
+    with connector.get_session() as session:
+        station_ids = [
+            station.id
+            for station in StationRepository(session).list()
+            if station.id is not None
+            and (not station_codes or station.code in station_codes)
+        ]
+        stage = DerivedStage(
+            ObservationRepository(session),
+            DerivedValueRepository(session),
+            names=variable or None,
+            chunk_days=chunk_days,
+        )
+        total = stage.backfill(station_ids, start=start, end=end)
+        click.echo(f"{total} valores derivados gravados.")
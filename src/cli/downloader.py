@@ -3,16 +3,15 @@ import zipfile
 from pathlib import Path
 
 import click
-import httpx
 
-from tsa import Logger, settings
-
-logger = Logger(__name__, level=logging.INFO)
+logger = logging.getLogger(__name__)
 ALL_YEARS: int = -1
 
 
 def download_file(url: str, dest_path: Path) -> None:
     """Download a file from a URL to a local destination."""
+    import httpx
+
     with httpx.stream("GET", url) as response:
         response.raise_for_status()
         with open(dest_path, "wb") as file:
@@ -22,6 +21,8 @@ def download_file(url: str, dest_path: Path) -> None:
 
 def unzip_file(zip_path: Path, extract_to: Path) -> None:
     """Unzip only the files that match the configured station name."""
+    from tsa import settings
+
     with zipfile.ZipFile(zip_path, "r") as zip_ref:
         station_files = [
             zip_info
@@ -38,6 +39,8 @@ def unzip_file(zip_path: Path, extract_to: Path) -> None:
 
 
 def download_and_unzip(url: str) -> None:
+    from tsa import settings
+
     file_name = Path(url).name
     dest_path = settings.data_path / file_name
     try:
@@ -68,6 +71,7 @@ def download_and_unzip(url: str) -> None:
     show_default=False,
 )
 def main(year: int = ALL_YEARS) -> None:
+    """Baixa os dados históricos do INMET."""
     years: list[int]
     if year == ALL_YEARS:
         download_all: bool = click.prompt(
@@ -89,11 +93,11 @@ def main(year: int = ALL_YEARS) -> None:
 
     for year in years:
         try:
-            logger.info(f"Baixando dados do ano {year}...")
+            logger.info("Baixando dados do ano %s...", year)
             url = f"https://portal.inmet.gov.br/uploads/dadoshistoricos/{year}.zip"
             download_and_unzip(url)
             logger.info(
-                f"Dados do ano {year} baixados e extraídos com sucesso."
+                "Dados do ano %s baixados e extraídos com sucesso.", year
             )
         except FileNotFoundError:
             continue
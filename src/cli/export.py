@@ -0,0 +1,76 @@
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+from tsa import settings
+from tsa.database.connector import Connector
+from tsa.export import ObservationExporter
+
+
+@click.command()
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["parquet", "csv"]),
+    default="parquet",
+    show_default=True,
+    help="Parquet (zstd) ou CSV compactado com gzip.",
+)
+@click.option("--state", "-s", multiple=True, help="Sigla da UF (repetível).")
+@click.option("--region", "-r", multiple=True, help="Código da região.")
+@click.option("--station", multiple=True, help="Código da estação.")
+@click.option("--start", type=click.DateTime(), default=None)
+@click.option("--end", type=click.DateTime(), default=None)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path, file_okay=False),
+    default=settings.data_path / "export",
+    show_default=True,
+    help="Diretório de saída; exportações interrompidas são retomadas.",
+)
+@click.option("--workers", "-j", default=4, show_default=True)
+@click.option(
+    "--batch-size",
+    default=50_000,
+    show_default=True,
+    help="Linhas lidas do banco por vez em cada worker.",
+)
+def main(
+    fmt: str,
+    state: tuple[str, ...],
+    region: tuple[str, ...],
+    station: tuple[str, ...],
+    start: datetime | None,
+    end: datetime | None,
+    output: Path,
+    workers: int,
+    batch_size: int,
+) -> None:
+    """Exporta observações por estado, região e período (Parquet/CSV)."""
+    connector = Connector(settings=settings.db)
+    exporter = ObservationExporter(
+        connector.engine,
+        output,
+        fmt=fmt,  # type: ignore[arg-type]
+        workers=workers,
+        batch_size=batch_size,
+    )
+    tasks = exporter.plan(
+        station_codes=station,
+        state_codes=[code.upper() for code in state],
+        region_codes=[code.upper() for code in region],
+        start=start,
+        end=end,
+    )
+    if not tasks:
+        raise click.ClickException("Nenhuma observação para os filtros dados.")
+    summary = exporter.run(tasks)
+    click.echo(
+        f"{summary.written} arquivos gravados ({summary.rows} linhas), "
+        f"{summary.skipped} já existentes, {summary.failed} com erro "
+        f"em {output}."
+    )
+    if summary.failed:
+        raise SystemExit(1)
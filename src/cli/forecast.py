@@ -0,0 +1,97 @@
+import csv
+from pathlib import Path
+
+import click
+
+from tsa import settings
+from tsa.analysis.forecasting import ModelRegistry
+from tsa.database.connector import Connector
+from tsa.database.models import OBSERVATION_VARIABLES
+from tsa.database.repositories import (
+    FittedModelRepository,
+    ObservationRepository,
+    StationRepository,
+)
+
+
+@click.command()
+@click.option(
+    "--variable",
+    "-v",
+    type=click.Choice(OBSERVATION_VARIABLES),
+    default="air_temperature",
+    show_default=True,
+    help="Variável prevista.",
+)
+@click.option(
+    "--station",
+    "-s",
+    "station_codes",
+    multiple=True,
+    help="Código(s) das estações (padrão: todas com modelo registrado).",
+)
+@click.option(
+    "--horizon",
+    "-h",
+    default=48,
+    show_default=True,
+    help="Horizonte de previsão (horas).",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=settings.data_path / "forecasts.csv",
+    show_default=True,
+    help="Arquivo CSV de saída.",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Número de processos (padrão: número de CPUs).",
+)
+def main(
+    variable: str,
+    station_codes: tuple[str, ...],
+    horizon: int,
+    output: Path,
+    workers: int | None,
+) -> None:
+    """Gera previsões a partir dos modelos registrados, sem reajustá-los."""
+    connector = Connector(settings=settings.db)
+
+    with connector.get_session() as session:
+        stations = StationRepository(session)
+        codes = {
+            station.id: station.code
+            for station in stations.list()
+            if station.id is not None
+        }
+        station_ids = None
+        if station_codes:
+            by_code = {code: station_id for station_id, code in codes.items()}
+            missing = set(station_codes) - set(by_code)
+            if missing:
+                raise click.BadParameter(
+                    f"Estações não encontradas: {sorted(missing)}"
+                )
+            station_ids = [by_code[code] for code in station_codes]
+
+        registry = ModelRegistry(
+            FittedModelRepository(session), ObservationRepository(session)
+        )
+        forecasts = registry.forecast(
+            variable, horizon, station_ids=station_ids, max_workers=workers
+        )
+
+    with output.open("w", newline="") as fp:
+        writer = csv.writer(fp)
+        writer.writerow(["station", "datetime", variable, "std"])
+        for forecast in forecasts:
+            code = codes[forecast.station_id]
+            for time, mean, std in zip(
+                forecast.times, forecast.mean, forecast.std
+            ):
+                writer.writerow([code, str(time), f"{mean:.4f}", f"{std:.4f}"])
+    click.echo(f"{len(forecasts)} previsões salvas em {output}.")
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import click
+
+from tsa import settings
+from tsa.analysis.imputation import Imputer
+from tsa.database.connector import Connector
+from tsa.database.models import OBSERVATION_VARIABLES
+from tsa.database.repositories import (
+    ImputedValueRepository,
+    ObservationRepository,
+    StationRepository,
+)
+
+
+@click.command()
+@click.option(
+    "--station",
+    "-s",
+    "station_codes",
+    multiple=True,
+    help="Código(s) das estações (padrão: todas).",
+)
+@click.option(
+    "--variable",
+    "-v",
+    type=click.Choice(OBSERVATION_VARIABLES),
+    multiple=True,
+    default=["air_temperature"],
+    show_default=True,
+    help="Variável(is) a imputar.",
+)
+@click.option("--start", type=click.DateTime(), required=True)
+@click.option("--end", type=click.DateTime(), required=True)
+@click.option(
+    "--neighbours",
+    "-k",
+    default=5,
+    show_default=True,
+    help="Número de estações vizinhas consideradas.",
+)
+@click.option(
+    "--max-distance",
+    default=150.0,
+    show_default=True,
+    help="Distância máxima até uma estação vizinha (km).",
+)
+@click.option(
+    "--max-gap",
+    default=3,
+    show_default=True,
+    help="Maior lacuna (horas) preenchida por interpolação temporal.",
+)
+@click.option(
+    "--chunk-days",
+    default=90,
+    show_default=True,
+    help="Tamanho dos blocos de tempo processados de uma vez (dias).",
+)
+def main(
+    station_codes: tuple[str, ...],
+    variable: tuple[str, ...],
+    start: datetime,
+    end: datetime,
+    neighbours: int,
+    max_distance: float,
+    max_gap: int,
+    chunk_days: int,
+) -> None:
+    """Imputa lacunas usando interpolação temporal e estações vizinhas."""
+    connector = Connector(settings=settings.db)
+
+    with connector.get_session() as session:
+        stations = StationRepository(session)
+        all_stations = {station.code: station for station in stations.list()}
+        missing = set(station_codes) - set(all_stations)
+        if missing:
+            raise click.BadParameter(
+                f"Estações não encontradas: {sorted(missing)}"
+            )
+        station_ids = [
+            station.id
+            for code, station in all_stations.items()
+            if station.id is not None
+            and (not station_codes or code in station_codes)
+        ]
+
+        imputer = Imputer(
+            ObservationRepository(session),
+            stations,
+            ImputedValueRepository(session),
+            k=neighbours,
+            max_distance_km=max_distance,
+            max_gap=max_gap,
+            chunk_hours=24 * chunk_days,
+        )
+        for name in variable:
+            counts = imputer.run(station_ids, name, start=start, end=end)
+            summary = ", ".join(
+                f"{method}: {count}" for method, count in counts.items()
+            )
+            click.echo(f"{name}: {summary}")
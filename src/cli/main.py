@@ -0,0 +1,123 @@
+from importlib import import_module
+
+import click
+
+# Subcommand name -> (module:attribute, short help). The help is repeated
+# here so that ``tsa --help`` can list every command without importing
+# pandas, SQLModel or the analysis stack behind them.
+COMMANDS: dict[str, tuple[str, str]] = {
+    "backtest": (
+        "cli.backtest:main",
+        "Avalia previsões em origens móveis (MAE, RMSE, CRPS), retomável.",
+    ),
+    "build-db": (
+        "cli.build_database:main",
+        "Cria as tabelas e popula o banco a partir dos CSVs.",
+    ),
+    "check-db": ("tsa.main:main", "Testa a conexão com o banco de dados."),
+    "climatology": (
+        "cli.climatology:main",
+        "Calcula ou atualiza as normais climatológicas das estações.",
+    ),
+    "covariance": (
+        "cli.covariance:main",
+        "Atualiza as matrizes de covariância e correlação entre estações.",
+    ),
+    "create-tables": (
+        "cli.create_tables:main",
+        "Create every table declared in the SQLModel models.",
+    ),
+    "derive": (
+        "cli.derive:main",
+        "Recalcula as variáveis derivadas a partir das observações existentes.",
+    ),
+    "downloader": (
+        "cli.downloader:main",
+        "Baixa os dados históricos do INMET.",
+    ),
+    "export": (
+        "cli.export:main",
+        "Exporta observações por estado, região e período (Parquet/CSV).",
+    ),
+    "forecast": (
+        "cli.forecast:main",
+        "Gera previsões a partir dos modelos registrados, sem reajustá-los.",
+    ),
+    "impute": (
+        "cli.impute:main",
+        "Imputa lacunas usando interpolação temporal e estações vizinhas.",
+    ),
+    "percentiles": (
+        "cli.percentiles:main",
+        "Estima percentis a partir dos resumos mensais, sem ler observações.",
+    ),
+    "populate-db": (
+        "cli.populate_database:main",
+        "Carrega os CSVs e popula todas as tabelas do banco.",
+    ),
+    "select-orders": (
+        "cli.select_orders:main",
+        "Seleciona ordens SARIMA por estação, reaproveitando ajustes salvos.",
+    ),
+    "serve": (
+        "cli.serve:main",
+        "Serviço local de consultas somente leitura (NDJSON/Arrow).",
+    ),
+    "smooth": (
+        "cli.smooth:main",
+        "Atualiza os filtros de Kalman com as horas novas e gera nowcasts.",
+    ),
+    "spectra": (
+        "cli.spectra:main",
+        "Calcula espectros (Welch/Lomb-Scargle) das estações, com cache.",
+    ),
+    "validate-db": (
+        "cli.validate_database:main",
+        "Ler o banco gerado, validar usando Pandera e imprimir algumas linhas.",
+    ),
+}
+
+
+class LazyGroup(click.Group):
+    """Click group that imports each subcommand only when it is invoked."""
+
+    def __init__(
+        self,
+        *args: object,
+        lazy_commands: dict[str, tuple[str, str]],
+        **kwargs: object,
+    ) -> None:
+        super().__init__(*args, **kwargs)  # type: ignore[arg-type]
+        self.lazy_commands = lazy_commands
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(
+        self, ctx: click.Context, cmd_name: str
+    ) -> click.Command | None:
+        if cmd_name not in self.lazy_commands:
+            return super().get_command(ctx, cmd_name)
+        import_path, _ = self.lazy_commands[cmd_name]
+        module_name, attribute = import_path.split(":")
+        command = getattr(import_module(module_name), attribute)
+        if not isinstance(command, click.Command):
+            raise click.ClickException(f"{import_path} não é um comando click.")
+        return command
+
+    def format_commands(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        rows = [
+            (name, self.lazy_commands[name][1])
+            for name in self.list_commands(ctx)
+            if name in self.lazy_commands
+        ]
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, lazy_commands=COMMANDS)
+def cli() -> None:
+    """Ferramentas de análise das séries históricas do INMET."""
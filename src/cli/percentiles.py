@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import click
+
+from tsa import settings
+from tsa.database.connector import Connector
+from tsa.database.models import OBSERVATION_VARIABLES
+from tsa.database.repositories import (
+    QuantileSketchRepository,
+    RegionRepository,
+    StateRepository,
+    StationRepository,
+)
+
+GROUPINGS = {
+    "station": ("station_ids", StationRepository),
+    "state": ("state_ids", StateRepository),
+    "region": ("region_ids", RegionRepository),
+}
+
+
+@click.command()
+@click.option(
+    "--variable",
+    "-v",
+    type=click.Choice(OBSERVATION_VARIABLES),
+    default="precipitation",
+    show_default=True,
+)
+@click.option(
+    "--quantile",
+    "-q",
+    "levels",
+    type=click.FloatRange(0.0, 1.0),
+    multiple=True,
+    default=[0.5, 0.95, 0.99],
+    show_default=True,
+    help="Quantil(is) estimados.",
+)
+@click.option(
+    "--by",
+    type=click.Choice(list(GROUPINGS)),
+    default="station",
+    show_default=True,
+    help="Nível de agregação dos resumos.",
+)
+@click.option("--start", type=click.DateTime(), default=None)
+@click.option("--end", type=click.DateTime(), default=None)
+def main(
+    variable: str,
+    levels: tuple[float, ...],
+    by: str,
+    start: datetime | None,
+    end: datetime | None,
+) -> None:
+    """Estima percentis a partir dos resumos mensais, sem ler observações."""
+    connector = Connector(settings=settings.db)
+    argument, repository_class = GROUPINGS[by]
+
+    with connector.get_session() as session:
+        sketches = QuantileSketchRepository(session)
+        click.echo(",".join([by, *(f"q{level:g}" for level in levels)]))
+        for group in repository_class(session).list():
+            values = sketches.quantiles(
+                variable,
+                levels,
+                start=start,
+                end=end,
+                **{argument: [group.id]},
+            )
+            row = ",".join(f"{value:.3f}" for value in values)
+            click.echo(f"{group.code},{row}")
@@ -0,0 +1,148 @@
+from datetime import datetime
+
+import click
+
+from tsa import settings
+from tsa.analysis.forecasting import ModelRegistry
+from tsa.analysis.model_selection import OrderSelector, candidate_orders
+from tsa.database.connector import Connector
+from tsa.database.models import OBSERVATION_VARIABLES
+from tsa.database.repositories import (
+    FittedModelRepository,
+    ModelCandidateRepository,
+    ObservationRepository,
+    StationRepository,
+)
+
+
+def _int_range(value: str) -> range:
+    low, _, high = value.partition("-")
+    return range(int(low), int(high or low) + 1)
+
+
+@click.command()
+@click.option(
+    "--station",
+    "-s",
+    "station_codes",
+    multiple=True,
+    default=[settings.station],
+    show_default=True,
+    help="Código(s) das estações.",
+)
+@click.option(
+    "--variable",
+    "-v",
+    type=click.Choice(OBSERVATION_VARIABLES),
+    default="air_temperature",
+    show_default=True,
+    help="Variável a ser modelada.",
+)
+@click.option(
+    "--start",
+    type=click.DateTime(),
+    required=True,
+    help="Início da janela de treino.",
+)
+@click.option(
+    "--end",
+    type=click.DateTime(),
+    required=True,
+    help="Fim (exclusivo) da janela de treino.",
+)
+@click.option("--p", "p", default="0-2", show_default=True)
+@click.option("--d", "d", default="0-1", show_default=True)
+@click.option("--q", "q", default="0-2", show_default=True)
+@click.option("--seasonal-p", default="0-1", show_default=True)
+@click.option("--seasonal-d", default="0-1", show_default=True)
+@click.option("--seasonal-q", default="0-1", show_default=True)
+@click.option("--period", default=24, show_default=True)
+@click.option(
+    "--criterion",
+    type=click.Choice(["aic", "bic"]),
+    default="aic",
+    show_default=True,
+)
+@click.option(
+    "--patience",
+    default=1,
+    show_default=True,
+    help="Níveis sem melhora antes de descartar os modelos mais complexos.",
+)
+@click.option(
+    "--register/--no-register",
+    default=True,
+    show_default=True,
+    help="Salva o melhor modelo de cada estação no registro de modelos.",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Número de processos (padrão: número de CPUs).",
+)
+def main(
+    station_codes: tuple[str, ...],
+    variable: str,
+    start: datetime,
+    end: datetime,
+    p: str,
+    d: str,
+    q: str,
+    seasonal_p: str,
+    seasonal_d: str,
+    seasonal_q: str,
+    period: int,
+    criterion: str,
+    patience: int,
+    register: bool,
+    workers: int | None,
+) -> None:
+    """Seleciona ordens SARIMA por estação, reaproveitando ajustes salvos."""
+    connector = Connector(settings=settings.db)
+    orders = candidate_orders(
+        p=_int_range(p),
+        d=_int_range(d),
+        q=_int_range(q),
+        seasonal_p=_int_range(seasonal_p),
+        seasonal_d=_int_range(seasonal_d),
+        seasonal_q=_int_range(seasonal_q),
+        period=period,
+    )
+
+    with connector.get_session() as session:
+        stations = StationRepository(session)
+        station_ids: dict[int, str] = {}
+        for code in station_codes:
+            station = stations.get_by_code(code)
+            if station is None or station.id is None:
+                raise click.BadParameter(f"Estação {code} não encontrada.")
+            station_ids[station.id] = code
+
+        selector = OrderSelector(
+            ObservationRepository(session),
+            ModelCandidateRepository(session),
+            criterion=criterion,
+            patience=patience,
+            max_workers=workers,
+        )
+        best = selector.run(
+            list(station_ids), variable, orders, start=start, end=end
+        )
+
+        registry = ModelRegistry(
+            FittedModelRepository(session), ObservationRepository(session)
+        )
+        for station_id, candidate in best.items():
+            code = station_ids[station_id]
+            if candidate is None:
+                click.echo(f"{code}: nenhum modelo ajustado.")
+                continue
+            click.echo(
+                f"{code}: SARIMA({candidate.p},{candidate.d},{candidate.q})"
+                f"({candidate.seasonal_p},{candidate.seasonal_d},"
+                f"{candidate.seasonal_q},{candidate.period}) "
+                f"{criterion.upper()}={getattr(candidate, criterion):.2f}"
+            )
+            if register:
+                registry.register(candidate)
@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import click
+
+from tsa import settings
+from tsa.database.connector import Connector
+from tsa.service import QueryService, make_server
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8765, show_default=True)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help="Escuta em um socket Unix em vez de TCP.",
+)
+def main(host: str, port: int, socket_path: Path | None) -> None:
+    """Serviço local de consultas somente leitura (NDJSON/Arrow)."""
+    connector = Connector(settings=settings.db)
+    service = QueryService(connector.engine)
+    server = make_server(service, host=host, port=port, socket_path=socket_path)
+    address = socket_path or f"http://{host}:{port}"
+    click.echo(f"Servindo consultas em {address} (Ctrl+C para encerrar).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path is not None:
+            socket_path.unlink(missing_ok=True)
@@ -0,0 +1,100 @@
+import csv
+from pathlib import Path
+
+import click
+
+from tsa import settings
+from tsa.analysis.smoothing import SMOOTHED_VARIABLES, OnlineSmoother
+from tsa.database.connector import Connector
+from tsa.database.models import OBSERVATION_VARIABLES
+from tsa.database.repositories import (
+    DerivedValueRepository,
+    ObservationRepository,
+    StationRepository,
+    StructuralModelRepository,
+)
+
+
+@click.command()
+@click.option(
+    "--station",
+    "-s",
+    "station_codes",
+    multiple=True,
+    help="Código(s) das estações (padrão: todas).",
+)
+@click.option(
+    "--variable",
+    "-v",
+    type=click.Choice(OBSERVATION_VARIABLES),
+    multiple=True,
+    default=SMOOTHED_VARIABLES,
+    show_default=True,
+)
+@click.option(
+    "--horizon",
+    "-h",
+    default=6,
+    show_default=True,
+    help="Horas estimadas além da última observação.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=settings.data_path / "nowcasts.csv",
+    show_default=True,
+    help="Arquivo CSV de saída.",
+)
+def main(
+    station_codes: tuple[str, ...],
+    variable: tuple[str, ...],
+    horizon: int,
+    output: Path,
+) -> None:
+    """Atualiza os filtros de Kalman com as horas novas e gera nowcasts."""
+    connector = Connector(settings=settings.db)
+
+    with connector.get_session() as session:
+        codes = {
+            station.id: station.code
+            for station in StationRepository(session).list()
+            if station.id is not None
+            and (not station_codes or station.code in station_codes)
+        }
+        smoother = OnlineSmoother(
+            StructuralModelRepository(session),
+            ObservationRepository(session),
+            DerivedValueRepository(session),
+            variables=variable,
+        )
+        updated = sum(len(smoother.update(station_id)) for station_id in codes)
+        forecasts = [
+            forecast
+            for name in variable
+            for forecast in smoother.forecast(
+                name, horizon, station_ids=list(codes)
+            )
+        ]
+
+    with output.open("w", newline="") as fp:
+        writer = csv.writer(fp)
+        writer.writerow(["station", "variable", "datetime", "value", "std"])
+        for forecast in forecasts:
+            code = codes[forecast.station_id]
+            for time, mean, std in zip(
+                forecast.times, forecast.mean, forecast.std
+            ):
+                writer.writerow(
+                    [
+                        code,
+                        forecast.variable,
+                        str(time),
+                        f"{mean:.4f}",
+                        f"{std:.4f}",
+                    ]
+                )
+    click.echo(
+        f"{updated} filtros atualizados; {len(forecasts)} nowcasts salvos em "
+        f"{output}."
+    )
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import click
+
+from tsa import settings
+from tsa.analysis.spectral import SpectralAnalyzer, SpectralParams
+from tsa.database.connector import Connector
+from tsa.database.models import OBSERVATION_VARIABLES
+from tsa.database.repositories import ObservationRepository, StationRepository
+
+
+@click.command()
+@click.option(
+    "--station",
+    "-s",
+    "station_codes",
+    multiple=True,
+    help="Código(s) das estações (padrão: todas).",
+)
+@click.option(
+    "--variable",
+    "-v",
+    type=click.Choice(OBSERVATION_VARIABLES),
+    multiple=True,
+    default=["air_temperature", "atmospheric_pressure"],
+    show_default=True,
+)
+@click.option("--start", type=click.DateTime(), required=True)
+@click.option(
+    "--end",
+    type=click.DateTime(),
+    required=True,
+    help="Fim (exclusivo) da janela analisada.",
+)
+@click.option(
+    "--segment-days",
+    default=365.0,
+    show_default=True,
+    help="Tamanho dos segmentos (Welch e Lomb-Scargle); define a resolução em frequência.",
+)
+@click.option(
+    "--max-frequency",
+    default=4.0,
+    show_default=True,
+    help="Maior frequência calculada (ciclos por dia).",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Número de processos (padrão: número de CPUs).",
+)
+def main(
+    station_codes: tuple[str, ...],
+    variable: tuple[str, ...],
+    start: datetime,
+    end: datetime,
+    segment_days: float,
+    max_frequency: float,
+    workers: int | None,
+) -> None:
+    """Calcula espectros (Welch/Lomb-Scargle) das estações, com cache."""
+    connector = Connector(settings=settings.db)
+    params = SpectralParams(
+        segment_days=segment_days, max_frequency=max_frequency
+    )
+
+    with connector.get_session() as session:
+        codes = {
+            station.id: station.code
+            for station in StationRepository(session).list()
+            if station.id is not None
+            and (not station_codes or station.code in station_codes)
+        }
+        analyzer = SpectralAnalyzer(
+            ObservationRepository(session), params=params, max_workers=workers
+        )
+        spectra = analyzer.run(list(codes), variable, start=start, end=end)
+
+    for name, spectrum in spectra.items():
+        click.echo(f"\n{name}:")
+        strongest = spectrum.peak(0, max_frequency)
+        for row, station_id in enumerate(spectrum.station_ids):
+            click.echo(
+                f"  {codes[station_id]}: {spectrum.method[row]} "
+                f"({spectrum.segments[row]} segmentos), pico em "
+                f"{1 / strongest[row]:.2f} dias"
+            )
@@ -1,7 +1,26 @@
-from ._settings import settings
-from .logger import Logger
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ._settings import settings
+    from .logger import configure_logging
+
+# Loading the settings reads the environment and imports pydantic, which
+# command-line entry points should only pay for when they actually use it.
+_EXPORTS = {
+    "settings": "._settings",
+    "configure_logging": ".logger",
+}
 
 __all__ = [
     "settings",
-    "Logger",
+    "configure_logging",
 ]
+
+
+def __getattr__(name: str) -> object:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
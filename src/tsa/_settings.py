@@ -8,12 +8,14 @@ PROJECT_PATH: Path = Path(__file__).parent.parent.parent.resolve()
 
 class DatabaseSettings(BaseModel):
     echo_sql: bool = False
+    # "sqlite" selects the embedded database at ``sqlite_path``.
     drivername: str = ""
     host: str = "localhost"
     port: PositiveInt = 5432
     database: str = "postgres"
     username: str = ""
     password: SecretStr = Field(default=SecretStr(""), repr=False)
+    sqlite_path: Path = PROJECT_PATH / "data" / "weather.db"
 
 
 class Settings(BaseSettings):
@@ -24,6 +26,7 @@ class Settings(BaseSettings):
     )
 
     data_path: Path = PROJECT_PATH / "data"
+    cache_path: Path = PROJECT_PATH / "data" / "cache"
     db: DatabaseSettings = Field(default_factory=DatabaseSettings)
     station: str = "A711"
 
@@ -0,0 +1,166 @@
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .autocorrelation import Correlogram, acf, ccf, pacf
+    from .backtesting import (
+        Backtester,
+        BacktestPlan,
+        StructuralSpec,
+        gaussian_crps,
+    )
+    from .climatology import ClimatologyStore, Normals, ReferencePeriod
+    from .covariance import NetworkCovariance, PairwiseMoments, chunk_moments
+    from .derived import DERIVED_VARIABLES, DerivedStage, derived_variable
+    from .downsampling import PlotData, SeriesView, lttb, minmax
+    from .features import (
+        Cyclic,
+        FeatureBuilder,
+        FeatureMatrix,
+        FeatureSpec,
+        Lags,
+        Neighbours,
+        Rolling,
+        Target,
+    )
+    from .forecasting import FittedState, Forecast, ModelRegistry
+    from .imputation import ImputationMethod, Imputer
+    from .model_selection import OrderSelector, SarimaOrder, candidate_orders
+    from .resampling import (
+        AGGREGATIONS,
+        Aggregation,
+        ColumnRule,
+        Resampled,
+        Resampler,
+        resample,
+    )
+    from .smoothing import (
+        OnlineSmoother,
+        Smoothed,
+        StructuralState,
+    )
+    from .spectral import (
+        SpectralAnalyzer,
+        SpectralParams,
+        Spectrum,
+        lomb_scargle_segments,
+        welch_batch,
+    )
+
+# Submodules pull in statsmodels, scikit-learn and the database layer, so
+# they are only imported when one of their names is first used.
+_EXPORTS = {
+    "Backtester": "backtesting",
+    "BacktestPlan": "backtesting",
+    "StructuralSpec": "backtesting",
+    "gaussian_crps": "backtesting",
+    "Correlogram": "autocorrelation",
+    "acf": "autocorrelation",
+    "ccf": "autocorrelation",
+    "pacf": "autocorrelation",
+    "ClimatologyStore": "climatology",
+    "Normals": "climatology",
+    "ReferencePeriod": "climatology",
+    "NetworkCovariance": "covariance",
+    "PairwiseMoments": "covariance",
+    "chunk_moments": "covariance",
+    "DERIVED_VARIABLES": "derived",
+    "DerivedStage": "derived",
+    "derived_variable": "derived",
+    "PlotData": "downsampling",
+    "SeriesView": "downsampling",
+    "lttb": "downsampling",
+    "minmax": "downsampling",
+    "Cyclic": "features",
+    "FeatureBuilder": "features",
+    "FeatureMatrix": "features",
+    "FeatureSpec": "features",
+    "Lags": "features",
+    "Neighbours": "features",
+    "Rolling": "features",
+    "Target": "features",
+    "FittedState": "forecasting",
+    "Forecast": "forecasting",
+    "ModelRegistry": "forecasting",
+    "ImputationMethod": "imputation",
+    "Imputer": "imputation",
+    "OrderSelector": "model_selection",
+    "SarimaOrder": "model_selection",
+    "candidate_orders": "model_selection",
+    "AGGREGATIONS": "resampling",
+    "Aggregation": "resampling",
+    "ColumnRule": "resampling",
+    "Resampled": "resampling",
+    "Resampler": "resampling",
+    "resample": "resampling",
+    "OnlineSmoother": "smoothing",
+    "Smoothed": "smoothing",
+    "StructuralState": "smoothing",
+    "SpectralAnalyzer": "spectral",
+    "SpectralParams": "spectral",
+    "Spectrum": "spectral",
+    "lomb_scargle_segments": "spectral",
+    "welch_batch": "spectral",
+}
+
+__all__ = [
+    "Correlogram",
+    "acf",
+    "pacf",
+    "ccf",
+    "OrderSelector",
+    "SarimaOrder",
+    "candidate_orders",
+    "ModelRegistry",
+    "FittedState",
+    "Forecast",
+    "Imputer",
+    "ImputationMethod",
+    "ClimatologyStore",
+    "Normals",
+    "ReferencePeriod",
+    "DerivedStage",
+    "DERIVED_VARIABLES",
+    "derived_variable",
+    "Resampler",
+    "Resampled",
+    "resample",
+    "Aggregation",
+    "ColumnRule",
+    "AGGREGATIONS",
+    "FeatureBuilder",
+    "FeatureMatrix",
+    "FeatureSpec",
+    "Lags",
+    "Rolling",
+    "Cyclic",
+    "Neighbours",
+    "Target",
+    "NetworkCovariance",
+    "PairwiseMoments",
+    "chunk_moments",
+    "SeriesView",
+    "PlotData",
+    "lttb",
+    "minmax",
+    "SpectralAnalyzer",
+    "SpectralParams",
+    "Spectrum",
+    "welch_batch",
+    "lomb_scargle_segments",
+    "OnlineSmoother",
+    "StructuralState",
+    "Smoothed",
+    "Backtester",
+    "BacktestPlan",
+    "StructuralSpec",
+    "gaussian_crps",
+]
+
+
+def __getattr__(name: str) -> object:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,252 @@
+from datetime import datetime
+from typing import Sequence
+
+import numpy as np
+import numpy.typing as npt
+from scipy import fft
+
+from ..cache import ArrayCache
+from ..database.repositories import ObservationRepository
+
+FloatArray = npt.NDArray[np.float64]
+
+
+def _as_columns(values: FloatArray) -> FloatArray:
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, np.newaxis] if values.ndim == 1 else values
+
+
+def _centered(values: FloatArray) -> tuple[FloatArray, FloatArray]:
+    """Return the mean-removed series (zero where missing) and its mask."""
+    mask = ~np.isnan(values)
+    counts = mask.sum(axis=0)
+    sums = np.where(mask, values, 0.0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    return np.where(mask, values - means, 0.0), mask.astype(np.float64)
+
+
+def _lagged_products(x: FloatArray, y: FloatArray, n_fft: int) -> FloatArray:
+    """``out[k] = sum_t x[t] * y[t + k]`` for every column, via FFT."""
+    x_hat = fft.rfft(x, n=n_fft, axis=0, workers=-1)
+    y_hat = fft.rfft(y, n=n_fft, axis=0, workers=-1)
+    return fft.irfft(  # type: ignore[no-any-return]
+        np.conj(x_hat) * y_hat, n=n_fft, axis=0, workers=-1
+    )
+
+
+def acf(
+    values: FloatArray, nlags: int, *, adjusted: bool = False
+) -> FloatArray:
+    """Autocorrelation of every column of ``values`` in one FFT pass.
+
+    Missing values (``NaN``) are masked out: lagged products only include
+    pairs where both hours are observed. With ``adjusted`` each lag is
+    normalized by its own pair count, otherwise by the number of observed
+    hours, which keeps the estimate positive semi-definite.
+
+    Returns an array of shape ``(nlags + 1, n_series)``, or ``(nlags + 1,)``
+    for a one-dimensional input.
+    """
+    squeeze = np.ndim(values) == 1
+    x, mask = _centered(_as_columns(values))
+    n_fft = fft.next_fast_len(2 * x.shape[0] - 1, real=True)
+    products = _lagged_products(x, x, n_fft)[: nlags + 1]
+    pairs = np.rint(_lagged_products(mask, mask, n_fft)[: nlags + 1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if adjusted:
+            covariance = np.where(pairs > 0, products / pairs, np.nan)
+        else:
+            covariance = products / pairs[0]
+        result = covariance / covariance[0]
+    return result[:, 0] if squeeze else result
+
+
+def pacf(acf_values: FloatArray) -> FloatArray:
+    """Partial autocorrelation from ``acf`` output via Durbin-Levinson.
+
+    The recursion runs over lags and is vectorized across series.
+    """
+    squeeze = np.ndim(acf_values) == 1
+    r = _as_columns(acf_values)
+    nlags = r.shape[0] - 1
+    result = np.ones_like(r)
+    if nlags == 0:
+        return result[:, 0] if squeeze else result
+
+    phi = np.zeros((nlags, r.shape[1]))
+    phi[0] = result[1] = r[1]
+    variance = 1.0 - r[1] ** 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for lag in range(2, nlags + 1):
+            numerator = r[lag] - np.einsum(
+                "jk,jk->k", phi[: lag - 1], r[lag - 1 : 0 : -1]
+            )
+            current = numerator / variance
+            phi[: lag - 1] = phi[: lag - 1] - current * phi[lag - 2 :: -1]
+            phi[lag - 1] = result[lag] = current
+            variance = variance * (1.0 - current**2)
+    return result[:, 0] if squeeze else result
+
+
+def ccf(
+    x: FloatArray, y: FloatArray, nlags: int, *, adjusted: bool = False
+) -> FloatArray:
+    """Cross-correlation ``corr(x[t], y[t + k])`` for ``k in [-nlags, nlags]``.
+
+    ``x`` and ``y`` are paired column by column and share the masking rules
+    of :func:`acf`. Returns an array of shape ``(2 * nlags + 1, n_pairs)``.
+    """
+    squeeze = np.ndim(x) == 1
+    x_centered, x_mask = _centered(_as_columns(x))
+    y_centered, y_mask = _centered(_as_columns(y))
+    n_fft = fft.next_fast_len(2 * x_centered.shape[0] - 1, real=True)
+    lags = np.arange(-nlags, nlags + 1) % n_fft
+
+    products = _lagged_products(x_centered, y_centered, n_fft)[lags]
+    pairs = np.rint(_lagged_products(x_mask, y_mask, n_fft)[lags])
+    x_var = (x_centered**2).sum(axis=0) / x_mask.sum(axis=0)
+    y_var = (y_centered**2).sum(axis=0) / y_mask.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if adjusted:
+            covariance = np.where(pairs > 0, products / pairs, np.nan)
+        else:
+            covariance = products / pairs[nlags]
+        result = covariance / np.sqrt(x_var * y_var)
+    return result[:, 0] if squeeze else result
+
+
+class Correlogram:
+    """ACF/PACF/CCF of stored station series, cached on disk.
+
+    Results are keyed by station (or station pair), variable, lag count and
+    the part of the requested period each station has data for, so
+    repeated diagnostics only load and transform the series that are not
+    cached yet, and open-ended requests are recomputed once newer (or
+    older) observations are loaded.
+    """
+
+    def __init__(
+        self,
+        repository: ObservationRepository,
+        cache: ArrayCache | None = None,
+    ) -> None:
+        self.repository = repository
+        self.cache = cache or ArrayCache("correlogram")
+
+    def _windows(
+        self,
+        station_ids: Sequence[int],
+        start: datetime | None,
+        end: datetime | None,
+    ) -> dict[int, tuple[datetime | None, datetime | None]]:
+        """First and last reading of each station within ``[start, end)``.
+
+        A bound the data reaches is kept as requested, so keys of a closed
+        period do not change with observations outside it.
+        """
+        spans = self.repository.time_spans(station_ids)
+        windows: dict[int, tuple[datetime | None, datetime | None]] = {}
+        for station_id in station_ids:
+            if station_id not in spans:
+                windows[station_id] = (None, None)
+                continue
+            first, last = spans[station_id]
+            windows[station_id] = (
+                max(first, start) if start else first,
+                min(last, end) if end else last,
+            )
+        return windows
+
+    def acf(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        nlags: int,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> FloatArray:
+        """Return the ``(nlags + 1, stations)`` ACF, ordered like the input."""
+        windows = self._windows(station_ids, start, end)
+        keys = {
+            station_id: ArrayCache.key(
+                "acf", station_id, variable, nlags, windows[station_id]
+            )
+            for station_id in station_ids
+        }
+        cached = {
+            station_id: entry["acf"]
+            for station_id, key in keys.items()
+            if (entry := self.cache.get(key)) is not None
+        }
+        missing = [
+            station_id for station_id in keys if station_id not in cached
+        ]
+        if missing:
+            hourly = self.repository.load_hourly(
+                missing, [variable], start=start, end=end
+            )
+            computed = acf(hourly.variable(variable), nlags)
+            for column, station_id in enumerate(hourly.station_ids):
+                cached[station_id] = computed[:, column]
+                self.cache.put(keys[station_id], acf=computed[:, column])
+        return np.stack(
+            [cached[station_id] for station_id in station_ids], axis=1
+        )
+
+    def pacf(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        nlags: int,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> FloatArray:
+        return pacf(
+            self.acf(station_ids, variable, nlags, start=start, end=end)
+        )
+
+    def ccf(
+        self,
+        pairs: Sequence[tuple[int, int]],
+        variable: str,
+        nlags: int,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> FloatArray:
+        """Return the ``(2 * nlags + 1, pairs)`` cross-correlation."""
+        windows = self._windows(
+            list({station_id for pair in pairs for station_id in pair}),
+            start,
+            end,
+        )
+        keys = {
+            pair: ArrayCache.key(
+                "ccf", pair, variable, nlags, windows[pair[0]], windows[pair[1]]
+            )
+            for pair in pairs
+        }
+        cached = {
+            pair: entry["ccf"]
+            for pair, key in keys.items()
+            if (entry := self.cache.get(key)) is not None
+        }
+        missing = [pair for pair in keys if pair not in cached]
+        if missing:
+            station_ids = {
+                station_id for pair in missing for station_id in pair
+            }
+            hourly = self.repository.load_hourly(
+                list(station_ids), [variable], start=start, end=end
+            )
+            matrix = hourly.variable(variable)
+            left = [hourly.station_ids.index(a) for a, _ in missing]
+            right = [hourly.station_ids.index(b) for _, b in missing]
+            computed = ccf(matrix[:, left], matrix[:, right], nlags)
+            for column, pair in enumerate(missing):
+                cached[pair] = computed[:, column]
+                self.cache.put(keys[pair], ccf=computed[:, column])
+        return np.stack([cached[pair] for pair in pairs], axis=1)
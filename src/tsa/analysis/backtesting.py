@@ -0,0 +1,351 @@
+import logging
+from collections.abc import Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+from scipy.special import ndtr
+
+from ..cache import ArrayCache
+from ..database.models import BacktestFold
+from ..database.repositories import (
+    BacktestFoldRepository,
+    ObservationRepository,
+)
+from ..shared import SharedDataset, SharedHandle, attach
+from . import forecasting, smoothing
+from .model_selection import SarimaOrder, fit_candidate
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float64]
+
+Window = Literal["expanding", "rolling"]
+
+WINDOWS: tuple[Window, ...] = ("expanding", "rolling")
+
+
+@dataclass(frozen=True)
+class StructuralSpec:
+    """Local linear trend plus a daily cycle, as in :mod:`.smoothing`."""
+
+    period: int = 24
+    harmonics: int = 2
+
+
+BacktestModel = SarimaOrder | StructuralSpec
+
+
+def model_label(model: BacktestModel) -> str:
+    if isinstance(model, StructuralSpec):
+        return f"structural({model.period},{model.harmonics})"
+    return (
+        f"SARIMA({model.p},{model.d},{model.q})"
+        f"({model.seasonal_p},{model.seasonal_d},{model.seasonal_q},"
+        f"{model.period})"
+    )
+
+
+@dataclass(frozen=True)
+class BacktestPlan:
+    """Forecast origins laid over an hourly series; part of every fold.
+
+    The first origin comes after ``initial_days`` of history and the next
+    ones every ``step_hours``, as long as a whole ``horizon`` still fits.
+    Expanding windows train on everything before the origin, rolling ones
+    on the last ``window_days`` (``initial_days`` by default).
+
+    Parameters are estimated at the first origin of each block of
+    ``refit_every`` folds; the other folds of the block only advance the
+    Kalman filter over the hours since the previous origin. With expanding
+    windows that is exactly the filter run on the whole training window;
+    with rolling windows it also remembers hours that left the window.
+    """
+
+    initial_days: float = 365.0
+    step_hours: int = 24
+    horizon: int = 48
+    window: Window = "expanding"
+    window_days: float | None = None
+    refit_every: int = 30
+
+    def __post_init__(self) -> None:
+        if self.window not in WINDOWS:
+            raise ValueError(f"Janela deve ser uma de {WINDOWS}")
+
+    def origins(self, n_hours: int) -> list[int]:
+        """Hour index of every origin on a series of ``n_hours``."""
+        first = int(round(self.initial_days * 24))
+        return list(range(first, n_hours - self.horizon + 1, self.step_hours))
+
+    def train_start(self, origin: int) -> int:
+        if self.window == "expanding":
+            return 0
+        days = self.window_days or self.initial_days
+        return max(0, origin - int(round(days * 24)))
+
+    @property
+    def key(self) -> str:
+        """Short hash of every setting, stored with each fold."""
+        return ArrayCache.key(self)[:16]
+
+    def blocks(self, origins: Sequence[int]) -> list[list[int]]:
+        """Consecutive origins that share one parameter estimate."""
+        size = max(1, self.refit_every)
+        return [
+            list(origins[offset : offset + size])
+            for offset in range(0, len(origins), size)
+        ]
+
+
+@dataclass(frozen=True)
+class FoldResult:
+    origin: int
+    train_start: int
+    observed: int
+    mae: float | None
+    rmse: float | None
+    crps: float | None
+    params: dict[str, float]
+    error: str | None = None
+
+
+def gaussian_crps(
+    mean: FloatArray, std: FloatArray, actual: FloatArray
+) -> FloatArray:
+    """CRPS of normal forecasts, in closed form (Gneiting et al., 2005)."""
+    z = (actual - mean) / std
+    density = np.exp(-0.5 * z**2) / np.sqrt(2 * np.pi)
+    return std * (z * (2 * ndtr(z) - 1) + 2 * density - 1 / np.sqrt(np.pi))
+
+
+def score(
+    origin: int,
+    train_start: int,
+    mean: FloatArray,
+    std: FloatArray,
+    actual: FloatArray,
+    params: dict[str, float],
+) -> FoldResult:
+    observed = ~np.isnan(actual)
+    if not observed.any():
+        return FoldResult(origin, train_start, 0, None, None, None, params)
+    errors = actual[observed] - mean[observed]
+    return FoldResult(
+        origin=origin,
+        train_start=train_start,
+        observed=int(observed.sum()),
+        mae=float(np.abs(errors).mean()),
+        rmse=float(np.sqrt((errors**2).mean())),
+        crps=float(
+            gaussian_crps(
+                mean[observed], std[observed], actual[observed]
+            ).mean()
+        ),
+        params=params,
+    )
+
+
+def evaluate_block(
+    values: FloatArray,
+    origins: Sequence[int],
+    model: BacktestModel,
+    plan: BacktestPlan,
+) -> list[FoldResult]:
+    """Evaluate consecutive folds of one hourly series with a single fit."""
+    first = origins[0]
+    start = plan.train_start(first)
+    train = values[start:first]
+    epoch = datetime(1970, 1, 1)  # hours are positions; dates do not matter
+    try:
+        if isinstance(model, StructuralSpec):
+            structural, _ = smoothing.fit_state(
+                0,
+                "",
+                train,
+                epoch,
+                period=model.period,
+                harmonics=model.harmonics,
+            )
+            params = structural.params
+        else:
+            fit = fit_candidate(train, model)
+            if fit.error is not None:
+                raise ValueError(fit.error)
+            params = fit.params
+            sarima = forecasting.filter_state(
+                0, "", model, params, train, epoch
+            )
+    except (ValueError, np.linalg.LinAlgError) as e:
+        return [
+            FoldResult(
+                origin,
+                plan.train_start(origin),
+                0,
+                None,
+                None,
+                None,
+                {},
+                str(e),
+            )
+            for origin in origins
+        ]
+
+    results: list[FoldResult] = []
+    previous = first
+    for origin in origins:
+        new_values = values[previous:origin]
+        if isinstance(model, StructuralSpec):
+            if len(new_values):
+                structural, _ = smoothing.update_state(structural, new_values)
+            forecast = smoothing.forecast_state(structural, plan.horizon)
+        else:
+            sarima = forecasting.update_state(sarima, new_values)
+            forecast = forecasting.forecast_state(sarima, plan.horizon)
+        results.append(
+            score(
+                origin,
+                plan.train_start(origin),
+                forecast.mean,
+                forecast.std,
+                values[origin : origin + plan.horizon],
+                params,
+            )
+        )
+        previous = origin
+    return results
+
+
+def evaluate_shared(
+    handle: SharedHandle,
+    variable: str,
+    station_id: int,
+    origins: Sequence[int],
+    model: BacktestModel,
+    plan: BacktestPlan,
+) -> list[FoldResult]:
+    """:func:`evaluate_block` on one station of a shared dataset."""
+    values = attach(handle).column(variable, station_id)
+    return evaluate_block(values, origins, model, plan)
+
+
+class Backtester:
+    """Rolling-origin evaluation of one model over many stations.
+
+    Blocks of folds (see :class:`BacktestPlan`) are spread over a process
+    pool that reads the series from a :class:`~tsa.shared.SharedDataset`,
+    and every fold's MAE, RMSE and CRPS is stored in
+    ``inmet.backtest_folds`` as soon as its block ends.
+    Running the same ``run`` again skips blocks already stored, so an
+    interrupted backtest resumes where it stopped; a run name is tied to
+    the plan of its first folds and cannot be reused with another one.
+    """
+
+    def __init__(
+        self,
+        observations: ObservationRepository,
+        folds: BacktestFoldRepository,
+        *,
+        plan: BacktestPlan | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        self.observations = observations
+        self.folds = folds
+        self.plan = plan or BacktestPlan()
+        self.max_workers = max_workers
+
+    def run(
+        self,
+        run: str,
+        station_ids: Sequence[int],
+        variable: str,
+        model: BacktestModel,
+        *,
+        start: datetime,
+        end: datetime,
+    ) -> list[BacktestFold]:
+        """Evaluate every fold of ``[start, end)`` not stored under ``run``."""
+        label = model_label(model)
+        plan = self.plan.key
+        if self.folds.plans(run) - {plan}:
+            raise ValueError(
+                f"Rodada {run!r} já foi avaliada com outro plano de origens; "
+                "use outro nome."
+            )
+        with SharedDataset.load(
+            self.observations, station_ids, [variable], start=start, end=end
+        ) as dataset:
+            times = dataset.view.times.copy()
+            done = self.folds.done(run, plan, variable, label)
+            blocks = self.plan.blocks(self.plan.origins(len(times)))
+            tasks = [
+                (station_id, block)
+                for station_id in dataset.handle.station_ids
+                for block in blocks
+                if any(
+                    (station_id, times[origin].astype(datetime)) not in done
+                    for origin in block
+                )
+            ]
+            logger.info(
+                "Backtesting %s/%s: %d blocos de %d origens a avaliar.",
+                variable,
+                label,
+                len(tasks),
+                self.plan.refit_every,
+            )
+
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures: dict[Future[list[FoldResult]], int] = {
+                    pool.submit(
+                        evaluate_shared,
+                        dataset.handle,
+                        variable,
+                        station_id,
+                        block,
+                        model,
+                        self.plan,
+                    ): station_id
+                    for station_id, block in tasks
+                }
+                for future in as_completed(futures):
+                    station_id = futures[future]
+                    rows = [
+                        self._row(
+                            run, station_id, variable, label, times, result
+                        )
+                        for result in future.result()
+                        if (station_id, times[result.origin].astype(datetime))
+                        not in done
+                    ]
+                    self.folds.record_many(rows)
+        return self.folds.find_for_run(run, variable, label)
+
+    def _row(
+        self,
+        run: str,
+        station_id: int,
+        variable: str,
+        label: str,
+        times: npt.NDArray[np.datetime64],
+        result: FoldResult,
+    ) -> dict[str, object]:
+        return {
+            "run": run,
+            "plan": self.plan.key,
+            "station_id": station_id,
+            "variable": variable,
+            "model": label,
+            "origin": times[result.origin].astype(datetime),
+            "train_start": times[result.train_start].astype(datetime),
+            "horizon": self.plan.horizon,
+            "observed": result.observed,
+            "mae": result.mae,
+            "rmse": result.rmse,
+            "crps": result.crps,
+            "params": result.params,
+            "error": result.error,
+        }
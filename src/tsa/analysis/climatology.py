@@ -0,0 +1,312 @@
+import logging
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+
+import numpy as np
+import numpy.typing as npt
+
+from ..cache import ArrayCache
+from ..database.repositories import HourlyArray, ObservationRepository
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+DAYS = 366
+HOURS = 24
+QUANTILES: tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95)
+
+# First day-of-year index of each month in a leap year, so 29 February has
+# its own slot and every other date keeps the same index in every year.
+_MONTH_OFFSETS = np.array(
+    [0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335], dtype=np.int64
+)
+
+
+def calendar_index(
+    times: npt.NDArray[np.datetime64],
+) -> tuple[IntArray, IntArray, IntArray]:
+    """Return year, leap-calendar day of year (0-365) and hour of ``times``."""
+    days = times.astype("datetime64[D]")
+    years = days.astype("datetime64[Y]")
+    months = days.astype("datetime64[M]")
+    day_of_month = (days - months.astype("datetime64[D]")).astype(np.int64)
+    month = (months - years.astype("datetime64[M]")).astype(np.int64)
+    hour = (times.astype("datetime64[h]") - days).astype(np.int64)
+    year = years.astype(np.int64) + 1970
+    return year, _MONTH_OFFSETS[month] + day_of_month, hour
+
+
+@dataclass(frozen=True)
+class ReferencePeriod:
+    start_year: int
+    end_year: int
+
+    @property
+    def start(self) -> datetime:
+        return datetime(self.start_year, 1, 1)
+
+    @property
+    def end(self) -> datetime:
+        return datetime(self.end_year + 1, 1, 1)
+
+    @property
+    def n_years(self) -> int:
+        return self.end_year - self.start_year + 1
+
+
+@dataclass(frozen=True)
+class Normals:
+    """Hour-of-day x day-of-year statistics of several stations.
+
+    ``mean`` and ``std`` have shape ``(stations, 366, 24)``; ``quantiles``
+    has shape ``(stations, len(levels), 366, 24)``.
+    """
+
+    station_ids: tuple[int, ...]
+    variable: str
+    period: ReferencePeriod
+    levels: tuple[float, ...]
+    count: IntArray
+    mean: FloatArray
+    std: FloatArray
+    quantiles: FloatArray
+
+
+def summarize(
+    binned: FloatArray, *, window_days: int, levels: Sequence[float]
+) -> dict[str, npt.NDArray[np.generic]]:
+    """Statistics of a ``(years, 366, 24)`` array over a day-of-year window.
+
+    Every day pools the same hour of the ``window_days`` days on each side
+    (wrapping around the year) across all years.
+    """
+    shifts = range(-window_days, window_days + 1)
+    pooled = np.concatenate(
+        [np.roll(binned, shift, axis=1) for shift in shifts], axis=0
+    )
+    count = np.count_nonzero(~np.isnan(pooled), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(pooled, axis=0) / count
+        variance = np.nansum((pooled - mean) ** 2, axis=0) / (count - 1)
+
+    # NaNs sort last, so the observed values of every cell come first and
+    # quantiles can be interpolated from each cell's own count.
+    ordered = np.sort(pooled, axis=0)
+    position = np.asarray(levels)[:, np.newaxis, np.newaxis] * (count - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, np.maximum(count - 1, 0))
+    lower = np.maximum(lower, 0)
+    below = np.take_along_axis(ordered, lower, axis=0)
+    above = np.take_along_axis(ordered, upper, axis=0)
+    quantiles = below + (position - np.floor(position)) * (above - below)
+    quantiles[:, count == 0] = np.nan
+    return {
+        "count": count,
+        "mean": mean,
+        "std": np.sqrt(variance),
+        "quantiles": quantiles,
+    }
+
+
+class ClimatologyStore:
+    """Cached climatological normals and anomaly series.
+
+    For every station, variable and reference period the store keeps the
+    hourly values binned as ``(years, 366, 24)`` plus the statistics derived
+    from them in an :class:`~tsa.cache.ArrayCache`. Refreshing only fetches
+    hours newer than the last one binned and recomputes the statistics from
+    the cached array, so the observations table is scanned once per period.
+    Stations are refreshed ``block_size`` at a time and their hours read in
+    chunks of ``chunk_days``, which bounds memory by one block's bins and
+    one chunk of observations however long the period is.
+    """
+
+    def __init__(
+        self,
+        observations: ObservationRepository,
+        cache: ArrayCache | None = None,
+        *,
+        window_days: int = 7,
+        levels: Sequence[float] = QUANTILES,
+        chunk_days: int = 365,
+        block_size: int = 50,
+    ) -> None:
+        self.observations = observations
+        self.cache = cache or ArrayCache("climatology")
+        self.window_days = window_days
+        self.levels = tuple(levels)
+        self.chunk_days = chunk_days
+        self.block_size = block_size
+
+    def _key(
+        self, station_id: int, variable: str, period: ReferencePeriod
+    ) -> str:
+        return ArrayCache.key(
+            station_id, variable, period, self.window_days, self.levels
+        )
+
+    def refresh(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        period: ReferencePeriod,
+        *,
+        rebuild: bool = False,
+    ) -> None:
+        """Bin the hours not yet cached and recompute the statistics.
+
+        ``rebuild`` discards the cached bins, e.g. after backfilling hours
+        older than the last refresh.
+        """
+        for offset in range(0, len(station_ids), self.block_size):
+            self._refresh_block(
+                station_ids[offset : offset + self.block_size],
+                variable,
+                period,
+                rebuild=rebuild,
+            )
+
+    def _chunks(
+        self, start: datetime, end: datetime
+    ) -> Iterator[tuple[datetime, datetime]]:
+        step = timedelta(days=self.chunk_days)
+        while start < end:
+            yield start, min(start + step, end)
+            start += step
+
+    def _refresh_block(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        period: ReferencePeriod,
+        *,
+        rebuild: bool,
+    ) -> None:
+        entries = {
+            station_id: None
+            if rebuild
+            else self.cache.get(self._key(station_id, variable, period))
+            for station_id in station_ids
+        }
+        # Stations are grouped by their refresh point so each group is
+        # fetched with a single query per chunk.
+        groups: dict[datetime, list[int]] = {}
+        for station_id, entry in entries.items():
+            through = (
+                period.start
+                if entry is None
+                else entry["through"].astype("datetime64[us]").item()
+            )
+            if through < period.end:
+                groups.setdefault(through, []).append(station_id)
+
+        for through, group in groups.items():
+            binned: dict[int, FloatArray] = {}
+            for station_id in group:
+                entry = entries[station_id]
+                binned[station_id] = (
+                    np.full((period.n_years, DAYS, HOURS), np.nan)
+                    if entry is None
+                    else entry["binned"]
+                )
+            last: dict[int, np.datetime64] = {}
+            for chunk_start, chunk_end in self._chunks(through, period.end):
+                hourly = self.observations.load_hourly(
+                    group, [variable], start=chunk_start, end=chunk_end
+                )
+                values = hourly.variable(variable)
+                year, day, hour = calendar_index(hourly.times)
+                year_index = year - period.start_year
+                for column, station_id in enumerate(hourly.station_ids):
+                    series = values[:, column]
+                    observed = ~np.isnan(series)
+                    if not observed.any():
+                        continue
+                    binned[station_id][
+                        year_index[observed], day[observed], hour[observed]
+                    ] = series[observed]
+                    last[station_id] = hourly.times[observed][-1] + 1
+
+            for station_id in group:
+                if entries[station_id] is not None and station_id not in last:
+                    continue
+                self.cache.put(
+                    self._key(station_id, variable, period),
+                    binned=binned[station_id],
+                    through=np.asarray(
+                        last.get(station_id, np.datetime64(through, "h")),
+                        dtype="datetime64[h]",
+                    ),
+                    **summarize(
+                        binned[station_id],
+                        window_days=self.window_days,
+                        levels=self.levels,
+                    ),
+                )
+            logger.info(
+                "Climatologia de %s atualizada para %d estações.",
+                variable,
+                len(group),
+            )
+
+    def normals(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        period: ReferencePeriod,
+        *,
+        refresh: bool = True,
+    ) -> Normals:
+        if refresh:
+            self.refresh(station_ids, variable, period)
+        entries = []
+        for station_id in station_ids:
+            entry = self.cache.get(self._key(station_id, variable, period))
+            if entry is None:
+                raise LookupError(
+                    f"Climatologia de {variable} não calculada para a "
+                    f"estação {station_id}."
+                )
+            entries.append(entry)
+        return Normals(
+            station_ids=tuple(station_ids),
+            variable=variable,
+            period=period,
+            levels=self.levels,
+            count=np.stack([entry["count"] for entry in entries]),
+            mean=np.stack([entry["mean"] for entry in entries]),
+            std=np.stack([entry["std"] for entry in entries]),
+            quantiles=np.stack([entry["quantiles"] for entry in entries]),
+        )
+
+    def anomalies(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        period: ReferencePeriod,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        standardize: bool = False,
+    ) -> HourlyArray:
+        """Return the anomalies of ``variable`` as an :class:`HourlyArray`.
+
+        Anomalies are a single broadcast subtraction of the cached normals,
+        optionally divided by the cached standard deviations.
+        """
+        normals = self.normals(station_ids, variable, period)
+        hourly = self.observations.load_hourly(
+            station_ids, [variable], start=start, end=end
+        )
+        columns = [normals.station_ids.index(s) for s in hourly.station_ids]
+        _, day, hour = calendar_index(hourly.times)
+        anomalies = (
+            hourly.variable(variable) - normals.mean[columns][:, day, hour].T
+        )
+        if standardize:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                anomalies = anomalies / normals.std[columns][:, day, hour].T
+        return replace(hourly, values=anomalies[:, :, np.newaxis])
@@ -0,0 +1,336 @@
+import logging
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+import numpy.typing as npt
+
+from ..cache import ArrayCache
+from ..database.repositories import ObservationRepository
+from .climatology import Normals, calendar_index
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float64]
+TimeArray = npt.NDArray[np.datetime64]
+
+
+@dataclass(frozen=True)
+class PairwiseMoments:
+    """Pairwise-complete first and second moments of a station network.
+
+    Every array is ``(stations, stations)`` and entry ``[i, j]`` only uses
+    the hours where both stations were observed: ``count`` is the number of
+    such hours, ``mean[i, j]`` and ``m2[i, j]`` the mean and sum of squared
+    deviations of station ``i`` over them, and ``comoment`` the sum of
+    cross deviations. Statistics of station ``j`` are the transposes.
+    """
+
+    station_ids: tuple[int, ...]
+    count: FloatArray
+    mean: FloatArray
+    m2: FloatArray
+    comoment: FloatArray
+
+    @classmethod
+    def empty(cls, station_ids: Sequence[int]) -> "PairwiseMoments":
+        n = len(station_ids)
+        return cls(tuple(station_ids), *(np.zeros((n, n)) for _ in range(4)))
+
+    def merge(self, other: "PairwiseMoments") -> "PairwiseMoments":
+        """Combine with moments of disjoint hours (Chan et al. update)."""
+        count = self.count + other.count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(count > 0, other.count / count, 0.0)
+            cross = np.where(count > 0, self.count * other.count / count, 0.0)
+        delta = other.mean - self.mean
+        return PairwiseMoments(
+            station_ids=self.station_ids,
+            count=count,
+            mean=self.mean + delta * weight,
+            m2=self.m2 + other.m2 + delta**2 * cross,
+            comoment=self.comoment + other.comoment + delta * delta.T * cross,
+        )
+
+    def covariance(self, ddof: int = 1) -> FloatArray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(
+                self.count > ddof, self.comoment / (self.count - ddof), np.nan
+            )
+
+    def correlation(self, min_count: int = 2) -> FloatArray:
+        """Pearson correlation over each pair's common hours."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            correlation = self.comoment / np.sqrt(self.m2 * self.m2.T)
+        return np.where(self.count >= min_count, correlation, np.nan)
+
+
+def _sums(
+    a: FloatArray, mask_a: FloatArray, b: FloatArray, mask_b: FloatArray
+) -> tuple[FloatArray, ...]:
+    return (
+        mask_a.T @ mask_b,
+        a.T @ mask_b,
+        mask_a.T @ b,
+        (a**2).T @ mask_b,
+        mask_a.T @ b**2,
+        a.T @ b,
+    )
+
+
+def _block_moments(
+    values: FloatArray,
+    rows: slice,
+    columns: slice,
+    old: FloatArray | None = None,
+) -> tuple[FloatArray, ...]:
+    """Moments of ``values[:, rows]`` against ``values[:, columns]``.
+
+    Each column is shifted by its own chunk mean first, which keeps the
+    sums of products small and the final subtraction well conditioned.
+    ``old`` flags (with ones) the hours a station has already contributed;
+    each pair then only uses the hours where at least one of the two
+    stations is new, i.e. the sums over all hours minus those over the
+    hours where both are old.
+    """
+    a = values[:, rows]
+    b = values[:, columns]
+    mask_a = (~np.isnan(a)).astype(np.float64)
+    mask_b = (~np.isnan(b)).astype(np.float64)
+    shift_a = np.nansum(a, axis=0) / np.maximum(mask_a.sum(axis=0), 1)
+    shift_b = np.nansum(b, axis=0) / np.maximum(mask_b.sum(axis=0), 1)
+    a = np.where(mask_a > 0, a - shift_a, 0.0)
+    b = np.where(mask_b > 0, b - shift_b, 0.0)
+
+    sums = _sums(a, mask_a, b, mask_b)
+    if old is not None:
+        old_a = old[:, rows]
+        old_b = old[:, columns]
+        seen = _sums(a * old_a, mask_a * old_a, b * old_b, mask_b * old_b)
+        sums = tuple(total - part for total, part in zip(sums, seen))
+    count, sum_a, sum_b, squares_a, squares_b, products = sums
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_a = np.where(count > 0, sum_a / count, 0.0)
+        mean_b = np.where(count > 0, sum_b / count, 0.0)
+    m2_a = squares_a - mean_a * sum_a
+    m2_b = squares_b - mean_b * sum_b
+    comoment = products - mean_a * sum_b
+    return (
+        count,
+        mean_a + shift_a[:, np.newaxis],
+        mean_b + shift_b[np.newaxis, :],
+        m2_a,
+        m2_b,
+        comoment,
+    )
+
+
+def chunk_moments(
+    station_ids: Sequence[int],
+    values: FloatArray,
+    *,
+    old: npt.NDArray[np.bool_] | None = None,
+    block_size: int = 100,
+    executor: Executor | None = None,
+) -> PairwiseMoments:
+    """Pairwise moments of one ``(hours, stations)`` chunk.
+
+    The upper triangle of station blocks is computed (optionally in
+    parallel; the matrix products release the GIL) and mirrored. Hours
+    flagged in ``old`` for both stations of a pair are left out.
+    """
+    weights = None if old is None else old.astype(np.float64)
+    n = values.shape[1]
+    moments = PairwiseMoments.empty(station_ids)
+    blocks = [slice(i, min(i + block_size, n)) for i in range(0, n, block_size)]
+    pairs = [
+        (rows, columns)
+        for i, rows in enumerate(blocks)
+        for columns in blocks[i:]
+    ]
+    if executor is None:
+        results = [_block_moments(values, *pair, weights) for pair in pairs]
+    else:
+        results = list(
+            executor.map(
+                lambda pair: _block_moments(values, *pair, weights), pairs
+            )
+        )
+    for (rows, columns), result in zip(pairs, results):
+        count, mean_a, mean_b, m2_a, m2_b, comoment = result
+        moments.count[rows, columns] = count
+        moments.count[columns, rows] = count.T
+        moments.mean[rows, columns] = mean_a
+        moments.mean[columns, rows] = mean_b.T
+        moments.m2[rows, columns] = m2_a
+        moments.m2[columns, rows] = m2_b.T
+        moments.comoment[rows, columns] = comoment
+        moments.comoment[columns, rows] = comoment.T
+    return moments
+
+
+class NetworkCovariance:
+    """Incrementally maintained covariance of a whole station network.
+
+    Observations (or their anomalies from climatological ``Normals``) are
+    read in time chunks of ``chunk_days``; each chunk's pairwise moments
+    are merged into the running state, which is persisted with the hour
+    each station has been read through. Later updates only read hours
+    newer than some station's mark, and a pair only takes the hours that
+    are new for at least one of its stations, so a station whose files
+    arrive late is still merged for the hours others already covered.
+    """
+
+    def __init__(
+        self,
+        observations: ObservationRepository,
+        cache: ArrayCache | None = None,
+        *,
+        chunk_days: int = 90,
+        block_size: int = 100,
+        max_workers: int | None = None,
+    ) -> None:
+        self.observations = observations
+        self.cache = cache or ArrayCache("covariance")
+        self.chunk_days = chunk_days
+        self.block_size = block_size
+        self.max_workers = max_workers
+
+    def _key(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        start: datetime,
+        normals: Normals | None,
+    ) -> str:
+        return ArrayCache.key(
+            tuple(station_ids),
+            variable,
+            start,
+            None if normals is None else (normals.period, normals.variable),
+        )
+
+    def _chunks(
+        self, start: datetime, end: datetime
+    ) -> Iterator[tuple[datetime, datetime]]:
+        step = timedelta(days=self.chunk_days)
+        while start < end:
+            yield start, min(start + step, end)
+            start += step
+
+    def load(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        *,
+        start: datetime,
+        normals: Normals | None = None,
+    ) -> tuple[PairwiseMoments, TimeArray] | None:
+        """Return the moments persisted from ``start`` and each station's
+        mark, the hour it has been read through.
+        """
+        ids = tuple(sorted(set(station_ids)))
+        entry = self.cache.get(self._key(ids, variable, start, normals))
+        if entry is None:
+            return None
+        moments = PairwiseMoments(
+            station_ids=ids,
+            count=entry["count"],
+            mean=entry["mean"],
+            m2=entry["m2"],
+            comoment=entry["comoment"],
+        )
+        return moments, entry["through"]
+
+    def update(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        *,
+        start: datetime,
+        end: datetime,
+        normals: Normals | None = None,
+        rebuild: bool = False,
+    ) -> PairwiseMoments:
+        """Merge the hours in ``[start, end)`` not yet processed.
+
+        ``rebuild`` discards the persisted state, e.g. after backfilling
+        hours older than a station's last observation already merged.
+        """
+        ids = tuple(sorted(set(station_ids)))
+        if normals is not None and normals.variable != variable:
+            raise ValueError(
+                f"Normais de {normals.variable} não servem para {variable}."
+            )
+        stored = (
+            None
+            if rebuild
+            else self.load(ids, variable, start=start, normals=normals)
+        )
+        if stored is None:
+            moments = PairwiseMoments.empty(ids)
+            through = np.full(len(ids), np.datetime64(start, "h"))
+        else:
+            moments, through = stored
+        # Stations with nothing newer than their mark add no hours, so they
+        # do not hold back where reading starts.
+        spans = self.observations.time_spans(ids)
+        pending = [
+            mark
+            for station_id, mark in zip(ids, through)
+            if station_id in spans
+            and np.datetime64(spans[station_id][1], "h") >= mark
+        ]
+        if not pending:
+            return moments
+        first = min(pending).astype("datetime64[us]").item()
+        if normals is not None:
+            columns = [normals.station_ids.index(s) for s in ids]
+            mean = normals.mean[columns]
+
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            for chunk_start, chunk_end in self._chunks(max(start, first), end):
+                hourly = self.observations.load_hourly(
+                    ids, [variable], start=chunk_start, end=chunk_end
+                )
+                values = hourly.variable(variable)
+                observed = ~np.isnan(values)
+                if not observed.any():
+                    continue
+                old = hourly.times[:, np.newaxis] < through
+                if normals is not None:
+                    _, day, hour = calendar_index(hourly.times)
+                    values = values - mean[:, day, hour].T
+                moments = moments.merge(
+                    chunk_moments(
+                        ids,
+                        values,
+                        old=old if old.any() else None,
+                        block_size=self.block_size,
+                        executor=executor,
+                    )
+                )
+                # Each station only counts as read up to its own last
+                # reading, so hours ingested later for it are not skipped.
+                last = len(values) - 1 - np.argmax(observed[::-1], axis=0)
+                through = np.where(
+                    observed.any(axis=0),
+                    np.maximum(through, hourly.times[last] + 1),
+                    through,
+                )
+                self.cache.put(
+                    self._key(ids, variable, start, normals),
+                    count=moments.count,
+                    mean=moments.mean,
+                    m2=moments.m2,
+                    comoment=moments.comoment,
+                    through=through,
+                )
+                logger.info(
+                    "Covariância de %s atualizada até %s.",
+                    variable,
+                    through.max().astype("datetime64[D]"),
+                )
+        return moments
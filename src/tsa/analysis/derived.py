@@ -0,0 +1,333 @@
+import logging
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from ..database.repositories import (
+    DerivedValueRepository,
+    ObservationRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float64]
+TimeArray = npt.NDArray[np.datetime64]
+
+
+@dataclass(frozen=True)
+class DerivedVariable:
+    """Formula computing a variable from raw ``Observation`` columns.
+
+    ``function`` receives the ``inputs`` as arrays with time on the first
+    axis and must work elementwise. Daily variables are reduced per UTC day
+    with ``aggregate`` and stamped at midnight; days with fewer than
+    ``min_fraction`` of their 24 hours observed come back ``NaN``.
+    """
+
+    name: str
+    inputs: tuple[str, ...]
+    function: Callable[..., FloatArray]
+    description: str = ""
+    aggregate: Literal["sum", "mean"] | None = None
+    min_fraction: float = 0.0
+
+
+DERIVED_VARIABLES: dict[str, DerivedVariable] = {}
+
+
+def derived_variable(
+    name: str,
+    inputs: Sequence[str],
+    *,
+    aggregate: Literal["sum", "mean"] | None = None,
+    min_fraction: float = 0.0,
+) -> Callable[[Callable[..., FloatArray]], Callable[..., FloatArray]]:
+    """Register the decorated formula in :data:`DERIVED_VARIABLES`."""
+
+    def register(
+        function: Callable[..., FloatArray],
+    ) -> Callable[..., FloatArray]:
+        DERIVED_VARIABLES[name] = DerivedVariable(
+            name=name,
+            inputs=tuple(inputs),
+            function=function,
+            description=(function.__doc__ or "").strip(),
+            aggregate=aggregate,
+            min_fraction=min_fraction,
+        )
+        return function
+
+    return register
+
+
+@derived_variable("wind_u", ["wind_speed", "wind_direction"])
+def wind_u(speed: FloatArray, direction: FloatArray) -> FloatArray:
+    """Componente zonal do vento (m/s, positiva para leste)."""
+    return -speed * np.sin(np.radians(direction))
+
+
+@derived_variable("wind_v", ["wind_speed", "wind_direction"])
+def wind_v(speed: FloatArray, direction: FloatArray) -> FloatArray:
+    """Componente meridional do vento (m/s, positiva para norte)."""
+    return -speed * np.cos(np.radians(direction))
+
+
+@derived_variable("vapor_pressure", ["dew_point_temperature"])
+def vapor_pressure(dew_point: FloatArray) -> FloatArray:
+    """Pressão de vapor (hPa) pela fórmula de Magnus."""
+    return 6.112 * np.exp(17.67 * dew_point / (dew_point + 243.5))
+
+
+@derived_variable(
+    "specific_humidity", ["dew_point_temperature", "atmospheric_pressure"]
+)
+def specific_humidity(
+    dew_point: FloatArray, pressure: FloatArray
+) -> FloatArray:
+    """Umidade específica (kg/kg)."""
+    e = vapor_pressure(dew_point)
+    return 0.622 * e / (pressure - 0.378 * e)
+
+
+@derived_variable("heat_index", ["air_temperature", "relative_humidity"])
+def heat_index(temperature: FloatArray, humidity: FloatArray) -> FloatArray:
+    """Índice de calor (°C) pela regressão de Rothfusz (NWS)."""
+    t = temperature * 9 / 5 + 32
+    rh = humidity
+    simple = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+    full = (
+        -42.379
+        + 2.04901523 * t
+        + 10.14333127 * rh
+        - 0.22475541 * t * rh
+        - 6.83783e-3 * t**2
+        - 5.481717e-2 * rh**2
+        + 1.22874e-3 * t**2 * rh
+        + 8.5282e-4 * t * rh**2
+        - 1.99e-6 * t**2 * rh**2
+    )
+    with np.errstate(invalid="ignore"):
+        dry = (rh < 13) & (t >= 80) & (t <= 112)
+        full = full - np.where(
+            dry,
+            (13 - rh) / 4 * np.sqrt(np.clip(17 - np.abs(t - 95), 0, None) / 17),
+            0.0,
+        )
+        humid = (rh > 85) & (t >= 80) & (t <= 87)
+        full = full + np.where(humid, (rh - 85) / 10 * (87 - t) / 5, 0.0)
+    result = np.where((simple + t) / 2 >= 80, full, simple)
+    return (result - 32) * 5 / 9
+
+
+# Same threshold as the resampling rule for global_radiation: stations do
+# not report at night, so a complete day has only about half of its hours.
+@derived_variable(
+    "daily_radiation", ["global_radiation"], aggregate="sum", min_fraction=0.4
+)
+def daily_radiation(radiation: FloatArray) -> FloatArray:
+    """Radiação global diária (MJ/m²); leituras negativas contam como zero."""
+    return np.clip(radiation, 0.0, None) / 1000.0
+
+
+def reduce_daily(
+    times: TimeArray,
+    values: FloatArray,
+    aggregate: Literal["sum", "mean"],
+    min_fraction: float = 0.0,
+) -> tuple[TimeArray, FloatArray]:
+    """Reduce sorted hourly ``values`` per UTC day, ignoring ``NaN``.
+
+    Days without any reading, or with fewer than ``min_fraction`` of their
+    24 hours observed, come back ``NaN``.
+    """
+    days = times.astype("datetime64[D]")
+    unique, starts = np.unique(days, return_index=True)
+    if not len(unique):
+        return unique, values[:0]
+    observed = ~np.isnan(values)
+    total = np.add.reduceat(np.where(observed, values, 0.0), starts, axis=0)
+    count = np.add.reduceat(observed, starts, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = total / count if aggregate == "mean" else total
+    valid = (count > 0) & (count >= min_fraction * 24)
+    return unique, np.where(valid, result, np.nan)
+
+
+def compute_derived(
+    times: TimeArray,
+    columns: Mapping[str, FloatArray],
+    names: Sequence[str] | None = None,
+) -> dict[str, tuple[TimeArray, FloatArray]]:
+    """Evaluate the registered formulas over arrays sorted by time.
+
+    Variables whose inputs are missing from ``columns`` are skipped.
+    """
+    results: dict[str, tuple[TimeArray, FloatArray]] = {}
+    for name in names or DERIVED_VARIABLES:
+        variable = DERIVED_VARIABLES[name]
+        if not set(variable.inputs) <= set(columns):
+            continue
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = variable.function(
+                *(np.asarray(columns[i], np.float64) for i in variable.inputs)
+            )
+        if variable.aggregate:
+            results[name] = reduce_daily(
+                times, values, variable.aggregate, variable.min_fraction
+            )
+        else:
+            results[name] = (times, values)
+    return results
+
+
+class DerivedStage:
+    """Compute and store derived variables in ``inmet.derived_values``.
+
+    :meth:`apply` runs on the arrays of a freshly loaded file, while
+    :meth:`backfill` walks existing observations in day-aligned time chunks
+    over all requested stations at once.
+    """
+
+    def __init__(
+        self,
+        observations: ObservationRepository,
+        derived: DerivedValueRepository,
+        *,
+        names: Sequence[str] | None = None,
+        chunk_days: int = 30,
+    ) -> None:
+        unknown = set(names or ()) - set(DERIVED_VARIABLES)
+        if unknown:
+            raise ValueError(
+                f"Variáveis derivadas desconhecidas: {sorted(unknown)}"
+            )
+        self.observations = observations
+        self.derived = derived
+        self.names = tuple(names or DERIVED_VARIABLES)
+        self.chunk_days = chunk_days
+
+    @property
+    def inputs(self) -> list[str]:
+        return sorted(
+            {
+                column
+                for name in self.names
+                for column in DERIVED_VARIABLES[name].inputs
+            }
+        )
+
+    def _store(
+        self,
+        station_ids: Sequence[int],
+        times: TimeArray,
+        columns: Mapping[str, FloatArray],
+        start: datetime,
+        end: datetime,
+    ) -> int:
+        results = compute_derived(times, columns, self.names)
+        rows = [
+            row
+            for name, (stamps, values) in results.items()
+            for row in _rows(name, station_ids, stamps, values)
+        ]
+        self.derived.replace_range(station_ids, list(results), start, end, rows)
+        return len(rows)
+
+    def apply(
+        self,
+        station_id: int,
+        times: TimeArray,
+        columns: Mapping[str, FloatArray],
+    ) -> int:
+        """Replace the derived values of one station over the days of ``times``."""
+        if not len(times):
+            return 0
+        order = np.argsort(times, kind="stable")
+        times = times[order].astype("datetime64[h]")
+        columns = {
+            name: np.asarray(values, np.float64)[order, np.newaxis]
+            for name, values in columns.items()
+        }
+        days = times.astype("datetime64[D]")
+        start = days[0].astype(datetime)
+        end = (days[-1] + 1).astype(datetime)
+        return self._store(
+            [station_id],
+            times,
+            columns,
+            datetime(start.year, start.month, start.day),
+            datetime(end.year, end.month, end.day),
+        )
+
+    def _chunks(
+        self, start: datetime, end: datetime
+    ) -> Iterator[tuple[datetime, datetime]]:
+        step = timedelta(days=self.chunk_days)
+        start = datetime(start.year, start.month, start.day)
+        while start < end:
+            yield start, min(start + step, end)
+            start += step
+
+    def backfill(
+        self,
+        station_ids: Sequence[int],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> int:
+        """Recompute derived values over existing rows, one chunk at a time."""
+        if start is None or end is None:
+            first, last = self.observations.time_span(station_ids)
+            if first is None or last is None:
+                return 0
+            start = start or first
+            end = end or datetime(last.year, last.month, last.day) + timedelta(
+                days=1
+            )
+        total = 0
+        for chunk_start, chunk_end in self._chunks(start, end):
+            hourly = self.observations.load_hourly(
+                station_ids, self.inputs, start=chunk_start, end=chunk_end
+            )
+            columns = {name: hourly.variable(name) for name in self.inputs}
+            count = self._store(
+                hourly.station_ids,
+                hourly.times,
+                columns,
+                chunk_start,
+                chunk_end,
+            )
+            total += count
+            logger.info(
+                "%s..%s: %d valores derivados.",
+                chunk_start.date(),
+                chunk_end.date(),
+                count,
+            )
+        return total
+
+
+def _rows(
+    variable: str,
+    station_ids: Sequence[int],
+    times: TimeArray,
+    values: FloatArray,
+) -> list[dict[str, Any]]:
+    time_index, station_index = np.nonzero(np.isfinite(values))
+    return [
+        {
+            "station_id": station_ids[column],
+            "variable": variable,
+            "datetime": time,
+            "value": float(value),
+        }
+        for column, time, value in zip(
+            station_index,
+            times[time_index].astype("datetime64[us]").astype(datetime),
+            values[time_index, station_index],
+        )
+    ]
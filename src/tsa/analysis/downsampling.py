@@ -0,0 +1,339 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from ..cache import ArrayCache
+from ..database.repositories import ObservationRepository
+from .resampling import Aggregation, ColumnRule, resample
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+TimeArray = npt.NDArray[np.datetime64]
+
+Method = Literal["lttb", "minmax"]
+
+
+def lttb(x: FloatArray, y: FloatArray, n_out: int) -> IntArray:
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling.
+
+    ``x`` must be increasing and both arrays free of ``NaN``. The first and
+    last points are always kept; each bucket in between keeps the point
+    forming the largest triangle with the previously kept point and the
+    average of the next bucket. Bucket averages are precomputed with
+    ``reduceat``, so the Python loop only runs ``n_out`` times.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    sizes = np.diff(edges)
+    avg_x = np.add.reduceat(x[:-1], edges[:-1]) / sizes
+    avg_y = np.add.reduceat(y[:-1], edges[:-1]) / sizes
+    # The last bucket is compared against the final point itself.
+    next_x = np.r_[avg_x[1:], x[-1]]
+    next_y = np.r_[avg_y[1:], y[-1]]
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (next_y[i] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(x: FloatArray, y: FloatArray, n_buckets: int) -> IntArray:
+    """Indices of the minimum and maximum of ``y`` in equal-width ``x`` bins.
+
+    Unlike LTTB it never hides a spike, and it needs no Python loop.
+    """
+    n = len(x)
+    if 2 * n_buckets >= n:
+        return np.arange(n)
+    span = x[-1] - x[0] or 1.0
+    bucket = np.minimum(
+        ((x - x[0]) / span * n_buckets).astype(np.int64), n_buckets - 1
+    )
+    order = np.lexsort((y, bucket))
+    starts = np.flatnonzero(np.r_[True, np.diff(bucket[order]) != 0])
+    ends = np.r_[starts[1:], n] - 1
+    return np.unique(np.concatenate([order[starts], order[ends]]))
+
+
+def _hours(times: TimeArray) -> FloatArray:
+    return times.astype("datetime64[h]").astype(np.float64)
+
+
+@dataclass(frozen=True)
+class PlotData:
+    """Points ready to hand to a plotting library.
+
+    ``lower`` and ``upper`` bound each point when it summarizes more than
+    one hour (daily rollups), and are ``None`` for raw hourly points.
+    """
+
+    times: TimeArray
+    values: FloatArray
+    lower: FloatArray | None
+    upper: FloatArray | None
+    resolution: Literal["hour", "day"]
+    n_source: int
+
+
+class SeriesView:
+    """Viewport-aware access to long observation series.
+
+    Requests covering at most ``raw_points_per_pixel * width`` hours read
+    only the visible range of raw observations and downsample it. Wider
+    requests use daily min/mean/max rollups kept in an
+    :class:`~tsa.cache.ArrayCache` and refreshed with the newest days only,
+    so zooming out to a full history never touches the raw rows again.
+    """
+
+    def __init__(
+        self,
+        observations: ObservationRepository,
+        cache: ArrayCache | None = None,
+        *,
+        raw_points_per_pixel: int = 20,
+    ) -> None:
+        self.observations = observations
+        self.cache = cache or ArrayCache("rollups")
+        self.raw_points_per_pixel = raw_points_per_pixel
+
+    def rollup(
+        self, station_id: int, variable: str
+    ) -> dict[str, npt.NDArray[np.generic]]:
+        """Daily ``low``/``mean``/``high`` of the station's whole history."""
+        key = ArrayCache.key(station_id, variable)
+        entry = self.cache.get(key)
+        _, last = self.observations.time_span([station_id])
+        if last is None:
+            raise LookupError(f"Estação {station_id} sem observações.")
+        last_hour = np.datetime64(last, "h")
+        if entry is not None and entry["through"] > last_hour:
+            return entry
+
+        if entry is None:
+            start = None
+        else:
+            # The last cached day may have been partial, so redo it.
+            first_day = entry["through"].astype("datetime64[D]")
+            keep = entry["times"] < first_day
+            entry = {
+                name: entry[name][keep]
+                for name in ("times", "low", "mean", "high")
+            }
+            start = first_day.astype("datetime64[us]").item()
+        hourly = self.observations.load_hourly(
+            [station_id], [variable], start=start, end=last + timedelta(hours=1)
+        )
+        reduced = {
+            name: resample(
+                hourly,
+                "D",
+                {variable: ColumnRule(aggregation, min_fraction=0.0)},
+            )
+            for name, aggregation in (
+                ("low", Aggregation.MIN),
+                ("mean", Aggregation.MEAN),
+                ("high", Aggregation.MAX),
+            )
+        }
+        fresh = {
+            name: result.variable(variable)[:, 0]
+            for name, result in reduced.items()
+        }
+        fresh["times"] = reduced["mean"].times
+        if entry is not None:
+            fresh = {
+                name: np.concatenate([entry[name], fresh[name]])
+                for name in fresh
+            }
+        fresh["through"] = np.asarray(last_hour + 1)
+        self.cache.put(key, **fresh)
+        logger.info(
+            "Agregados diários de %s atualizados para a estação %d.",
+            variable,
+            station_id,
+        )
+        return fresh
+
+    def fetch(
+        self,
+        station_id: int,
+        variable: str,
+        *,
+        start: datetime,
+        end: datetime,
+        width: int = 1000,
+        method: Method = "minmax",
+    ) -> PlotData:
+        """Return about ``width`` points of ``variable`` in ``[start, end)``."""
+        span = (end - start) / timedelta(hours=1)
+        if span <= self.raw_points_per_pixel * width:
+            return self._raw(station_id, variable, start, end, width, method)
+        return self._daily(station_id, variable, start, end, width)
+
+    def _raw(
+        self,
+        station_id: int,
+        variable: str,
+        start: datetime,
+        end: datetime,
+        width: int,
+        method: Method,
+    ) -> PlotData:
+        hourly = self.observations.load_hourly(
+            [station_id], [variable], start=start, end=end
+        )
+        values = hourly.variable(variable)[:, 0]
+        observed = ~np.isnan(values)
+        times, values = hourly.times[observed], values[observed]
+        x = _hours(times)
+        if method == "lttb":
+            keep = lttb(x, values, width)
+        else:
+            keep = minmax(x, values, max(width // 2, 1))
+        return PlotData(
+            times=times[keep],
+            values=values[keep],
+            lower=None,
+            upper=None,
+            resolution="hour",
+            n_source=len(values),
+        )
+
+    def _daily(
+        self,
+        station_id: int,
+        variable: str,
+        start: datetime,
+        end: datetime,
+        width: int,
+    ) -> PlotData:
+        rollup = self.rollup(station_id, variable)
+        times = rollup["times"]
+        visible = (
+            (times >= np.datetime64(start, "D"))
+            & (times < np.datetime64(end, "D") + 1)
+            & ~np.isnan(rollup["mean"].astype(np.float64))
+        )
+        times = times[visible]
+        low, mean, high = (
+            rollup[name][visible].astype(np.float64)
+            for name in ("low", "mean", "high")
+        )
+        n_source = len(times)
+        if n_source > width:
+            # Merge days into ``width`` equal-width buckets, keeping the
+            # envelope so peaks survive.
+            x = _hours(times)
+            span = x[-1] - x[0] or 1.0
+            bucket = np.minimum(
+                ((x - x[0]) / span * width).astype(np.int64), width - 1
+            )
+            starts = np.flatnonzero(np.r_[True, np.diff(bucket) != 0])
+            counts = np.diff(np.r_[starts, n_source])
+            times = times[starts]
+            low = np.fmin.reduceat(low, starts)
+            high = np.fmax.reduceat(high, starts)
+            mean = np.add.reduceat(mean, starts) / counts
+        return PlotData(
+            times=times,
+            values=mean,
+            lower=low,
+            upper=high,
+            resolution="day",
+            n_source=n_source,
+        )
+
+    def figure(
+        self,
+        station_id: int,
+        variable: str,
+        *,
+        start: datetime,
+        end: datetime,
+        width: int = 1000,
+        method: Method = "minmax",
+    ) -> "go.Figure":
+        """Plotly figure of ``[start, end)``, see :meth:`redraw`."""
+        import plotly.graph_objects as go
+
+        figure = go.Figure(layout={"xaxis": {"type": "date"}})
+        self.redraw(
+            figure,
+            station_id,
+            variable,
+            start=start,
+            end=end,
+            width=width,
+            method=method,
+        )
+        return figure
+
+    def redraw(
+        self,
+        figure: "go.Figure",
+        station_id: int,
+        variable: str,
+        *,
+        start: datetime,
+        end: datetime,
+        width: int = 1000,
+        method: Method = "minmax",
+    ) -> None:
+        """Replace the traces of ``figure`` with a fresh query.
+
+        Daily rollups are drawn as their mean with the min/max envelope as
+        a filled band, so peaks stay visible when zoomed out. Call it with
+        the new x range on zoom, e.g. from a Dash ``relayoutData`` callback
+        or an ``xaxis.range`` observer of a ``go.FigureWidget``.
+        """
+        import plotly.graph_objects as go
+
+        data = self.fetch(
+            station_id,
+            variable,
+            start=start,
+            end=end,
+            width=width,
+            method=method,
+        )
+        x = data.times.astype("datetime64[ms]")
+        traces: list[go.Scattergl] = []
+        if data.lower is not None and data.upper is not None:
+            band = {"mode": "lines", "line": {"width": 0}, "hoverinfo": "skip"}
+            traces += [
+                go.Scattergl(x=x, y=data.lower, showlegend=False, **band),
+                go.Scattergl(
+                    x=x,
+                    y=data.upper,
+                    name="mín-máx",
+                    fill="tonexty",
+                    fillcolor="rgba(99, 110, 250, 0.2)",
+                    **band,
+                ),
+            ]
+        traces.append(
+            go.Scattergl(x=x, y=data.values, mode="lines", name=variable)
+        )
+        with figure.batch_update():
+            figure.data = ()
+            figure.add_traces(traces)
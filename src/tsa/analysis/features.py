@@ -0,0 +1,466 @@
+import logging
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Literal, Protocol
+
+import numpy as np
+import numpy.typing as npt
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..database.repositories import (
+    HourlyArray,
+    ObservationRepository,
+    StationRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+Float32Array = npt.NDArray[np.float32]
+
+
+@dataclass(frozen=True)
+class Block:
+    """Hourly data of a block of target stations and their neighbours.
+
+    ``targets`` are the columns of ``hourly`` holding the target stations
+    and ``neighbours`` their ``(targets, k)`` neighbour columns (``-1`` when
+    there is no neighbour).
+    """
+
+    hourly: HourlyArray
+    targets: IntArray
+    neighbours: IntArray
+
+    def target_values(self, variable: str) -> FloatArray:
+        return self.hourly.variable(variable)[:, self.targets]
+
+
+class Feature(Protocol):
+    @property
+    def variables(self) -> tuple[str, ...]: ...
+
+    def names(self) -> list[str]: ...
+
+    def compute(self, block: Block) -> FloatArray:
+        """Return a ``(hours, targets, len(names))`` array."""
+        ...
+
+
+def shift(values: FloatArray, periods: int) -> FloatArray:
+    """Shift along the time axis, ``NaN``-filled; negative periods lead."""
+    shifted = np.full_like(values, np.nan)
+    if periods > 0:
+        shifted[periods:] = values[:-periods]
+    elif periods < 0:
+        shifted[:periods] = values[-periods:]
+    else:
+        shifted[:] = values
+    return shifted
+
+
+@dataclass(frozen=True)
+class Lags:
+    """Values ``lag`` hours before (positive) or after (negative) each row."""
+
+    variable: str
+    lags: tuple[int, ...] = (1, 2, 3, 24)
+
+    @property
+    def variables(self) -> tuple[str, ...]:
+        return (self.variable,)
+
+    def names(self) -> list[str]:
+        return [
+            f"{self.variable}_lag{lag}"
+            if lag >= 0
+            else f"{self.variable}_lead{-lag}"
+            for lag in self.lags
+        ]
+
+    def compute(self, block: Block) -> FloatArray:
+        values = block.target_values(self.variable)
+        return np.stack([shift(values, lag) for lag in self.lags], axis=2)
+
+
+@dataclass(frozen=True)
+class Rolling:
+    """Trailing-window statistics ending ``offset`` hours before each row.
+
+    ``offset=1`` keeps the current hour out of the window, so the feature
+    never sees the value it may be used to predict.
+    """
+
+    variable: str
+    window: int
+    statistics: tuple[Literal["mean", "sum", "std", "min", "max"], ...] = (
+        "mean",
+    )
+    offset: int = 1
+    min_periods: int = 1
+
+    @property
+    def variables(self) -> tuple[str, ...]:
+        return (self.variable,)
+
+    def names(self) -> list[str]:
+        return [
+            f"{self.variable}_{statistic}{self.window}h"
+            for statistic in self.statistics
+        ]
+
+    def compute(self, block: Block) -> FloatArray:
+        values = shift(block.target_values(self.variable), self.offset)
+        observed = ~np.isnan(values)
+        filled = np.where(observed, values, 0.0)
+
+        def window_sum(array: FloatArray) -> FloatArray:
+            cumulative = np.cumsum(array, axis=0)
+            cumulative[self.window :] -= cumulative[: -self.window].copy()
+            return cumulative
+
+        count = window_sum(observed.astype(np.float64))
+        total = window_sum(filled)
+        result = []
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for statistic in self.statistics:
+                if statistic == "sum":
+                    result.append(total)
+                elif statistic == "mean":
+                    result.append(total / count)
+                elif statistic == "std":
+                    mean = total / count
+                    squares = window_sum(filled**2)
+                    variance = squares / count - mean**2
+                    result.append(
+                        np.where(
+                            count > 1,
+                            np.sqrt(
+                                np.maximum(variance, 0) * count / (count - 1)
+                            ),
+                            np.nan,
+                        )
+                    )
+                else:
+                    padded = np.concatenate(
+                        [
+                            np.full(
+                                (self.window - 1, *values.shape[1:]), np.nan
+                            ),
+                            values,
+                        ]
+                    )
+                    windows = sliding_window_view(padded, self.window, axis=0)
+                    reduce = np.fmax if statistic == "max" else np.fmin
+                    result.append(reduce.reduce(windows, axis=-1))
+        stacked = np.stack(result, axis=2)
+        stacked[count < self.min_periods] = np.nan
+        return stacked
+
+
+@dataclass(frozen=True)
+class Cyclic:
+    """Sine/cosine encodings of calendar components of each row's time."""
+
+    components: tuple[
+        Literal["hour", "dayofweek", "dayofyear", "month"], ...
+    ] = ("hour", "dayofyear")
+
+    @property
+    def variables(self) -> tuple[str, ...]:
+        return ()
+
+    def names(self) -> list[str]:
+        return [
+            f"{component}_{function}"
+            for component in self.components
+            for function in ("sin", "cos")
+        ]
+
+    def compute(self, block: Block) -> FloatArray:
+        times = block.hourly.times
+        days = times.astype("datetime64[D]")
+        phases = {
+            "hour": (times - days).astype(np.int64) / 24,
+            # 1970-01-01 was a Thursday.
+            "dayofweek": ((days.astype(np.int64) + 3) % 7) / 7,
+            "dayofyear": (days - days.astype("datetime64[Y]")).astype(np.int64)
+            / 365.25,
+            "month": (
+                days.astype("datetime64[M]") - days.astype("datetime64[Y]")
+            ).astype(np.int64)
+            / 12,
+        }
+        columns = []
+        for component in self.components:
+            angle = 2 * np.pi * phases[component]
+            columns.extend([np.sin(angle), np.cos(angle)])
+        encoded = np.stack(columns, axis=1)[:, np.newaxis, :]
+        return np.broadcast_to(
+            encoded, (len(times), len(block.targets), len(columns))
+        )
+
+
+@dataclass(frozen=True)
+class Neighbours:
+    """Values of the ``k`` nearest stations, nearest first, ``lag`` hours back."""
+
+    variable: str
+    k: int = 3
+    lag: int = 0
+
+    @property
+    def variables(self) -> tuple[str, ...]:
+        return (self.variable,)
+
+    def names(self) -> list[str]:
+        suffix = f"_lag{self.lag}" if self.lag else ""
+        return [
+            f"{self.variable}_neighbour{rank + 1}{suffix}"
+            for rank in range(self.k)
+        ]
+
+    def compute(self, block: Block) -> FloatArray:
+        values = shift(block.hourly.variable(self.variable), self.lag)
+        columns = block.neighbours[:, : self.k]
+        result = values[:, np.where(columns >= 0, columns, 0)]
+        result[:, columns < 0] = np.nan
+        return result
+
+
+@dataclass(frozen=True)
+class Target:
+    """Value of ``variable`` ``horizon`` hours after each row."""
+
+    variable: str
+    horizon: int = 1
+
+    def compute(self, block: Block) -> FloatArray:
+        return shift(block.target_values(self.variable), -self.horizon)
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    features: tuple[Feature, ...]
+    target: Target | None = None
+
+    @property
+    def names(self) -> list[str]:
+        return [name for feature in self.features for name in feature.names()]
+
+    @property
+    def variables(self) -> list[str]:
+        variables = [v for feature in self.features for v in feature.variables]
+        if self.target:
+            variables.append(self.target.variable)
+        return list(dict.fromkeys(variables))
+
+    @property
+    def n_neighbours(self) -> int:
+        return max(
+            (f.k for f in self.features if isinstance(f, Neighbours)),
+            default=0,
+        )
+
+
+@dataclass(frozen=True)
+class FeatureMatrix:
+    """Feature rows ordered by station, then hour.
+
+    Row ``i * len(times) + h`` holds station ``station_ids[i]`` at
+    ``times[h]``.
+    """
+
+    x: Float32Array
+    y: Float32Array | None
+    names: list[str]
+    station_ids: tuple[int, ...]
+    times: npt.NDArray[np.datetime64] = field(repr=False)
+
+
+class FeatureBuilder:
+    """Build feature matrices straight from the observation store.
+
+    Stations are processed in blocks of ``station_block`` together with
+    their neighbours, and every feature writes its columns directly into a
+    slice of the preallocated ``float32`` output, so peak memory stays near
+    the size of the output plus one block of hourly data.
+    """
+
+    def __init__(
+        self,
+        observations: ObservationRepository,
+        stations: StationRepository,
+        spec: FeatureSpec,
+        *,
+        station_block: int = 20,
+    ) -> None:
+        self.observations = observations
+        self.stations = stations
+        self.spec = spec
+        self.station_block = station_block
+
+    def _blocks(
+        self, station_ids: Sequence[int], start: datetime, end: datetime
+    ) -> Iterator[tuple[list[int], Block]]:
+        ids = list(dict.fromkeys(station_ids))
+        k = self.spec.n_neighbours
+        if k:
+            index = self.stations.spatial_index()
+            neighbour_ids, _ = index.neighbours(ids, k)
+        for first in range(0, len(ids), self.station_block):
+            targets = ids[first : first + self.station_block]
+            involved = set(targets)
+            if k:
+                block_neighbours = neighbour_ids[first : first + len(targets)]
+                involved |= set(block_neighbours.ravel().tolist())
+            hourly = self.observations.load_hourly(
+                sorted(involved), self.spec.variables, start=start, end=end
+            )
+            column = {s: i for i, s in enumerate(hourly.station_ids)}
+            neighbours = np.full((len(targets), k), -1, dtype=np.int64)
+            if k:
+                found = np.array(
+                    [[column[int(s)] for s in row] for row in block_neighbours]
+                ).reshape(len(targets), -1)
+                neighbours[:, : found.shape[1]] = found
+            yield (
+                targets,
+                Block(
+                    hourly=hourly,
+                    targets=np.array([column[s] for s in targets]),
+                    neighbours=neighbours,
+                ),
+            )
+
+    def _fill(
+        self, block: Block, x: Float32Array, y: Float32Array | None
+    ) -> None:
+        n_hours = len(block.hourly.times)
+        n_targets = len(block.targets)
+        out = x.reshape(n_targets, n_hours, x.shape[1])
+        column = 0
+        for feature in self.spec.features:
+            width = len(feature.names())
+            out[:, :, column : column + width] = feature.compute(
+                block
+            ).transpose(1, 0, 2)
+            column += width
+        if y is not None and self.spec.target:
+            y.reshape(n_targets, n_hours)[:] = self.spec.target.compute(block).T
+
+    def build(
+        self,
+        station_ids: Sequence[int],
+        *,
+        start: datetime,
+        end: datetime,
+        path: Path | None = None,
+    ) -> FeatureMatrix:
+        """Build the full matrix, memory-mapped under ``path`` if given.
+
+        With ``path``, ``x`` and ``y`` are written to ``<path>.x.npy`` and
+        ``<path>.y.npy`` and can be reopened with ``np.load(mmap_mode="r")``.
+        """
+        ids = list(dict.fromkeys(station_ids))
+        times = np.arange(
+            np.datetime64(start, "h"),
+            np.datetime64(end, "h"),
+            dtype="datetime64[h]",
+        )
+        n_rows = len(ids) * len(times)
+        n_features = len(self.spec.names)
+        x: Float32Array
+        y: Float32Array | None = None
+        if path is None:
+            x = np.empty((n_rows, n_features), dtype=np.float32)
+            if self.spec.target:
+                y = np.empty(n_rows, dtype=np.float32)
+        else:
+            x = np.lib.format.open_memmap(
+                path.with_suffix(".x.npy"),
+                mode="w+",
+                dtype=np.float32,
+                shape=(n_rows, n_features),
+            )
+            if self.spec.target:
+                y = np.lib.format.open_memmap(
+                    path.with_suffix(".y.npy"),
+                    mode="w+",
+                    dtype=np.float32,
+                    shape=(n_rows,),
+                )
+
+        row = 0
+        for targets, block in self._blocks(ids, start, end):
+            size = len(targets) * len(times)
+            self._fill(
+                block,
+                x[row : row + size],
+                None if y is None else y[row : row + size],
+            )
+            row += size
+            logger.info("Atributos de %d estações gerados.", row // len(times))
+        if isinstance(x, np.memmap):
+            x.flush()
+        if isinstance(y, np.memmap):
+            y.flush()
+        return FeatureMatrix(
+            x=x,
+            y=y,
+            names=self.spec.names,
+            station_ids=tuple(ids),
+            times=times,
+        )
+
+    def batches(
+        self,
+        station_ids: Sequence[int],
+        *,
+        start: datetime,
+        end: datetime,
+        batch_size: int = 4096,
+        dropna: bool = True,
+    ) -> Iterator[tuple[Float32Array, Float32Array | None]]:
+        """Yield ``(x, y)`` mini-batches suitable for ``partial_fit``.
+
+        Only one block of stations is materialized at a time, in a buffer
+        reused across blocks. With ``dropna``, rows with any missing feature
+        or target are skipped; without it, batches are views into that
+        buffer and are overwritten once the next block is built.
+        """
+        n_hours = len(
+            np.arange(
+                np.datetime64(start, "h"),
+                np.datetime64(end, "h"),
+                dtype="datetime64[h]",
+            )
+        )
+        n_features = len(self.spec.names)
+        buffer = np.empty(
+            (self.station_block * n_hours, n_features), dtype=np.float32
+        )
+        target = (
+            np.empty(self.station_block * n_hours, dtype=np.float32)
+            if self.spec.target
+            else None
+        )
+        for targets, block in self._blocks(station_ids, start, end):
+            size = len(targets) * n_hours
+            x = buffer[:size]
+            y = None if target is None else target[:size]
+            self._fill(block, x, y)
+            if dropna:
+                keep = ~np.isnan(x).any(axis=1)
+                if y is not None:
+                    keep &= ~np.isnan(y)
+                x = x[keep]
+                y = None if y is None else y[keep]
+            for first in range(0, len(x), batch_size):
+                yield (
+                    x[first : first + batch_size],
+                    None if y is None else y[first : first + batch_size],
+                )
@@ -0,0 +1,238 @@
+import logging
+import warnings
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+
+from ..database.models import FittedModel, ModelCandidate
+from ..database.repositories import (
+    FittedModelRepository,
+    ObservationRepository,
+)
+from .model_selection import SarimaOrder
+
+if TYPE_CHECKING:
+    from statsmodels.tsa.statespace.sarimax import SARIMAX, SARIMAXResults
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float64]
+
+
+@dataclass(frozen=True)
+class FittedState:
+    """Everything needed to forecast from a SARIMA model without refitting.
+
+    ``state`` and ``state_cov`` are the Kalman filter's predicted state for
+    ``train_end``, the first hour not yet seen by the filter.
+    """
+
+    station_id: int
+    variable: str
+    order: SarimaOrder
+    params: dict[str, float]
+    state: FloatArray
+    state_cov: FloatArray
+    train_end: datetime
+
+    @classmethod
+    def of(cls, record: FittedModel) -> "FittedState":
+        state = np.frombuffer(record.state, dtype=np.float64)
+        return cls(
+            station_id=record.station_id,
+            variable=record.variable,
+            order=SarimaOrder(
+                p=record.p,
+                d=record.d,
+                q=record.q,
+                seasonal_p=record.seasonal_p,
+                seasonal_d=record.seasonal_d,
+                seasonal_q=record.seasonal_q,
+                period=record.period,
+            ),
+            params=record.params,
+            state=state,
+            state_cov=np.frombuffer(record.state_cov, dtype=np.float64).reshape(
+                len(state), len(state)
+            ),
+            train_end=record.train_end,
+        )
+
+
+@dataclass(frozen=True)
+class Forecast:
+    station_id: int
+    variable: str
+    times: npt.NDArray[np.datetime64]
+    mean: FloatArray
+    std: FloatArray
+
+
+def _model(order: SarimaOrder, endog: FloatArray) -> "SARIMAX":
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    return SARIMAX(
+        endog,
+        order=order.order,
+        seasonal_order=order.seasonal_order,
+        enforce_stationarity=False,
+        enforce_invertibility=False,
+    )
+
+
+def _run_filter(fitted: FittedState, endog: FloatArray) -> "SARIMAXResults":
+    model = _model(fitted.order, endog)
+    model.initialize_known(fitted.state, fitted.state_cov)
+    params = [fitted.params[name] for name in model.param_names]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return model.filter(params)
+
+
+def filter_state(
+    station_id: int,
+    variable: str,
+    order: SarimaOrder,
+    params: dict[str, float],
+    values: FloatArray,
+    train_end: datetime,
+) -> FittedState:
+    """Run the filter over the training series with known parameters."""
+    model = _model(order, values)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = model.filter([params[name] for name in model.param_names])
+    return FittedState(
+        station_id=station_id,
+        variable=variable,
+        order=order,
+        params=params,
+        state=result.predicted_state[:, -1].copy(),
+        state_cov=result.predicted_state_cov[:, :, -1].copy(),
+        train_end=train_end,
+    )
+
+
+def update_state(fitted: FittedState, new_values: FloatArray) -> FittedState:
+    """Advance the filter over hours observed after ``train_end``."""
+    if len(new_values) == 0:
+        return fitted
+    result = _run_filter(fitted, new_values)
+    return replace(
+        fitted,
+        state=result.predicted_state[:, -1].copy(),
+        state_cov=result.predicted_state_cov[:, :, -1].copy(),
+        train_end=fitted.train_end + timedelta(hours=len(new_values)),
+    )
+
+
+def forecast_state(fitted: FittedState, horizon: int) -> Forecast:
+    """Forecast ``horizon`` hours ahead of ``train_end``.
+
+    Filtering an all-missing series from the stored state yields exactly the
+    multi-step forecasts and their variances.
+    """
+    result = _run_filter(fitted, np.full(horizon, np.nan))
+    start = np.datetime64(fitted.train_end, "h")
+    return Forecast(
+        station_id=fitted.station_id,
+        variable=fitted.variable,
+        times=start + np.arange(horizon),
+        mean=result.forecasts[0].copy(),
+        std=np.sqrt(result.forecasts_error_cov[0, 0]),
+    )
+
+
+class ModelRegistry:
+    """Stores fitted SARIMA states in ``inmet.fitted_models`` and uses them.
+
+    Registration filters the training window once with the parameters found
+    by order selection; afterwards new hours only advance the stored state
+    and forecasts never touch the training data again.
+    """
+
+    def __init__(
+        self,
+        models: FittedModelRepository,
+        observations: ObservationRepository,
+    ) -> None:
+        self.models = models
+        self.observations = observations
+
+    def register(self, candidate: ModelCandidate) -> FittedModel:
+        hourly = self.observations.load_hourly(
+            [candidate.station_id],
+            [candidate.variable],
+            start=candidate.train_start,
+            end=candidate.train_end,
+        )
+        fitted = filter_state(
+            candidate.station_id,
+            candidate.variable,
+            SarimaOrder.of(candidate),
+            candidate.params,
+            hourly.variable(candidate.variable)[:, 0],
+            candidate.train_end,
+        )
+        return self.save(fitted)
+
+    def save(self, fitted: FittedState) -> FittedModel:
+        return self.models.save(
+            station_id=fitted.station_id,
+            variable=fitted.variable,
+            p=fitted.order.p,
+            d=fitted.order.d,
+            q=fitted.order.q,
+            seasonal_p=fitted.order.seasonal_p,
+            seasonal_d=fitted.order.seasonal_d,
+            seasonal_q=fitted.order.seasonal_q,
+            period=fitted.order.period,
+            params=fitted.params,
+            state=fitted.state.tobytes(),
+            state_cov=fitted.state_cov.tobytes(),
+            train_end=fitted.train_end,
+        )
+
+    def update(self, station_id: int) -> list[FittedModel]:
+        """Fold every hour newer than each model's ``train_end`` into it."""
+        updated: list[FittedModel] = []
+        for record in self.models.find_for_station(station_id):
+            fitted = FittedState.of(record)
+            hourly = self.observations.load_hourly(
+                [station_id], [fitted.variable], start=fitted.train_end
+            )
+            new_values = hourly.variable(fitted.variable)[:, 0]
+            if len(new_values) == 0:
+                continue
+            logger.debug(
+                "Atualizando modelo %d/%s com %d horas.",
+                station_id,
+                fitted.variable,
+                len(new_values),
+            )
+            updated.append(self.save(update_state(fitted, new_values)))
+        return updated
+
+    def forecast(
+        self,
+        variable: str,
+        horizon: int,
+        *,
+        station_ids: Sequence[int] | None = None,
+        max_workers: int | None = None,
+    ) -> list[Forecast]:
+        """Forecast every registered model of ``variable`` in parallel."""
+        states = [
+            FittedState.of(record)
+            for record in self.models.find_for_variable(variable)
+            if station_ids is None or record.station_id in station_ids
+        ]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(
+                pool.map(forecast_state, states, [horizon] * len(states))
+            )
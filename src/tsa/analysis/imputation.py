@@ -0,0 +1,303 @@
+import logging
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import StrEnum
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from ..database.repositories import (
+    ImputedValueRepository,
+    ObservationRepository,
+    StationRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+
+class ImputationMethod(StrEnum):
+    TEMPORAL = "temporal"
+    REGRESSION = "regression"
+    IDW = "idw"
+
+
+def interpolate_gaps(values: FloatArray, max_gap: int) -> FloatArray:
+    """Linearly interpolate interior gaps of at most ``max_gap`` hours.
+
+    Works column by column on a ``(hours, stations)`` matrix without any
+    Python-level loop; longer gaps and gaps at the edges stay ``NaN``.
+    """
+    n_hours = values.shape[0]
+    observed = ~np.isnan(values)
+    hours = np.arange(n_hours)[:, np.newaxis]
+    previous = np.maximum.accumulate(np.where(observed, hours, -1), axis=0)
+    following = np.minimum.accumulate(
+        np.where(observed, hours, n_hours)[::-1], axis=0
+    )[::-1]
+    gap = following - previous - 1
+    fillable = (
+        ~observed & (previous >= 0) & (following < n_hours) & (gap <= max_gap)
+    )
+    columns = np.broadcast_to(np.arange(values.shape[1]), values.shape)
+    left = values[np.clip(previous, 0, n_hours - 1), columns]
+    right = values[np.clip(following, 0, n_hours - 1), columns]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraction = (hours - previous) / (following - previous)
+    return np.where(fillable, left + fraction * (right - left), values)
+
+
+def neighbour_composite(
+    values: FloatArray,
+    neighbours: IntArray,
+    distances: FloatArray,
+    *,
+    power: float = 2.0,
+) -> FloatArray:
+    """Inverse-distance weighted anomaly of each station's neighbours.
+
+    ``neighbours`` holds, for every column of ``values``, the column indices
+    of its neighbours (``-1`` for none). Each neighbour is standardized over
+    the chunk so stations at different altitudes or climates can be mixed;
+    the result is expressed back in the target station's own scale and is
+    ``NaN`` where no neighbour reports at that hour.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.nanmean(values, axis=0)
+        stds = np.nanstd(values, axis=0)
+        anomalies = (values - means) / np.where(stds > 0, stds, np.nan)
+
+    valid_neighbour = neighbours >= 0
+    stacked = anomalies[:, np.where(valid_neighbour, neighbours, 0)]
+    weights = np.where(
+        valid_neighbour, 1.0 / np.maximum(distances, 1e-3) ** power, 0.0
+    )
+    weights = np.where(np.isnan(stacked), 0.0, weights[np.newaxis])
+    total = weights.sum(axis=2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        composite = np.where(
+            total > 0,
+            (weights * np.nan_to_num(stacked)).sum(axis=2) / total,
+            np.nan,
+        )
+    return means + stds * composite
+
+
+def regress_on(
+    target: FloatArray, predictor: FloatArray, *, min_overlap: int
+) -> FloatArray:
+    """Per-column OLS of ``target`` on ``predictor`` evaluated everywhere.
+
+    Columns with fewer than ``min_overlap`` hours where both are observed
+    come back all ``NaN``.
+    """
+    both = ~np.isnan(target) & ~np.isnan(predictor)
+    n = both.sum(axis=0)
+    x = np.where(both, predictor, 0.0)
+    y = np.where(both, target, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = x.sum(axis=0) / n
+        y_mean = y.sum(axis=0) / n
+        covariance = (np.where(both, (x - x_mean) * (y - y_mean), 0.0)).sum(
+            axis=0
+        )
+        variance = (np.where(both, (x - x_mean) ** 2, 0.0)).sum(axis=0)
+        slope = covariance / variance
+    intercept = y_mean - slope * x_mean
+    usable = (n >= min_overlap) & (variance > 0)
+    return np.where(usable, intercept + slope * predictor, np.nan)
+
+
+@dataclass(frozen=True)
+class ImputationResult:
+    """Filled ``(hours, stations)`` matrix plus the method used per cell."""
+
+    values: FloatArray
+    methods: npt.NDArray[np.str_]
+
+
+def impute_matrix(
+    values: FloatArray,
+    neighbours: IntArray,
+    distances: FloatArray,
+    *,
+    max_gap: int = 3,
+    power: float = 2.0,
+    min_overlap: int = 24 * 30,
+) -> ImputationResult:
+    """Fill a whole ``(hours, stations)`` matrix at once.
+
+    Short gaps are interpolated in time; longer ones use a regression on the
+    neighbour composite where enough overlap exists, or the composite itself
+    otherwise.
+    """
+    missing = np.isnan(values)
+    methods = np.full(values.shape, "", dtype="<U10")
+
+    temporal = interpolate_gaps(values, max_gap)
+    filled = np.where(missing, temporal, values)
+    methods[missing & ~np.isnan(temporal)] = ImputationMethod.TEMPORAL
+
+    composite = neighbour_composite(values, neighbours, distances, power=power)
+    regression = regress_on(values, composite, min_overlap=min_overlap)
+    for method, estimate in (
+        (ImputationMethod.REGRESSION, regression),
+        (ImputationMethod.IDW, composite),
+    ):
+        fill = np.isnan(filled) & ~np.isnan(estimate)
+        filled[fill] = estimate[fill]
+        methods[fill] = method
+    return ImputationResult(values=filled, methods=methods)
+
+
+class Imputer:
+    """Neighbour-aware gap filling of a whole station network.
+
+    Data is processed in time chunks of ``chunk_hours`` over every target
+    station and its neighbours at once, each loaded with ``max_gap`` hours
+    of context on both sides so that short gaps across chunk boundaries
+    are still interpolated. Filled cells inside the chunk are written to
+    ``inmet.imputed_values`` with the method that produced them, leaving
+    ``inmet.observations`` untouched.
+    """
+
+    def __init__(
+        self,
+        observations: ObservationRepository,
+        stations: StationRepository,
+        imputed: ImputedValueRepository,
+        *,
+        k: int = 5,
+        max_distance_km: float = 150.0,
+        altitude_weight: float = 0.0,
+        max_gap: int = 3,
+        power: float = 2.0,
+        min_overlap: int = 24 * 30,
+        chunk_hours: int = 24 * 90,
+    ) -> None:
+        self.observations = observations
+        self.stations = stations
+        self.imputed = imputed
+        self.k = k
+        self.max_distance_km = max_distance_km
+        self.altitude_weight = altitude_weight
+        self.max_gap = max_gap
+        self.power = power
+        self.min_overlap = min_overlap
+        self.chunk_hours = chunk_hours
+
+    def _chunks(
+        self, start: datetime, end: datetime
+    ) -> Iterator[tuple[datetime, datetime]]:
+        step = timedelta(hours=self.chunk_hours)
+        while start < end:
+            yield start, min(start + step, end)
+            start += step
+
+    def run(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        *,
+        start: datetime,
+        end: datetime,
+    ) -> dict[ImputationMethod, int]:
+        """Impute ``variable`` for ``station_ids`` in ``[start, end)``."""
+        index = self.stations.spatial_index(
+            altitude_weight=self.altitude_weight
+        )
+        targets = list(dict.fromkeys(station_ids))
+        neighbour_ids, distances = index.neighbours(targets, self.k)
+        distances = np.where(
+            distances <= self.max_distance_km, distances, np.inf
+        )
+        involved = sorted(
+            set(targets) | set(neighbour_ids[np.isfinite(distances)].tolist())
+        )
+        column = {station_id: i for i, station_id in enumerate(involved)}
+        target_columns = np.array([column[s] for s in targets])
+
+        neighbours = np.full((len(involved), self.k), -1, dtype=np.int64)
+        neighbour_distances = np.full((len(involved), self.k), np.inf)
+        for row, station_id in enumerate(targets):
+            for j, (neighbour, distance) in enumerate(
+                zip(neighbour_ids[row], distances[row])
+            ):
+                if np.isfinite(distance):
+                    neighbours[column[station_id], j] = column[int(neighbour)]
+                    neighbour_distances[column[station_id], j] = distance
+
+        counts = {method: 0 for method in ImputationMethod}
+        context = timedelta(hours=self.max_gap)
+        for chunk_start, chunk_end in self._chunks(start, end):
+            hourly = self.observations.load_hourly(
+                involved,
+                [variable],
+                start=chunk_start - context,
+                end=chunk_end + context,
+            )
+            values = hourly.variable(variable)
+            result = impute_matrix(
+                values,
+                neighbours,
+                neighbour_distances,
+                max_gap=self.max_gap,
+                power=self.power,
+                min_overlap=self.min_overlap,
+            )
+            inside = slice(self.max_gap, len(hourly.times) - self.max_gap)
+            rows = self._rows(
+                hourly.times[inside],
+                values[inside],
+                ImputationResult(result.values[inside], result.methods[inside]),
+                target_columns,
+                involved,
+                variable,
+            )
+            for row in rows:
+                counts[ImputationMethod(row["method"])] += 1
+            self.imputed.replace_range(
+                targets, variable, chunk_start, chunk_end, rows
+            )
+            logger.info(
+                "%s %s..%s: %d valores imputados.",
+                variable,
+                chunk_start.date(),
+                chunk_end.date(),
+                len(rows),
+            )
+        return counts
+
+    @staticmethod
+    def _rows(
+        times: npt.NDArray[np.datetime64],
+        values: FloatArray,
+        result: ImputationResult,
+        target_columns: IntArray,
+        involved: Sequence[int],
+        variable: str,
+    ) -> list[dict[str, Any]]:
+        imputed = np.isnan(values[:, target_columns]) & ~np.isnan(
+            result.values[:, target_columns]
+        )
+        hour_index, target_index = np.nonzero(imputed)
+        matrix_columns = target_columns[target_index]
+        return [
+            {
+                "station_id": involved[column],
+                "variable": variable,
+                "datetime": time,
+                "value": float(value),
+                "method": str(method),
+            }
+            for column, time, value, method in zip(
+                matrix_columns,
+                times[hour_index].astype(datetime),
+                result.values[hour_index, matrix_columns],
+                result.methods[hour_index, matrix_columns],
+            )
+        ]
@@ -0,0 +1,300 @@
+import itertools
+import logging
+import warnings
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import numpy.typing as npt
+
+from ..database.models import ModelCandidate
+from ..database.repositories import (
+    ModelCandidateRepository,
+    ObservationRepository,
+)
+from ..shared import SharedDataset, SharedHandle, attach
+
+logger = logging.getLogger(__name__)
+
+CRITERIA = ("aic", "bic")
+
+
+@dataclass(frozen=True, order=True)
+class SarimaOrder:
+    p: int
+    d: int
+    q: int
+    seasonal_p: int = 0
+    seasonal_d: int = 0
+    seasonal_q: int = 0
+    period: int = 0
+
+    @property
+    def order(self) -> tuple[int, int, int]:
+        return self.p, self.d, self.q
+
+    @property
+    def seasonal_order(self) -> tuple[int, int, int, int]:
+        return self.seasonal_p, self.seasonal_d, self.seasonal_q, self.period
+
+    @property
+    def n_params(self) -> int:
+        """Number of ARMA coefficients, which drives the IC penalty."""
+        return self.p + self.q + self.seasonal_p + self.seasonal_q
+
+    @property
+    def n_states(self) -> int:
+        """Size of the SARIMAX state vector, which drives the fit cost."""
+        s = self.period
+        return (
+            self.d
+            + self.seasonal_d * s
+            + max(
+                self.p + self.seasonal_p * s, self.q + self.seasonal_q * s + 1
+            )
+        )
+
+    @classmethod
+    def of(cls, candidate: ModelCandidate) -> "SarimaOrder":
+        return cls(
+            p=candidate.p,
+            d=candidate.d,
+            q=candidate.q,
+            seasonal_p=candidate.seasonal_p,
+            seasonal_d=candidate.seasonal_d,
+            seasonal_q=candidate.seasonal_q,
+            period=candidate.period,
+        )
+
+
+@dataclass(frozen=True)
+class CandidateFit:
+    order: SarimaOrder
+    aic: float | None
+    bic: float | None
+    params: dict[str, float]
+    converged: bool
+    error: str | None = None
+
+
+def candidate_orders(
+    *,
+    p: Iterable[int] = range(3),
+    d: Iterable[int] = range(2),
+    q: Iterable[int] = range(3),
+    seasonal_p: Iterable[int] = range(2),
+    seasonal_d: Iterable[int] = range(2),
+    seasonal_q: Iterable[int] = range(2),
+    period: int = 24,
+) -> list[SarimaOrder]:
+    """Cartesian grid of orders, cheapest (smallest state vector) first."""
+    orders = {
+        SarimaOrder(*order, period=period if any(order[3:]) else 0)
+        for order in itertools.product(
+            p, d, q, seasonal_p, seasonal_d, seasonal_q
+        )
+    }
+    return sorted(orders, key=lambda order: (order.n_states, order))
+
+
+def fit_candidate(
+    values: npt.NDArray[np.float64], order: SarimaOrder
+) -> CandidateFit:
+    """Fit a single SARIMAX model; runs inside the worker processes."""
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model = SARIMAX(
+                values,
+                order=order.order,
+                seasonal_order=order.seasonal_order,
+                enforce_stationarity=False,
+                enforce_invertibility=False,
+            )
+            result = model.fit(disp=False)
+    except (ValueError, np.linalg.LinAlgError) as e:
+        return CandidateFit(order, None, None, {}, False, str(e))
+    return CandidateFit(
+        order=order,
+        aic=float(result.aic),
+        bic=float(result.bic),
+        params={
+            name: float(value)
+            for name, value in zip(model.param_names, result.params)
+        },
+        converged=bool(result.mle_retvals.get("converged", False)),
+    )
+
+
+def fit_shared(
+    handle: SharedHandle, variable: str, station_id: int, order: SarimaOrder
+) -> CandidateFit:
+    """:func:`fit_candidate` on one station of a shared dataset."""
+    return fit_candidate(attach(handle).column(variable, station_id), order)
+
+
+@dataclass
+class _StationSearch:
+    station_id: int
+    done: dict[SarimaOrder, float | None]
+    best: float = np.inf
+    stale_levels: int = 0
+    pruned: bool = False
+
+
+class OrderSelector:
+    """Parallel SARIMA order search with results persisted per candidate.
+
+    Candidates are grouped in levels by number of ARMA coefficients and
+    fitted cheapest first across a process pool, whose workers read the
+    series from a :class:`~tsa.shared.SharedDataset`. A station stops
+    climbing levels once ``patience`` consecutive levels fail to improve its
+    best information criterion by more than ``tolerance``. Every fit (or failure)
+    is stored in ``inmet.model_candidates`` as soon as it completes, so a
+    re-run only fits combinations that are not in the table yet.
+    """
+
+    def __init__(
+        self,
+        observations: ObservationRepository,
+        candidates: ModelCandidateRepository,
+        *,
+        criterion: str = "aic",
+        patience: int = 1,
+        tolerance: float = 0.0,
+        max_workers: int | None = None,
+    ) -> None:
+        if criterion not in CRITERIA:
+            raise ValueError(f"Critério deve ser um de {CRITERIA}")
+        self.observations = observations
+        self.candidates = candidates
+        self.criterion = criterion
+        self.patience = patience
+        self.tolerance = tolerance
+        self.max_workers = max_workers
+
+    def run(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        orders: Sequence[SarimaOrder],
+        *,
+        start: datetime,
+        end: datetime,
+    ) -> dict[int, ModelCandidate | None]:
+        """Search ``orders`` for every station and return the best ones."""
+        dataset = SharedDataset.load(
+            self.observations, station_ids, [variable], start=start, end=end
+        )
+        searches = [
+            _StationSearch(
+                station_id=station_id,
+                done={
+                    SarimaOrder.of(candidate): getattr(
+                        candidate, self.criterion
+                    )
+                    for candidate in self.candidates.find_for_window(
+                        station_id, variable, start, end
+                    )
+                },
+            )
+            for station_id in dataset.handle.station_ids
+        ]
+
+        levels: dict[int, list[SarimaOrder]] = {}
+        for order in orders:
+            levels.setdefault(order.n_params, []).append(order)
+
+        with (
+            dataset,
+            ProcessPoolExecutor(max_workers=self.max_workers) as pool,
+        ):
+            for n_params in sorted(levels):
+                active = [search for search in searches if not search.pruned]
+                if not active:
+                    break
+                futures: dict[Future[CandidateFit], _StationSearch] = {
+                    pool.submit(
+                        fit_shared,
+                        dataset.handle,
+                        variable,
+                        search.station_id,
+                        order,
+                    ): search
+                    for search in active
+                    for order in levels[n_params]
+                    if order not in search.done
+                }
+                logger.info(
+                    "Nível %d: %d ajustes para %d estações.",
+                    n_params,
+                    len(futures),
+                    len(active),
+                )
+                for future in as_completed(futures):
+                    search = futures[future]
+                    fit = future.result()
+                    search.done[fit.order] = getattr(fit, self.criterion)
+                    self._record(search.station_id, variable, start, end, fit)
+                for search in active:
+                    self._advance(search, levels[n_params])
+
+        return {
+            search.station_id: self.candidates.best(
+                search.station_id,
+                variable,
+                start,
+                end,
+                criterion=self.criterion,
+            )
+            for search in searches
+        }
+
+    def _advance(
+        self, search: _StationSearch, level: Sequence[SarimaOrder]
+    ) -> None:
+        scores = [
+            score
+            for order in level
+            if (score := search.done.get(order)) is not None
+        ]
+        level_best = min(scores, default=np.inf)
+        if level_best < search.best - self.tolerance:
+            search.best = level_best
+            search.stale_levels = 0
+            return
+        search.stale_levels += 1
+        search.pruned = search.stale_levels >= self.patience
+
+    def _record(
+        self,
+        station_id: int,
+        variable: str,
+        start: datetime,
+        end: datetime,
+        fit: CandidateFit,
+    ) -> None:
+        self.candidates.record(
+            ModelCandidate(
+                station_id=station_id,
+                variable=variable,
+                train_start=start,
+                train_end=end,
+                p=fit.order.p,
+                d=fit.order.d,
+                q=fit.order.q,
+                seasonal_p=fit.order.seasonal_p,
+                seasonal_d=fit.order.seasonal_d,
+                seasonal_q=fit.order.seasonal_q,
+                period=fit.order.period,
+                aic=fit.aic,
+                bic=fit.bic,
+                params=fit.params,
+                converged=fit.converged,
+                error=fit.error,
+            )
+        )
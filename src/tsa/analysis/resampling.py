@@ -0,0 +1,276 @@
+import logging
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from ..database.repositories import HourlyArray, ObservationRepository
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+Frequency = Literal["D", "M", "Y"]
+
+
+class Aggregation(StrEnum):
+    SUM = "sum"
+    MEAN = "mean"
+    MAX = "max"
+    MIN = "min"
+    CIRCULAR = "circular"
+
+
+@dataclass(frozen=True)
+class ColumnRule:
+    """How one column is reduced to a coarser period.
+
+    A period is valid when at least ``min_fraction`` of its hours were
+    observed. ``weight`` names the column used to weight a circular mean.
+    """
+
+    aggregation: Aggregation
+    min_fraction: float = 0.75
+    weight: str | None = None
+
+
+AGGREGATIONS: dict[str, ColumnRule] = {
+    "precipitation": ColumnRule(Aggregation.SUM, min_fraction=0.9),
+    "atmospheric_pressure": ColumnRule(Aggregation.MEAN),
+    "prev_max_pressure": ColumnRule(Aggregation.MAX),
+    "prev_min_pressure": ColumnRule(Aggregation.MIN),
+    # Stations do not report radiation at night, so about half of the hours
+    # of a complete day are missing.
+    "global_radiation": ColumnRule(Aggregation.SUM, min_fraction=0.4),
+    "air_temperature": ColumnRule(Aggregation.MEAN),
+    "dew_point_temperature": ColumnRule(Aggregation.MEAN),
+    "max_temperature": ColumnRule(Aggregation.MAX),
+    "min_temperature": ColumnRule(Aggregation.MIN),
+    "max_dew_point_temperature": ColumnRule(Aggregation.MAX),
+    "min_dew_point_temperature": ColumnRule(Aggregation.MIN),
+    "max_relative_humidity": ColumnRule(Aggregation.MAX),
+    "min_relative_humidity": ColumnRule(Aggregation.MIN),
+    "relative_humidity": ColumnRule(Aggregation.MEAN),
+    "wind_direction": ColumnRule(Aggregation.CIRCULAR, weight="wind_speed"),
+    "max_wind_gust": ColumnRule(Aggregation.MAX),
+    "wind_speed": ColumnRule(Aggregation.MEAN),
+}
+
+
+@dataclass(frozen=True)
+class Resampled:
+    """Observations reduced to daily, monthly or yearly periods.
+
+    ``values`` and ``counts`` have shape ``(periods, stations, variables)``;
+    ``counts`` holds the hours that contributed to each value and ``valid``
+    whether the period met its completeness threshold. Invalid periods are
+    ``NaN`` in ``values``.
+    """
+
+    times: npt.NDArray[np.datetime64]
+    station_ids: tuple[int, ...]
+    variables: tuple[str, ...]
+    values: FloatArray
+    counts: IntArray
+    valid: npt.NDArray[np.bool_]
+
+    def variable(self, name: str) -> FloatArray:
+        """Return the ``(periods, stations)`` matrix of a single variable."""
+        return self.values[:, :, self.variables.index(name)]
+
+
+def _segments(
+    times: npt.NDArray[np.datetime64], freq: Frequency
+) -> tuple[npt.NDArray[np.datetime64], IntArray, IntArray]:
+    periods = times.astype(f"datetime64[{freq}]")
+    unique, starts = np.unique(periods, return_index=True)
+    expected = (
+        (unique + 1).astype("datetime64[h]") - unique.astype("datetime64[h]")
+    ).astype(np.int64)
+    return unique, starts, expected
+
+
+def _reduce(
+    values: FloatArray,
+    starts: IntArray,
+    aggregation: Aggregation,
+    weights: FloatArray | None = None,
+) -> tuple[FloatArray, IntArray]:
+    """Segment reduction of ``values`` along the first axis."""
+    observed = ~np.isnan(values)
+    if aggregation is Aggregation.CIRCULAR:
+        assert weights is not None
+        observed &= ~np.isnan(weights)
+        angle = np.radians(values)
+        w = np.where(observed, weights, 0.0)
+        sin = np.add.reduceat(
+            np.where(observed, w * np.sin(angle), 0.0), starts
+        )
+        cos = np.add.reduceat(
+            np.where(observed, w * np.cos(angle), 0.0), starts
+        )
+        reduced = np.degrees(np.arctan2(sin, cos)) % 360.0
+        # A null resultant (calm or opposing winds) has no direction.
+        reduced[np.hypot(sin, cos) == 0] = np.nan
+    elif aggregation is Aggregation.MAX:
+        reduced = np.fmax.reduceat(values, starts)
+    elif aggregation is Aggregation.MIN:
+        reduced = np.fmin.reduceat(values, starts)
+    else:
+        reduced = np.add.reduceat(np.where(observed, values, 0.0), starts)
+    counts = np.add.reduceat(observed.astype(np.int64), starts)
+    if aggregation is Aggregation.MEAN:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            reduced = reduced / counts
+    return reduced, counts
+
+
+def resample(
+    hourly: HourlyArray,
+    freq: Frequency,
+    spec: Mapping[str, ColumnRule] | None = None,
+    *,
+    variables: Sequence[str] | None = None,
+) -> Resampled:
+    """Reduce an hourly array to ``freq`` periods following ``spec``.
+
+    Variables sharing an aggregation are reduced together, so the cost is a
+    handful of ``reduceat`` calls over the whole ``(hours, stations, ...)``
+    block whatever the number of variables.
+    """
+    spec = spec or AGGREGATIONS
+    variables = tuple(variables or hourly.variables)
+    unknown = set(variables) - set(spec)
+    if unknown:
+        raise ValueError(f"Sem regra de agregação para: {sorted(unknown)}")
+
+    times, starts, expected = _segments(hourly.times, freq)
+    shape = (len(times), len(hourly.station_ids), len(variables))
+    values = np.full(shape, np.nan)
+    counts = np.zeros(shape, dtype=np.int64)
+    if len(times):
+        for aggregation in Aggregation:
+            columns = [
+                i
+                for i, name in enumerate(variables)
+                if spec[name].aggregation == aggregation
+            ]
+            if not columns:
+                continue
+            source = [hourly.variables.index(variables[i]) for i in columns]
+            weights = None
+            if aggregation is Aggregation.CIRCULAR:
+                weights = np.stack(
+                    [
+                        _weights(hourly, spec[variables[i]].weight)
+                        for i in columns
+                    ],
+                    axis=2,
+                )
+            reduced, count = _reduce(
+                hourly.values[:, :, source], starts, aggregation, weights
+            )
+            values[:, :, columns] = reduced
+            counts[:, :, columns] = count
+
+    thresholds = np.array([spec[name].min_fraction for name in variables])
+    valid = counts >= thresholds * expected[:, np.newaxis, np.newaxis]
+    return Resampled(
+        times=times,
+        station_ids=hourly.station_ids,
+        variables=variables,
+        values=np.where(valid, values, np.nan),
+        counts=counts,
+        valid=valid,
+    )
+
+
+def _weights(hourly: HourlyArray, weight: str | None) -> FloatArray:
+    if weight is None:
+        return np.ones(hourly.values.shape[:2])
+    return hourly.variable(weight)
+
+
+class Resampler:
+    """Resample stored observations in blocks of stations.
+
+    The hourly array of each block is built, reduced and dropped before the
+    next one is loaded, so memory is bounded by ``station_block``.
+    """
+
+    def __init__(
+        self,
+        observations: ObservationRepository,
+        spec: Mapping[str, ColumnRule] | None = None,
+        *,
+        station_block: int = 50,
+    ) -> None:
+        self.observations = observations
+        self.spec = dict(spec or AGGREGATIONS)
+        self.station_block = station_block
+
+    def _columns(self, variables: Sequence[str]) -> list[str]:
+        weights = [
+            self.spec[name].weight
+            for name in variables
+            if name in self.spec and self.spec[name].weight
+        ]
+        return list(dict.fromkeys([*variables, *weights]))  # type: ignore[list-item]
+
+    def iter_blocks(
+        self,
+        station_ids: Sequence[int],
+        variables: Sequence[str],
+        freq: Frequency,
+        *,
+        start: datetime,
+        end: datetime,
+    ) -> Iterator[Resampled]:
+        """Yield one :class:`Resampled` per block of stations.
+
+        ``start`` and ``end`` should fall on period boundaries; partial
+        periods at either edge simply fail their completeness threshold.
+        """
+        ids = sorted(set(station_ids))
+        columns = self._columns(variables)
+        for first in range(0, len(ids), self.station_block):
+            block = ids[first : first + self.station_block]
+            hourly = self.observations.load_hourly(
+                block, columns, start=start, end=end
+            )
+            yield resample(hourly, freq, self.spec, variables=variables)
+
+    def run(
+        self,
+        station_ids: Sequence[int],
+        variables: Sequence[str],
+        freq: Frequency,
+        *,
+        start: datetime,
+        end: datetime,
+    ) -> Resampled:
+        """Resample every station and join the blocks along the station axis."""
+        blocks = list(
+            self.iter_blocks(station_ids, variables, freq, start=start, end=end)
+        )
+        if not blocks:
+            raise ValueError("Nenhuma estação informada.")
+        logger.info(
+            "%d variáveis reamostradas (%s) para %d estações.",
+            len(variables),
+            freq,
+            sum(len(b.station_ids) for b in blocks),
+        )
+        return Resampled(
+            times=blocks[0].times,
+            station_ids=tuple(s for b in blocks for s in b.station_ids),
+            variables=blocks[0].variables,
+            values=np.concatenate([b.values for b in blocks], axis=1),
+            counts=np.concatenate([b.counts for b in blocks], axis=1),
+            valid=np.concatenate([b.valid for b in blocks], axis=1),
+        )
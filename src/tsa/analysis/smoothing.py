@@ -0,0 +1,337 @@
+import logging
+import warnings
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import numpy.typing as npt
+
+from ..database.models import OBSERVATION_VARIABLES, StructuralModel
+from ..database.repositories import (
+    DerivedValueRepository,
+    ObservationRepository,
+    StructuralModelRepository,
+)
+from .forecasting import Forecast
+
+if TYPE_CHECKING:
+    from statsmodels.tsa.statespace.mlemodel import MLEResults
+    from statsmodels.tsa.statespace.structural import UnobservedComponents
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float64]
+TimeArray = npt.NDArray[np.datetime64]
+
+SMOOTHED_VARIABLES = ("air_temperature", "atmospheric_pressure")
+
+
+@dataclass(frozen=True)
+class StructuralState:
+    """Kalman filter state of a local linear trend plus a daily cycle.
+
+    ``state`` and ``state_cov`` are the predicted state for ``through``, the
+    first hour not yet seen by the filter. The noise variances in ``params``
+    are estimated once, when the state is created, and kept afterwards.
+    """
+
+    station_id: int
+    variable: str
+    period: int
+    harmonics: int
+    params: dict[str, float]
+    state: FloatArray
+    state_cov: FloatArray
+    through: datetime
+
+    @classmethod
+    def of(cls, record: StructuralModel) -> "StructuralState":
+        state = np.frombuffer(record.state, dtype=np.float64)
+        return cls(
+            station_id=record.station_id,
+            variable=record.variable,
+            period=record.period,
+            harmonics=record.harmonics,
+            params=record.params,
+            state=state,
+            state_cov=np.frombuffer(record.state_cov, dtype=np.float64).reshape(
+                len(state), len(state)
+            ),
+            through=record.through,
+        )
+
+
+@dataclass(frozen=True)
+class Smoothed:
+    """Filtered estimates over the hours just folded into a state.
+
+    ``level`` is the deseasonalized level and ``signal`` adds the daily
+    cycle back, i.e. the reading without measurement noise. Both use only
+    hours up to each time, so they never change once stored.
+    """
+
+    times: TimeArray
+    observed: npt.NDArray[np.bool_]
+    level: FloatArray
+    signal: FloatArray
+
+
+def _model(
+    period: int, harmonics: int, endog: FloatArray
+) -> "UnobservedComponents":
+    from statsmodels.tsa.statespace.structural import UnobservedComponents
+
+    return UnobservedComponents(
+        endog,
+        level="local linear trend",
+        freq_seasonal=[{"period": period, "harmonics": harmonics}],
+    )
+
+
+def _run_filter(fitted: StructuralState, endog: FloatArray) -> "MLEResults":
+    model = _model(fitted.period, fitted.harmonics, endog)
+    model.initialize_known(fitted.state, fitted.state_cov)
+    params = [fitted.params[name] for name in model.param_names]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return model.filter(params)
+
+
+def _smoothed(
+    result: "MLEResults", values: FloatArray, start: datetime
+) -> Smoothed:
+    filtered = result.filtered_state
+    design = result.model.ssm["design"][0]
+    return Smoothed(
+        times=np.datetime64(start, "h") + np.arange(len(values)),
+        observed=~np.isnan(values),
+        level=filtered[0].copy(),
+        signal=design @ filtered,
+    )
+
+
+def fit_state(
+    station_id: int,
+    variable: str,
+    values: FloatArray,
+    start: datetime,
+    *,
+    period: int = 24,
+    harmonics: int = 2,
+) -> tuple[StructuralState, Smoothed]:
+    """Estimate the noise variances on ``values`` and filter through them.
+
+    ``values`` is the hourly series starting at ``start``; the filter starts
+    from a diffuse state, so the first hours carry little information.
+    """
+    model = _model(period, harmonics, values)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = model.fit(disp=False)
+    fitted = StructuralState(
+        station_id=station_id,
+        variable=variable,
+        period=period,
+        harmonics=harmonics,
+        params=dict(zip(model.param_names, map(float, result.params))),
+        state=result.predicted_state[:, -1].copy(),
+        state_cov=result.predicted_state_cov[:, :, -1].copy(),
+        through=start + timedelta(hours=len(values)),
+    )
+    return fitted, _smoothed(result, values, start)
+
+
+def update_state(
+    fitted: StructuralState, new_values: FloatArray
+) -> tuple[StructuralState, Smoothed]:
+    """Advance the filter over hours observed after ``through``.
+
+    Costs time proportional to ``len(new_values)`` only; missing hours just
+    propagate the state.
+    """
+    result = _run_filter(fitted, new_values)
+    updated = replace(
+        fitted,
+        state=result.predicted_state[:, -1].copy(),
+        state_cov=result.predicted_state_cov[:, :, -1].copy(),
+        through=fitted.through + timedelta(hours=len(new_values)),
+    )
+    return updated, _smoothed(result, new_values, fitted.through)
+
+
+def forecast_state(fitted: StructuralState, horizon: int) -> Forecast:
+    """Nowcast and forecast ``horizon`` hours from ``through`` onwards."""
+    result = _run_filter(fitted, np.full(horizon, np.nan))
+    start = np.datetime64(fitted.through, "h")
+    return Forecast(
+        station_id=fitted.station_id,
+        variable=fitted.variable,
+        times=start + np.arange(horizon),
+        mean=result.forecasts[0].copy(),
+        std=np.sqrt(result.forecasts_error_cov[0, 0]),
+    )
+
+
+class OnlineSmoother:
+    """Structural-model filters kept in ``inmet.structural_models``.
+
+    The first call for a station fits the noise variances on its last
+    ``fit_days`` of data; every later call loads only the hours newer than
+    the stored state and advances it, so the cost of an update grows with
+    the new data, not with the history. Filtered values are stored as
+    ``<variable>_level`` and ``<variable>_smoothed`` in
+    ``inmet.derived_values``. Hours older than the stored state, e.g. from
+    files loaded out of order, are not folded back in.
+    """
+
+    def __init__(
+        self,
+        models: StructuralModelRepository,
+        observations: ObservationRepository,
+        derived: DerivedValueRepository,
+        *,
+        variables: Sequence[str] | None = None,
+        period: int = 24,
+        harmonics: int = 2,
+        fit_days: int = 90,
+        min_hours: int = 14 * 24,
+    ) -> None:
+        unknown = set(variables or ()) - set(OBSERVATION_VARIABLES)
+        if unknown:
+            raise ValueError(f"Variáveis desconhecidas: {sorted(unknown)}")
+        self.models = models
+        self.observations = observations
+        self.derived = derived
+        self.variables = tuple(variables or SMOOTHED_VARIABLES)
+        self.period = period
+        self.harmonics = harmonics
+        self.fit_days = fit_days
+        self.min_hours = min_hours
+
+    def update(self, station_id: int) -> list[StructuralModel]:
+        """Fold every hour newer than each stored state into it."""
+        updated: list[StructuralModel] = []
+        for variable in self.variables:
+            record = self.models.get_for(station_id, variable)
+            if record is None:
+                step = self._initialize(station_id, variable)
+            else:
+                step = self._advance(StructuralState.of(record))
+            if step is not None:
+                updated.append(self.save(*step))
+        return updated
+
+    def _initialize(
+        self, station_id: int, variable: str
+    ) -> tuple[StructuralState, Smoothed] | None:
+        first, last = self.observations.time_span([station_id])
+        if first is None or last is None:
+            return None
+        end = last.replace(minute=0, second=0, microsecond=0) + timedelta(
+            hours=1
+        )
+        start = max(
+            first.replace(minute=0, second=0, microsecond=0),
+            end - timedelta(days=self.fit_days),
+        )
+        hourly = self.observations.load_hourly(
+            [station_id], [variable], start=start, end=end
+        )
+        values = hourly.variable(variable)[:, 0]
+        if np.count_nonzero(~np.isnan(values)) < self.min_hours:
+            logger.debug(
+                "Estação %d/%s: poucas horas para ajustar o filtro.",
+                station_id,
+                variable,
+            )
+            return None
+        logger.debug(
+            "Ajustando filtro %d/%s com %d horas.",
+            station_id,
+            variable,
+            len(values),
+        )
+        return fit_state(
+            station_id,
+            variable,
+            values,
+            start,
+            period=self.period,
+            harmonics=self.harmonics,
+        )
+
+    def _advance(
+        self, fitted: StructuralState
+    ) -> tuple[StructuralState, Smoothed] | None:
+        hourly = self.observations.load_hourly(
+            [fitted.station_id], [fitted.variable], start=fitted.through
+        )
+        new_values = hourly.variable(fitted.variable)[:, 0]
+        if len(new_values) == 0:
+            return None
+        logger.debug(
+            "Atualizando filtro %d/%s com %d horas.",
+            fitted.station_id,
+            fitted.variable,
+            len(new_values),
+        )
+        return update_state(fitted, new_values)
+
+    def save(
+        self, fitted: StructuralState, smoothed: Smoothed
+    ) -> StructuralModel:
+        """Store the state and the filtered values of its latest hours."""
+        names = [f"{fitted.variable}_level", f"{fitted.variable}_smoothed"]
+        times = smoothed.times[smoothed.observed]
+        stamps = times.astype("datetime64[us]").astype(datetime)
+        rows: list[dict[str, Any]] = [
+            {
+                "station_id": fitted.station_id,
+                "variable": name,
+                "datetime": stamp,
+                "value": float(value),
+            }
+            for name, values in zip(
+                names, (smoothed.level, smoothed.signal), strict=True
+            )
+            for stamp, value in zip(
+                stamps, values[smoothed.observed], strict=True
+            )
+        ]
+        if len(smoothed.times):
+            self.derived.replace_range(
+                [fitted.station_id],
+                names,
+                smoothed.times[0].astype(datetime),
+                (smoothed.times[-1] + 1).astype(datetime),
+                rows,
+            )
+        return self.models.save(
+            station_id=fitted.station_id,
+            variable=fitted.variable,
+            period=fitted.period,
+            harmonics=fitted.harmonics,
+            params=fitted.params,
+            state=fitted.state.tobytes(),
+            state_cov=fitted.state_cov.tobytes(),
+            through=fitted.through,
+        )
+
+    def forecast(
+        self,
+        variable: str,
+        horizon: int,
+        *,
+        station_ids: Sequence[int] | None = None,
+    ) -> list[Forecast]:
+        """Nowcasts from every stored state of ``variable``.
+
+        Only the stored state is read, never the observations.
+        """
+        return [
+            forecast_state(StructuralState.of(record), horizon)
+            for record in self.models.find_for_variable(variable)
+            if station_ids is None or record.station_id in station_ids
+        ]
@@ -0,0 +1,396 @@
+import logging
+from collections.abc import Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import numpy.typing as npt
+
+from ..cache import ArrayCache
+from ..database.repositories import ObservationRepository
+from ..shared import SharedDataset, SharedHandle, attach
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+# Observations are hourly; spectra are reported in cycles per day.
+SAMPLES_PER_DAY = 24.0
+
+METHODS = ("welch", "lombscargle")
+
+
+@dataclass(frozen=True)
+class SpectralParams:
+    """Settings shared by every spectrum of a run; part of the cache key.
+
+    ``segment_days`` sets the Welch segment length and with it the
+    frequency resolution (``1 / segment_days`` cycles per day): a year
+    resolves the annual cycle, several years are needed for ENSO scales.
+    Stations with fewer than ``min_segments`` gap-free segments fall back
+    to Lomb-Scargle over the same segments, using those with at least
+    ``min_coverage`` of their hours observed.
+    """
+
+    segment_days: float = 365.0
+    overlap: float = 0.5
+    max_frequency: float = 4.0
+    min_segments: int = 3
+    min_coverage: float = 0.5
+
+    @property
+    def nperseg(self) -> int:
+        return int(round(self.segment_days * SAMPLES_PER_DAY))
+
+    @property
+    def step(self) -> int:
+        return max(1, int(round(self.nperseg * (1 - self.overlap))))
+
+    def frequencies(self) -> FloatArray:
+        """Frequency grid in cycles per day, without the zero frequency."""
+        grid = np.fft.rfftfreq(self.nperseg, d=1 / SAMPLES_PER_DAY)
+        return grid[(grid > 0) & (grid <= self.max_frequency)]
+
+
+@dataclass(frozen=True)
+class Spectrum:
+    """One-sided power spectral density of a variable at several stations.
+
+    ``power`` has shape ``(stations, frequencies)`` in squared units per
+    cycle/day. Both methods average Hann-windowed segments of the same
+    length, so rows from either share the resolution and the scale; lines
+    in Lomb-Scargle rows are only damped by the gaps in their segments.
+    """
+
+    station_ids: tuple[int, ...]
+    variable: str
+    frequency: FloatArray
+    power: FloatArray
+    method: tuple[str, ...]
+    segments: IntArray
+
+    @property
+    def period_days(self) -> FloatArray:
+        return 1 / self.frequency
+
+    def station(self, station_id: int) -> FloatArray:
+        return self.power[self.station_ids.index(station_id)]
+
+    def peak(self, low: float, high: float) -> FloatArray:
+        """Frequency of the strongest peak of each station in a band."""
+        band = (self.frequency >= low) & (self.frequency <= high)
+        if not band.any():
+            raise ValueError("Nenhuma frequência na faixa pedida.")
+        power = self.power[:, band]
+        strongest = np.where(np.isnan(power), -np.inf, power).argmax(axis=1)
+        return self.frequency[band][strongest]
+
+
+def welch_batch(
+    values: FloatArray, params: SpectralParams
+) -> tuple[FloatArray, IntArray]:
+    """Welch PSD of every column, averaging only gap-free segments.
+
+    ``values`` is ``(hours, series)`` with ``NaN`` for missing hours.
+    Segments are Hann-windowed and mean-detrended as in
+    ``scipy.signal.welch``; a segment holding any gap is skipped, so
+    series with gaps still get a spectrum from their complete stretches.
+    Returns the ``(series, frequencies)`` PSD and the segments used per
+    series; series without any complete segment get ``NaN``.
+    """
+    nperseg, step = params.nperseg, params.step
+    n_hours, n_series = values.shape
+    frequencies = np.fft.rfftfreq(nperseg, d=1 / SAMPLES_PER_DAY)
+    keep = (frequencies > 0) & (frequencies <= params.max_frequency)
+    if n_hours < nperseg:
+        return np.full((n_series, int(keep.sum())), np.nan), np.zeros(
+            n_series, dtype=np.int64
+        )
+
+    starts = np.arange(0, n_hours - nperseg + 1, step)
+    missing = np.concatenate(
+        [np.zeros((1, n_series)), np.cumsum(np.isnan(values), axis=0)]
+    )
+    complete = (missing[starts + nperseg] - missing[starts]) == 0
+    segments = complete.sum(axis=0).astype(np.int64)
+
+    window = np.hanning(nperseg + 1)[:-1]  # periodic, as scipy's "hann"
+    scale = 1 / (SAMPLES_PER_DAY * (window**2).sum())
+    power = np.zeros((n_series, int(keep.sum())))
+    # One segment start at a time keeps memory at (series, nperseg) while
+    # every FFT still runs over all series together.
+    for index, start in enumerate(starts):
+        columns = np.flatnonzero(complete[index])
+        if columns.size == 0:
+            continue
+        segment = values[start : start + nperseg, columns].T
+        segment = segment - segment.mean(axis=1, keepdims=True)
+        spectrum = np.fft.rfft(segment * window, axis=1)[:, keep]
+        power[columns] += np.abs(spectrum) ** 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        power = 2 * scale * power / segments[:, np.newaxis]
+    if nperseg % 2 == 0 and keep[-1]:
+        # The Nyquist bin has no negative-frequency twin to fold in.
+        power[:, -1] /= 2
+    return power, segments
+
+
+def _periodogram(
+    centered: FloatArray,
+    observed: npt.NDArray[np.bool_],
+    frequencies: FloatArray,
+    chunk: int,
+) -> FloatArray:
+    """Classical Lomb-Scargle periodogram of every column.
+
+    ``centered`` holds zero at unobserved hours. All columns share the
+    hourly time axis, so the trigonometric terms are computed once per
+    frequency and applied to every column with matrix products; each
+    column only weighs its observed hours.
+    """
+    counts = observed.sum(axis=0)
+    weights = observed.astype(np.float64)
+    hours = np.arange(centered.shape[0], dtype=np.float64)
+
+    periodogram = np.empty((centered.shape[1], len(frequencies)))
+    for offset in range(0, len(frequencies), chunk):
+        omega = (
+            2 * np.pi * frequencies[offset : offset + chunk] / SAMPLES_PER_DAY
+        )
+        phase = np.outer(omega, hours)
+        cos, sin = np.cos(phase), np.sin(phase)
+        cos2, sin2 = np.cos(2 * phase), np.sin(2 * phase)
+        # Per column: tan(2 w tau) = sum sin(2wt) / sum cos(2wt).
+        s2, c2 = sin2 @ weights, cos2 @ weights
+        two_tau = np.arctan2(s2, c2)
+        cos_tau, sin_tau = np.cos(two_tau / 2), np.sin(two_tau / 2)
+        yc, ys = cos @ centered, sin @ centered
+        y_cos = cos_tau * yc + sin_tau * ys
+        y_sin = cos_tau * ys - sin_tau * yc
+        cc = (counts + np.cos(two_tau) * c2 + np.sin(two_tau) * s2) / 2
+        ss = counts - cc
+        # At the Nyquist frequency, or when gaps leave every observed hour
+        # in phase, one of the quadratures vanishes and carries no power.
+        tiny = 1e-9 * counts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            periodogram[:, offset : offset + chunk] = (
+                (
+                    np.where(cc > tiny, y_cos**2 / cc, 0.0)
+                    + np.where(ss > tiny, y_sin**2 / ss, 0.0)
+                )
+                / 2
+            ).T
+    return periodogram
+
+
+def lomb_scargle_segments(
+    values: FloatArray,
+    params: SpectralParams,
+    *,
+    chunk: int = 64,
+) -> tuple[FloatArray, IntArray]:
+    """Welch-style average of Lomb-Scargle PSDs over segments with gaps.
+
+    Uses the segments of :func:`welch_batch`, mean-detrended and
+    Hann-windowed over their observed hours, keeping those with at least
+    ``params.min_coverage`` of the hours observed. Each segment's
+    periodogram is scaled by the window power of its observed hours, so a
+    complete segment gives exactly its Welch estimate; in segments with gaps
+    the noise level is kept and lines shrink roughly by the fraction of
+    hours observed. Returns the ``(series, frequencies)`` PSD and the
+    segments used per series.
+    """
+    nperseg, step = params.nperseg, params.step
+    frequencies = params.frequencies()
+    n_hours, n_series = values.shape
+    if n_hours < nperseg:
+        return np.full((n_series, len(frequencies)), np.nan), np.zeros(
+            n_series, dtype=np.int64
+        )
+
+    starts = np.arange(0, n_hours - nperseg + 1, step)
+    # (segments, hours, series); every segment becomes columns of a single
+    # periodogram, since they all share the segment's time axis.
+    segments = values[starts[:, np.newaxis] + np.arange(nperseg)]
+    observed = ~np.isnan(segments)
+    counts = observed.sum(axis=1)
+    usable = counts >= params.min_coverage * nperseg
+    window = np.hanning(nperseg + 1)[:-1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(observed, segments, 0).sum(axis=1) / counts
+    centered = np.where(
+        observed,
+        (segments - means[:, np.newaxis]) * window[:, np.newaxis],
+        0.0,
+    )
+    periodogram = _periodogram(
+        centered.transpose(1, 0, 2).reshape(nperseg, -1),
+        observed.transpose(1, 0, 2).reshape(nperseg, -1),
+        frequencies,
+        chunk,
+    ).reshape(len(starts), n_series, len(frequencies))
+    window_power = (observed * window[:, np.newaxis] ** 2).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        psd = (2 * periodogram * counts[..., np.newaxis]) / (
+            SAMPLES_PER_DAY * window_power[..., np.newaxis]
+        )
+        used = usable.sum(axis=0)
+        power = np.where(usable[..., np.newaxis], psd, 0.0).sum(axis=0)
+        power /= used[:, np.newaxis]
+    return power, used.astype(np.int64)
+
+
+def spectra(
+    values: FloatArray, params: SpectralParams
+) -> dict[str, npt.NDArray[np.generic]]:
+    """Welch where enough gap-free segments exist, Lomb-Scargle elsewhere.
+
+    Runs inside the worker processes. ``segments`` counts the segments
+    averaged by whichever method was used.
+    """
+    power, segments = welch_batch(values, params)
+    fallback = segments < params.min_segments
+    if fallback.any():
+        power[fallback], segments[fallback] = lomb_scargle_segments(
+            values[:, fallback], params
+        )
+    return {
+        "power": power,
+        "segments": segments,
+        "method": fallback.astype(np.int64),
+    }
+
+
+def shared_spectra(
+    handle: SharedHandle, variable: str, columns: slice, params: SpectralParams
+) -> dict[str, npt.NDArray[np.generic]]:
+    """:func:`spectra` of some stations of a shared dataset."""
+    return spectra(attach(handle).variable(variable)[:, columns], params)
+
+
+class SpectralAnalyzer:
+    """Spectra of many stations and variables, computed in parallel.
+
+    Stations are sent to a process pool in batches of
+    ``stations_per_task``, each batch vectorized across its stations and
+    read from a :class:`~tsa.shared.SharedDataset`. Every
+    spectrum is cached by station, variable, time window and
+    :class:`SpectralParams`, so only new combinations are computed.
+    """
+
+    def __init__(
+        self,
+        observations: ObservationRepository,
+        cache: ArrayCache | None = None,
+        *,
+        params: SpectralParams | None = None,
+        max_workers: int | None = None,
+        stations_per_task: int = 8,
+    ) -> None:
+        self.observations = observations
+        self.cache = cache or ArrayCache("spectra")
+        self.params = params or SpectralParams()
+        self.max_workers = max_workers
+        self.stations_per_task = stations_per_task
+
+    def _key(
+        self, station_id: int, variable: str, start: datetime, end: datetime
+    ) -> str:
+        return ArrayCache.key(station_id, variable, start, end, self.params)
+
+    def run(
+        self,
+        station_ids: Sequence[int],
+        variables: Sequence[str],
+        *,
+        start: datetime,
+        end: datetime,
+    ) -> dict[str, Spectrum]:
+        """Spectrum of every variable over ``[start, end)``."""
+        ids = tuple(sorted(set(station_ids)))
+        with (
+            ExitStack() as datasets,
+            ProcessPoolExecutor(max_workers=self.max_workers) as pool,
+        ):
+            futures: dict[
+                Future[dict[str, npt.NDArray[np.generic]]],
+                tuple[str, tuple[int, ...]],
+            ] = {}
+            for variable in variables:
+                missing = [
+                    station_id
+                    for station_id in ids
+                    if self.cache.get(
+                        self._key(station_id, variable, start, end)
+                    )
+                    is None
+                ]
+                if not missing:
+                    continue
+                dataset = datasets.enter_context(
+                    SharedDataset.load(
+                        self.observations,
+                        missing,
+                        [variable],
+                        start=start,
+                        end=end,
+                    )
+                )
+                loaded = dataset.handle.station_ids
+                for offset in range(0, len(loaded), self.stations_per_task):
+                    batch = loaded[offset : offset + self.stations_per_task]
+                    future = pool.submit(
+                        shared_spectra,
+                        dataset.handle,
+                        variable,
+                        slice(offset, offset + len(batch)),
+                        self.params,
+                    )
+                    futures[future] = (variable, batch)
+                logger.info(
+                    "Espectros de %s: %d estações a calcular.",
+                    variable,
+                    len(missing),
+                )
+            for future in as_completed(futures):
+                variable, batch = futures[future]
+                result = future.result()
+                for row, station_id in enumerate(batch):
+                    self.cache.put(
+                        self._key(station_id, variable, start, end),
+                        **{name: array[row] for name, array in result.items()},
+                    )
+        return {
+            variable: self._spectrum(ids, variable, start, end)
+            for variable in variables
+        }
+
+    def _spectrum(
+        self,
+        station_ids: tuple[int, ...],
+        variable: str,
+        start: datetime,
+        end: datetime,
+    ) -> Spectrum:
+        entries = []
+        for station_id in station_ids:
+            entry = self.cache.get(self._key(station_id, variable, start, end))
+            if entry is None:
+                raise LookupError(
+                    f"Espectro de {variable} não calculado para a estação "
+                    f"{station_id}."
+                )
+            entries.append(entry)
+        return Spectrum(
+            station_ids=station_ids,
+            variable=variable,
+            frequency=self.params.frequencies(),
+            power=np.stack([entry["power"] for entry in entries]),
+            method=tuple(METHODS[int(entry["method"])] for entry in entries),
+            segments=np.array(
+                [int(entry["segments"]) for entry in entries], dtype=np.int64
+            ),
+        )
@@ -0,0 +1,48 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from ._settings import settings
+
+
+class ArrayCache:
+    """On-disk cache of NumPy arrays grouped by namespace.
+
+    Each entry is a single ``.npz`` file named after a hash of its key, so
+    anything with a stable ``repr`` (ids, variable names, datetimes, ...)
+    can be used to build keys.
+    """
+
+    def __init__(self, namespace: str, root: Path | None = None) -> None:
+        self.path = (root or settings.cache_path) / namespace
+
+    @staticmethod
+    def key(*parts: object) -> str:
+        return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> dict[str, npt.NDArray[np.generic]] | None:
+        file_path = self.path / f"{key}.npz"
+        if not file_path.exists():
+            return None
+        with np.load(file_path, allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+
+    def put(self, key: str, **arrays: npt.NDArray[np.generic]) -> None:
+        """Store ``arrays`` under ``key``, replacing any previous entry."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path, suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                np.savez(fp, **arrays)  # type: ignore[arg-type]
+            os.replace(tmp_name, self.path / f"{key}.npz")
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def clear(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -7,6 +7,7 @@ from sqlalchemy import Engine
 from sqlmodel import Session, create_engine
 
 from .._settings import DatabaseSettings
+from .sqlite import sqlite_engine
 
 
 class Connector(BaseModel):
@@ -16,10 +17,16 @@ class Connector(BaseModel):
     )
     settings: DatabaseSettings
 
+    @property
+    def is_sqlite(self) -> bool:
+        return self.settings.drivername == "sqlite"
+
     @computed_field
     @property  # type: ignore[prop-decorator]
-    def url(self) -> PostgresDsn:
-        return PostgresDsn.build(
+    def url(self) -> str:
+        if self.is_sqlite:
+            return f"sqlite:///{self.settings.sqlite_path}"
+        dsn = PostgresDsn.build(
             scheme=self.settings.drivername,
             username=self.settings.username,
             password=self.settings.password.get_secret_value(),
@@ -27,11 +34,16 @@ class Connector(BaseModel):
             port=self.settings.port,
             path=self.settings.database,
         )
+        return str(dsn)
 
     @computed_field
     @property  # type: ignore[prop-decorator]
     def engine(self) -> Engine:
-        return create_engine(url=str(self.url), echo=self.settings.echo_sql)
+        if self.is_sqlite:
+            return sqlite_engine(
+                self.settings.sqlite_path, echo=self.settings.echo_sql
+            )
+        return create_engine(url=self.url, echo=self.settings.echo_sql)
 
     @contextmanager
     def get_session(self) -> Generator[Session]:
@@ -1,9 +1,16 @@
+from .backtest_fold import BacktestFoldDAO
 from .base import BaseDAO
 from .city import CityDAO
+from .derived_value import DerivedValueDAO
+from .fitted_model import FittedModelDAO
+from .imputed_value import ImputedValueDAO
+from .model_candidate import ModelCandidateDAO
 from .observation import ObservationDAO
+from .quantile_sketch import QuantileSketchDAO
 from .region import RegionDAO
 from .state import StateDAO
 from .station import StationDAO
+from .structural_model import StructuralModelDAO
 
 __all__ = [
     "BaseDAO",
@@ -12,4 +19,11 @@ __all__ = [
     "CityDAO",
     "StationDAO",
     "ObservationDAO",
+    "ModelCandidateDAO",
+    "FittedModelDAO",
+    "ImputedValueDAO",
+    "QuantileSketchDAO",
+    "DerivedValueDAO",
+    "StructuralModelDAO",
+    "BacktestFoldDAO",
 ]
@@ -0,0 +1,85 @@
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import Row, func, insert
+from sqlalchemy.engine import ScalarResult
+from sqlmodel import col, select
+
+from ..models import BacktestFold
+from .base import BaseDAO
+
+
+class BacktestFoldDAO(BaseDAO[BacktestFold]):
+    model = BacktestFold
+
+    def list_for_run(
+        self, run: str, variable: str, model: str
+    ) -> list[BacktestFold]:
+        statement = (
+            select(BacktestFold)
+            .where(
+                BacktestFold.run == run,
+                BacktestFold.variable == variable,
+                BacktestFold.model == model,
+            )
+            .order_by(
+                BacktestFold.station_id,  # type: ignore[arg-type]
+                BacktestFold.origin,  # type: ignore[arg-type]
+            )
+        )
+        result: ScalarResult[BacktestFold] = self.session.exec(statement)
+        return list(result)
+
+    def list_origins(
+        self, run: str, plan: str, variable: str, model: str
+    ) -> list[Row[Any]]:
+        """Return ``(station_id, origin)`` of the folds already stored."""
+        statement = select(BacktestFold.station_id, BacktestFold.origin).where(
+            BacktestFold.run == run,
+            BacktestFold.plan == plan,
+            BacktestFold.variable == variable,
+            BacktestFold.model == model,
+        )
+        return list(self.session.exec(statement))
+
+    def list_plans(self, run: str) -> list[str]:
+        statement = (
+            select(BacktestFold.plan).where(BacktestFold.run == run).distinct()
+        )
+        return list(self.session.exec(statement))
+
+    def summarize(self, run: str) -> list[Row[Any]]:
+        """Mean metrics per station, variable and model of a run.
+
+        RMSE is pooled over folds (root of the mean squared error).
+        """
+        statement = (
+            select(
+                BacktestFold.station_id,
+                BacktestFold.variable,
+                BacktestFold.model,
+                func.count(col(BacktestFold.mae)),
+                func.avg(BacktestFold.mae),
+                func.sqrt(func.avg(col(BacktestFold.rmse) * BacktestFold.rmse)),
+                func.avg(BacktestFold.crps),
+            )
+            .where(BacktestFold.run == run)
+            .group_by(
+                BacktestFold.station_id,  # type: ignore[arg-type]
+                BacktestFold.variable,  # type: ignore[arg-type]
+                BacktestFold.model,  # type: ignore[arg-type]
+            )
+            .order_by(
+                BacktestFold.variable,  # type: ignore[arg-type]
+                BacktestFold.model,  # type: ignore[arg-type]
+                BacktestFold.station_id,  # type: ignore[arg-type]
+            )
+        )
+        return list(self.session.exec(statement))
+
+    def insert_many(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Bulk insert plain rows with a single executemany."""
+        if rows:
+            self.session.connection().execute(
+                insert(BacktestFold.__table__),  # type: ignore[attr-defined]
+                rows,
+            )
@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import Row, delete, insert
+from sqlmodel import col, select
+
+from ..models import DerivedValue
+from .base import BaseDAO
+
+
+class DerivedValueDAO(BaseDAO[DerivedValue]):
+    model = DerivedValue
+
+    def list_values(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Row[Any]]:
+        """Return ``(station_id, datetime, value)`` rows."""
+        statement = select(
+            DerivedValue.station_id,
+            DerivedValue.datetime,
+            DerivedValue.value,
+        ).where(
+            col(DerivedValue.station_id).in_(station_ids),
+            DerivedValue.variable == variable,
+        )
+        if start:
+            statement = statement.where(DerivedValue.datetime >= start)
+        if end:
+            statement = statement.where(DerivedValue.datetime < end)
+        statement = statement.order_by(
+            DerivedValue.station_id,  # type: ignore[arg-type]
+            DerivedValue.datetime,  # type: ignore[arg-type]
+        )
+        return list(self.session.exec(statement))
+
+    def delete_range(
+        self,
+        station_ids: Sequence[int],
+        variables: Sequence[str],
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        statement = delete(DerivedValue).where(
+            col(DerivedValue.station_id).in_(station_ids),
+            col(DerivedValue.variable).in_(variables),
+            col(DerivedValue.datetime) >= start,
+            col(DerivedValue.datetime) < end,
+        )
+        self.session.exec(statement)  # type: ignore[call-overload]
+
+    def insert_many(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Bulk insert plain rows with a single executemany."""
+        if rows:
+            self.session.connection().execute(
+                insert(DerivedValue.__table__),  # type: ignore[attr-defined]
+                rows,
+            )
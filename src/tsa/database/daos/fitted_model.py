@@ -0,0 +1,31 @@
+from sqlalchemy.engine import ScalarResult
+from sqlmodel import select
+
+from ..models import FittedModel
+from .base import BaseDAO
+
+
+class FittedModelDAO(BaseDAO[FittedModel]):
+    model = FittedModel
+
+    def get_by_station_and_variable(
+        self, station_id: int, variable: str
+    ) -> FittedModel | None:
+        statement = select(FittedModel).where(
+            FittedModel.station_id == station_id,
+            FittedModel.variable == variable,
+        )
+        result: ScalarResult[FittedModel] = self.session.exec(statement)
+        return result.first()
+
+    def list_by_station(self, station_id: int) -> list[FittedModel]:
+        statement = select(FittedModel).where(
+            FittedModel.station_id == station_id
+        )
+        result: ScalarResult[FittedModel] = self.session.exec(statement)
+        return list(result)
+
+    def list_by_variable(self, variable: str) -> list[FittedModel]:
+        statement = select(FittedModel).where(FittedModel.variable == variable)
+        result: ScalarResult[FittedModel] = self.session.exec(statement)
+        return list(result)
@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import Row, delete, insert
+from sqlmodel import col, select
+
+from ..models import ImputedValue
+from .base import BaseDAO
+
+
+class ImputedValueDAO(BaseDAO[ImputedValue]):
+    model = ImputedValue
+
+    def list_values(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Row[Any]]:
+        """Return ``(station_id, datetime, value, method)`` rows."""
+        statement = select(
+            ImputedValue.station_id,
+            ImputedValue.datetime,
+            ImputedValue.value,
+            ImputedValue.method,
+        ).where(
+            col(ImputedValue.station_id).in_(station_ids),
+            ImputedValue.variable == variable,
+        )
+        if start:
+            statement = statement.where(ImputedValue.datetime >= start)
+        if end:
+            statement = statement.where(ImputedValue.datetime < end)
+        statement = statement.order_by(
+            ImputedValue.station_id,  # type: ignore[arg-type]
+            ImputedValue.datetime,  # type: ignore[arg-type]
+        )
+        return list(self.session.exec(statement))
+
+    def delete_range(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        statement = delete(ImputedValue).where(
+            col(ImputedValue.station_id).in_(station_ids),
+            col(ImputedValue.variable) == variable,
+            col(ImputedValue.datetime) >= start,
+            col(ImputedValue.datetime) < end,
+        )
+        self.session.exec(statement)  # type: ignore[call-overload]
+
+    def insert_many(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Bulk insert plain rows with a single executemany."""
+        if rows:
+            self.session.connection().execute(
+                insert(ImputedValue.__table__),  # type: ignore[attr-defined]
+                rows,
+            )
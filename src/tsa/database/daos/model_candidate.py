@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy.engine import ScalarResult
+from sqlmodel import select
+
+from ..models import ModelCandidate
+from .base import BaseDAO
+
+
+class ModelCandidateDAO(BaseDAO[ModelCandidate]):
+    model = ModelCandidate
+
+    def list_for_window(
+        self,
+        station_id: int,
+        variable: str,
+        train_start: datetime,
+        train_end: datetime,
+    ) -> list[ModelCandidate]:
+        statement = select(ModelCandidate).where(
+            ModelCandidate.station_id == station_id,
+            ModelCandidate.variable == variable,
+            ModelCandidate.train_start == train_start,
+            ModelCandidate.train_end == train_end,
+        )
+        result: ScalarResult[ModelCandidate] = self.session.exec(statement)
+        return list(result)
@@ -1,11 +1,34 @@
 from datetime import datetime
+from typing import Any, Iterator, Mapping, Sequence
 
+from sqlalchemy import Row, Select, insert
 from sqlalchemy.engine import ScalarResult
-from sqlmodel import select
+from sqlmodel import col, func, select
 
-from ..models import Observation
+from ..functions import AGGREGATES, Aggregate, Bucket, time_bucket
+from ..models import (
+    OBSERVATION_VARIABLES,
+    City,
+    Observation,
+    Region,
+    State,
+    Station,
+)
 from .base import BaseDAO
 
+# Columns of ``export_statement``, in order.
+EXPORT_COLUMNS = (
+    "region_code",
+    "state_code",
+    "station_code",
+    "city",
+    "latitude",
+    "longitude",
+    "altitude",
+    "datetime",
+    *OBSERVATION_VARIABLES,
+)
+
 
 class ObservationDAO(BaseDAO[Observation]):
     model = Observation
@@ -23,6 +46,16 @@ class ObservationDAO(BaseDAO[Observation]):
         result: ScalarResult[Observation] = self.session.exec(statement)
         return list(result)
 
+    def insert_many(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Bulk insert plain rows with a single executemany."""
+        if rows:
+            # Core executemany: the ORM bulk path splits the batch into a new
+            # statement whenever the set of NULL columns changes.
+            self.session.connection().execute(
+                insert(Observation.__table__),  # type: ignore[attr-defined]
+                rows,
+            )
+
     def get_by_station_and_time(
         self, station_id: int, dt: datetime
     ) -> Observation | None:
@@ -32,3 +65,184 @@ class ObservationDAO(BaseDAO[Observation]):
         )
         result: ScalarResult[Observation] = self.session.exec(statement)
         return result.first()
+
+    def values_statement(
+        self,
+        station_ids: Sequence[int],
+        columns: Sequence[str],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Select[Any]:
+        """``(station_id, datetime, *columns)`` by station and time.
+
+        ``start`` is inclusive and ``end`` is exclusive.
+        """
+        statement = select(  # type: ignore[call-overload]
+            Observation.station_id,
+            Observation.datetime,
+            *(getattr(Observation, column) for column in columns),
+        ).where(col(Observation.station_id).in_(station_ids))
+        if start:
+            statement = statement.where(Observation.datetime >= start)
+        if end:
+            statement = statement.where(Observation.datetime < end)
+        return statement.order_by(  # type: ignore[no-any-return]
+            Observation.station_id,
+            Observation.datetime,
+        )
+
+    def list_values(
+        self,
+        station_ids: Sequence[int],
+        columns: Sequence[str],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Row[Any]]:
+        """Return ``values_statement`` rows, skipping the ORM."""
+        return list(
+            self.session.exec(
+                self.values_statement(
+                    station_ids, columns, start=start, end=end
+                )
+            )
+        )
+
+    def iter_values(
+        self,
+        station_ids: Sequence[int],
+        columns: Sequence[str],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = 50_000,
+    ) -> Iterator[Sequence[Row[Any]]]:
+        """Stream ``values_statement`` rows in batches, as ``iter_export``."""
+        statement = self.values_statement(
+            station_ids, columns, start=start, end=end
+        ).execution_options(stream_results=True, yield_per=batch_size)
+        yield from self.session.exec(statement).partitions()  # type: ignore[call-overload]
+
+    def aggregate(
+        self,
+        station_ids: Sequence[int],
+        aggregates: Mapping[str, Sequence[Aggregate]],
+        *,
+        bucket: Bucket,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Row[Any]]:
+        """Per-station aggregates of each time bucket, computed in SQL.
+
+        Returns ``(station_id, bucket_start, *values)`` rows with one value
+        per ``(column, aggregate)`` pair in ``aggregates`` order, only for
+        buckets holding at least one observation. ``start`` is inclusive
+        and ``end`` exclusive.
+        """
+        bucket_start = time_bucket(bucket, col(Observation.datetime))
+        statement = (
+            select(  # type: ignore[call-overload]
+                Observation.station_id,
+                bucket_start.label("bucket"),
+                *(
+                    AGGREGATES[aggregate](getattr(Observation, column))
+                    for column, names in aggregates.items()
+                    for aggregate in names
+                ),
+            )
+            .where(col(Observation.station_id).in_(station_ids))
+            .group_by(Observation.station_id, bucket_start)
+            .order_by(Observation.station_id, bucket_start)
+        )
+        if start:
+            statement = statement.where(Observation.datetime >= start)
+        if end:
+            statement = statement.where(Observation.datetime < end)
+        return list(self.session.exec(statement))
+
+    def datetime_range(
+        self, station_ids: Sequence[int]
+    ) -> tuple[datetime | None, datetime | None]:
+        """First and last observation time among ``station_ids``."""
+        statement = select(
+            func.min(Observation.datetime), func.max(Observation.datetime)
+        ).where(col(Observation.station_id).in_(station_ids))
+        first, last = self.session.exec(statement).one()
+        return first, last
+
+    def datetime_ranges(
+        self, station_ids: Sequence[int]
+    ) -> dict[int, tuple[datetime, datetime]]:
+        """First and last observation time of each station that has any."""
+        statement = (
+            select(
+                Observation.station_id,
+                func.min(Observation.datetime),
+                func.max(Observation.datetime),
+            )
+            .where(col(Observation.station_id).in_(station_ids))
+            .group_by(Observation.station_id)
+        )
+        return {
+            station_id: (first, last)
+            for station_id, first, last in self.session.exec(statement)
+        }
+
+    def export_statement(
+        self,
+        station_id: int,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Select[Any]:
+        """Observations of a station joined with its location, by time.
+
+        The selected columns are ``EXPORT_COLUMNS``; ``start`` is inclusive
+        and ``end`` exclusive.
+        """
+        statement = (
+            select(  # type: ignore[call-overload]
+                col(Region.code).label("region_code"),
+                col(State.code).label("state_code"),
+                col(Station.code).label("station_code"),
+                col(City.name).label("city"),
+                Station.latitude,
+                Station.longitude,
+                Station.altitude,
+                Observation.datetime,
+                *(
+                    getattr(Observation, column)
+                    for column in OBSERVATION_VARIABLES
+                ),
+            )
+            .join(Station, col(Station.id) == Observation.station_id)
+            .join(City, col(City.id) == Station.city_id)
+            .join(State, col(State.id) == Station.state_id)
+            .join(Region, col(Region.id) == State.region_id)
+            .where(Observation.station_id == station_id)
+            .order_by(Observation.datetime)
+        )
+        if start:
+            statement = statement.where(Observation.datetime >= start)
+        if end:
+            statement = statement.where(Observation.datetime < end)
+        return statement  # type: ignore[no-any-return]
+
+    def iter_export(
+        self,
+        station_id: int,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = 50_000,
+    ) -> Iterator[Sequence[Row[Any]]]:
+        """Stream ``export_statement`` rows in batches.
+
+        ``stream_results`` makes psycopg2 use a server-side (named) cursor,
+        so only ``batch_size`` rows are held in memory at a time.
+        """
+        statement = self.export_statement(
+            station_id, start=start, end=end
+        ).execution_options(stream_results=True, yield_per=batch_size)
+        yield from self.session.exec(statement).partitions()  # type: ignore[call-overload]
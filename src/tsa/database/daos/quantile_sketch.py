@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import delete, insert
+from sqlmodel import col, select
+
+from ..models import QuantileSketch, State, Station
+from .base import BaseDAO
+
+
+class QuantileSketchDAO(BaseDAO[QuantileSketch]):
+    model = QuantileSketch
+
+    def list_digests(
+        self,
+        variable: str,
+        *,
+        station_ids: Sequence[int] | None = None,
+        state_ids: Sequence[int] | None = None,
+        region_ids: Sequence[int] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[bytes]:
+        """Serialized digests of ``variable`` matching every given filter.
+
+        ``start`` is inclusive and ``end`` exclusive, both compared with the
+        first day of each month.
+        """
+        statement = (
+            select(QuantileSketch.digest)
+            .join(Station, col(Station.id) == QuantileSketch.station_id)
+            .where(QuantileSketch.variable == variable)
+        )
+        if station_ids is not None:
+            statement = statement.where(
+                col(QuantileSketch.station_id).in_(station_ids)
+            )
+        if state_ids is not None:
+            statement = statement.where(col(Station.state_id).in_(state_ids))
+        if region_ids is not None:
+            statement = statement.join(
+                State, col(State.id) == Station.state_id
+            ).where(col(State.region_id).in_(region_ids))
+        if start:
+            statement = statement.where(QuantileSketch.month >= start)
+        if end:
+            statement = statement.where(QuantileSketch.month < end)
+        return list(self.session.exec(statement))
+
+    def delete_months(
+        self, station_id: int, variable: str, months: Sequence[datetime]
+    ) -> None:
+        statement = delete(QuantileSketch).where(
+            col(QuantileSketch.station_id) == station_id,
+            col(QuantileSketch.variable) == variable,
+            col(QuantileSketch.month).in_(months),
+        )
+        self.session.exec(statement)  # type: ignore[call-overload]
+
+    def insert_many(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Bulk insert plain rows with a single executemany."""
+        if rows:
+            self.session.connection().execute(
+                insert(QuantileSketch.__table__),  # type: ignore[attr-defined]
+                rows,
+            )
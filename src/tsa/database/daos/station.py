@@ -1,8 +1,11 @@
+from datetime import datetime
+from typing import Sequence
+
 from sqlalchemy.engine import ScalarResult
-from sqlmodel import select
+from sqlmodel import col, func, select
 
 from .base import BaseDAO
-from ..models import Station
+from ..models import Region, State, Station
 
 
 class StationDAO(BaseDAO[Station]):
@@ -17,3 +20,40 @@ class StationDAO(BaseDAO[Station]):
         statement = select(Station).where(Station.city_id == city_id)
         result: ScalarResult[Station] = self.session.exec(statement)
         return list(result)
+
+    def fingerprint(
+        self,
+    ) -> tuple[int, int | None, datetime | None, float | None]:
+        """Cheap summary that changes whenever a station is added or edited."""
+        statement = select(
+            func.count(),
+            func.max(Station.id),
+            func.max(Station.updated_at),
+            func.sum(Station.latitude + Station.longitude + Station.altitude),
+        ).select_from(Station)
+        count, max_id, updated_at, coordinates = self.session.exec(
+            statement
+        ).one()
+        return count, max_id, updated_at, coordinates
+
+    def list_locations(
+        self,
+        *,
+        codes: Sequence[str] | None = None,
+        state_codes: Sequence[str] | None = None,
+        region_codes: Sequence[str] | None = None,
+    ) -> list[tuple[int, str, str, str]]:
+        """``(id, code, state code, region code)`` of the matching stations."""
+        statement = (
+            select(Station.id, Station.code, State.code, Region.code)
+            .join(State, col(State.id) == Station.state_id)
+            .join(Region, col(Region.id) == State.region_id)
+            .order_by(Station.code)
+        )
+        if codes:
+            statement = statement.where(col(Station.code).in_(codes))
+        if state_codes:
+            statement = statement.where(col(State.code).in_(state_codes))
+        if region_codes:
+            statement = statement.where(col(Region.code).in_(region_codes))
+        return list(self.session.exec(statement))  # type: ignore[arg-type]
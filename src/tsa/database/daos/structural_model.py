@@ -0,0 +1,26 @@
+from sqlalchemy.engine import ScalarResult
+from sqlmodel import select
+
+from ..models import StructuralModel
+from .base import BaseDAO
+
+
+class StructuralModelDAO(BaseDAO[StructuralModel]):
+    model = StructuralModel
+
+    def get_by_station_and_variable(
+        self, station_id: int, variable: str
+    ) -> StructuralModel | None:
+        statement = select(StructuralModel).where(
+            StructuralModel.station_id == station_id,
+            StructuralModel.variable == variable,
+        )
+        result: ScalarResult[StructuralModel] = self.session.exec(statement)
+        return result.first()
+
+    def list_by_variable(self, variable: str) -> list[StructuralModel]:
+        statement = select(StructuralModel).where(
+            StructuralModel.variable == variable
+        )
+        result: ScalarResult[StructuralModel] = self.session.exec(statement)
+        return list(result)
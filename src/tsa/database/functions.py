@@ -0,0 +1,79 @@
+from collections.abc import Callable
+from typing import Any, Literal
+
+from sqlalchemy import DateTime, func, literal_column
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.functions import FunctionElement
+
+Bucket = Literal["hour", "day", "month", "year"]
+
+BUCKETS: tuple[Bucket, ...] = ("hour", "day", "month", "year")
+
+# NumPy unit of each bucket, for laying results on a regular axis.
+BUCKET_UNITS: dict[Bucket, str] = {
+    "hour": "h",
+    "day": "D",
+    "month": "M",
+    "year": "Y",
+}
+
+Aggregate = Literal["mean", "sum", "min", "max", "count"]
+
+# SQL function of each aggregate; ``count`` counts non-null readings.
+AGGREGATES: dict[
+    Aggregate, Callable[[ColumnElement[Any]], ColumnElement[Any]]
+] = {
+    "mean": func.avg,
+    "sum": func.sum,
+    "min": func.min,
+    "max": func.max,
+    "count": func.count,
+}
+
+_SQLITE_FORMATS: dict[Bucket, str] = {
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d 00:00:00",
+    "month": "%Y-%m-01 00:00:00",
+    "year": "%Y-01-01 00:00:00",
+}
+
+
+class time_bucket(FunctionElement[Any]):  # noqa: N801
+    """Start of the ``hour``/``day``/``month``/``year`` holding a timestamp.
+
+    Renders as ``date_trunc`` on PostgreSQL and as ``strftime`` on SQLite,
+    so the same statement can group by calendar buckets on either.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+    name = "time_bucket"
+
+    def __init__(self, bucket: Bucket, column: ColumnElement[Any]) -> None:
+        if bucket not in BUCKETS:
+            raise ValueError(f"Intervalo desconhecido: {bucket!r}")
+        self.bucket = bucket
+        # The bucket is kept as a clause too, so it is part of the statement
+        # cache key.
+        super().__init__(literal_column(f"'{bucket}'"), column)
+
+
+@compiles(time_bucket)
+def _compile_default(
+    element: time_bucket, compiler: SQLCompiler, **kw: object
+) -> str:
+    bucket, column = (
+        compiler.process(clause, **kw) for clause in element.clauses
+    )
+    return f"date_trunc({bucket}, {column})"
+
+
+@compiles(time_bucket, "sqlite")
+def _compile_sqlite(
+    element: time_bucket, compiler: SQLCompiler, **kw: object
+) -> str:
+    _, column = element.clauses
+    rendered = compiler.process(column, **kw)
+    return f"strftime('{_SQLITE_FORMATS[element.bucket]}', {rendered})"
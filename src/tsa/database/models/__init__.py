@@ -1,13 +1,28 @@
+from .backtest_folds import BacktestFold
 from .cities import City
-from .obsevations import Observation
+from .derived_values import DerivedValue
+from .fitted_models import FittedModel
+from .imputed_values import ImputedValue
+from .model_candidates import ModelCandidate
+from .obsevations import OBSERVATION_VARIABLES, Observation
+from .quantile_sketches import QuantileSketch
 from .regions import Region
 from .states import State
 from .stations import Station
+from .structural_models import StructuralModel
 
 __all__ = [
     "City",
     "State",
     "Region",
     "Observation",
+    "OBSERVATION_VARIABLES",
     "Station",
+    "ModelCandidate",
+    "FittedModel",
+    "ImputedValue",
+    "QuantileSketch",
+    "DerivedValue",
+    "StructuralModel",
+    "BacktestFold",
 ]
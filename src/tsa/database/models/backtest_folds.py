@@ -0,0 +1,45 @@
+import datetime as dt
+from typing import Optional
+
+from sqlalchemy import JSON, Column, DateTime, UniqueConstraint, func
+from sqlmodel import Field, SQLModel
+
+
+class BacktestFold(SQLModel, table=True):
+    __tablename__ = "backtest_folds"
+    __table_args__ = (
+        UniqueConstraint(
+            "run", "plan", "station_id", "variable", "model", "origin"
+        ),
+        {"schema": "inmet"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    run: str = Field(index=True, description="Nome da rodada de backtesting")
+    plan: str = Field(description="Hash do plano de origens e janelas")
+    station_id: int = Field(foreign_key="inmet.stations.id")
+    variable: str = Field(description="Coluna de Observation prevista")
+    model: str = Field(description="Modelo avaliado, ex. SARIMA(1,0,1)")
+    origin: dt.datetime = Field(description="Primeira hora prevista")
+    train_start: dt.datetime = Field(description="Início da janela de treino")
+    horizon: int = Field(description="Horas previstas a partir da origem")
+    observed: int = Field(
+        default=0, description="Horas observadas no horizonte"
+    )
+    mae: Optional[float] = Field(default=None)
+    rmse: Optional[float] = Field(default=None)
+    crps: Optional[float] = Field(default=None)
+    params: dict[str, float] = Field(
+        default_factory=dict, sa_column=Column(JSON, nullable=False)
+    )
+    error: Optional[str] = Field(
+        default=None, description="Erro do ajuste, se houver"
+    )
+    created_at: dt.datetime = Field(
+        default_factory=lambda: dt.datetime.now(tz=dt.timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+        ),
+    )
@@ -0,0 +1,62 @@
+import datetime as dt
+from typing import Optional
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    LargeBinary,
+    UniqueConstraint,
+    func,
+)
+from sqlmodel import Field, SQLModel
+
+
+class FittedModel(SQLModel, table=True):
+    __tablename__ = "fitted_models"
+    __table_args__ = (
+        UniqueConstraint("station_id", "variable"),
+        {"schema": "inmet"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    station_id: int = Field(foreign_key="inmet.stations.id", index=True)
+    variable: str = Field(description="Coluna de Observation modelada")
+    p: int = Field(description="Ordem autorregressiva")
+    d: int = Field(description="Ordem de diferenciação")
+    q: int = Field(description="Ordem de médias móveis")
+    seasonal_p: int = Field(description="Ordem autorregressiva sazonal")
+    seasonal_d: int = Field(description="Ordem de diferenciação sazonal")
+    seasonal_q: int = Field(description="Ordem de médias móveis sazonal")
+    period: int = Field(description="Período sazonal (horas)")
+    params: dict[str, float] = Field(
+        default_factory=dict, sa_column=Column(JSON, nullable=False)
+    )
+    state: bytes = Field(
+        sa_column=Column(LargeBinary, nullable=False),
+        description="Vetor de estado previsto (float64)",
+    )
+    state_cov: bytes = Field(
+        sa_column=Column(LargeBinary, nullable=False),
+        description="Covariância do estado previsto (float64)",
+    )
+    train_end: dt.datetime = Field(
+        description="Primeira hora ainda não incorporada ao estado"
+    )
+    created_at: dt.datetime = Field(
+        default_factory=lambda: dt.datetime.now(tz=dt.timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+        ),
+    )
+    updated_at: dt.datetime = Field(
+        default_factory=lambda: dt.datetime.now(tz=dt.timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+            onupdate=func.now(),
+        ),
+    )
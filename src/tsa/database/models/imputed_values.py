@@ -0,0 +1,39 @@
+import datetime as dt
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, UniqueConstraint, func
+from sqlmodel import Field, SQLModel
+
+
+class ImputedValue(SQLModel, table=True):
+    __tablename__ = "imputed_values"
+    __table_args__ = (
+        UniqueConstraint("station_id", "variable", "datetime"),
+        {"schema": "inmet"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    station_id: int = Field(foreign_key="inmet.stations.id")
+    variable: str = Field(description="Coluna de Observation imputada")
+    datetime: dt.datetime
+    value: float = Field(description="Valor imputado")
+    method: str = Field(
+        description="Método de imputação (temporal, regression, idw)"
+    )
+    created_at: dt.datetime = Field(
+        default_factory=lambda: dt.datetime.now(tz=dt.timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+        ),
+    )
+    updated_at: dt.datetime = Field(
+        default_factory=lambda: dt.datetime.now(tz=dt.timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+            onupdate=func.now(),
+        ),
+    )
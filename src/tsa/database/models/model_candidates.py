@@ -0,0 +1,66 @@
+import datetime as dt
+from typing import Optional
+
+from sqlalchemy import JSON, Column, DateTime, UniqueConstraint, func
+from sqlmodel import Field, SQLModel
+
+
+class ModelCandidate(SQLModel, table=True):
+    __tablename__ = "model_candidates"
+    __table_args__ = (
+        UniqueConstraint(
+            "station_id",
+            "variable",
+            "train_start",
+            "train_end",
+            "p",
+            "d",
+            "q",
+            "seasonal_p",
+            "seasonal_d",
+            "seasonal_q",
+            "period",
+        ),
+        {"schema": "inmet"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    station_id: int = Field(foreign_key="inmet.stations.id", index=True)
+    variable: str = Field(description="Coluna de Observation modelada")
+    train_start: dt.datetime = Field(description="Início da janela de treino")
+    train_end: dt.datetime = Field(
+        description="Fim (exclusivo) da janela de treino"
+    )
+    p: int = Field(description="Ordem autorregressiva")
+    d: int = Field(description="Ordem de diferenciação")
+    q: int = Field(description="Ordem de médias móveis")
+    seasonal_p: int = Field(description="Ordem autorregressiva sazonal")
+    seasonal_d: int = Field(description="Ordem de diferenciação sazonal")
+    seasonal_q: int = Field(description="Ordem de médias móveis sazonal")
+    period: int = Field(description="Período sazonal (horas)")
+    aic: Optional[float] = Field(default=None)
+    bic: Optional[float] = Field(default=None)
+    params: dict[str, float] = Field(
+        default_factory=dict, sa_column=Column(JSON, nullable=False)
+    )
+    converged: bool = Field(default=False)
+    error: Optional[str] = Field(
+        default=None, description="Erro do ajuste, se houver"
+    )
+    created_at: dt.datetime = Field(
+        default_factory=lambda: dt.datetime.now(tz=dt.timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+        ),
+    )
+    updated_at: dt.datetime = Field(
+        default_factory=lambda: dt.datetime.now(tz=dt.timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+            onupdate=func.now(),
+        ),
+    )
@@ -1,13 +1,16 @@
 import datetime as dt
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, func
+from sqlalchemy import Column, DateTime, Index, func
 from sqlmodel import Field, Relationship, SQLModel
 
 
 class Observation(SQLModel, table=True):
     __tablename__ = "observations"
-    __table_args__ = {"schema": "inmet"}
+    __table_args__ = (
+        Index("ix_observations_station_datetime", "station_id", "datetime"),
+        {"schema": "inmet"},
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     station_id: int = Field(foreign_key="inmet.stations.id")
@@ -90,3 +93,10 @@ class Observation(SQLModel, table=True):
     station: "Station" = Relationship(  # type: ignore[name-defined] # noqa: F821
         back_populates="observations"
     )
+
+
+OBSERVATION_VARIABLES: tuple[str, ...] = tuple(
+    name
+    for name in Observation.model_fields
+    if name not in {"id", "station_id", "datetime", "created_at", "updated_at"}
+)
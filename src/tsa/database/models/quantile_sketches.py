@@ -0,0 +1,40 @@
+import datetime as dt
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, LargeBinary, UniqueConstraint, func
+from sqlmodel import Field, SQLModel
+
+
+class QuantileSketch(SQLModel, table=True):
+    __tablename__ = "quantile_sketches"
+    __table_args__ = (
+        UniqueConstraint("station_id", "variable", "month"),
+        {"schema": "inmet"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    station_id: int = Field(foreign_key="inmet.stations.id")
+    variable: str = Field(description="Coluna de Observation resumida")
+    month: dt.datetime = Field(description="Primeiro dia do mês resumido")
+    count: int = Field(description="Número de observações no resumo")
+    digest: bytes = Field(
+        sa_column=Column(LargeBinary, nullable=False),
+        description="t-digest serializado",
+    )
+    created_at: dt.datetime = Field(
+        default_factory=lambda: dt.datetime.now(tz=dt.timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+        ),
+    )
+    updated_at: dt.datetime = Field(
+        default_factory=lambda: dt.datetime.now(tz=dt.timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+            onupdate=func.now(),
+        ),
+    )
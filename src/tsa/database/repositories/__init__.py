@@ -1,9 +1,16 @@
+from .backtest_fold import BacktestFoldRepository
 from .base import BaseRepository
 from .city import CityRepository
-from .observation import ObservationRepository
+from .derived_value import DerivedValueRepository
+from .fitted_model import FittedModelRepository
+from .imputed_value import ImputedValueRepository
+from .model_candidate import ModelCandidateRepository
+from .observation import BucketArray, HourlyArray, ObservationRepository
+from .quantile_sketch import QuantileSketchRepository
 from .region import RegionRepository
 from .state import StateRepository
 from .station import StationRepository
+from .structural_model import StructuralModelRepository
 
 __all__ = [
     "BaseRepository",
@@ -12,4 +19,13 @@ __all__ = [
     "CityRepository",
     "StationRepository",
     "ObservationRepository",
+    "BucketArray",
+    "HourlyArray",
+    "ModelCandidateRepository",
+    "FittedModelRepository",
+    "ImputedValueRepository",
+    "QuantileSketchRepository",
+    "DerivedValueRepository",
+    "StructuralModelRepository",
+    "BacktestFoldRepository",
 ]
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import Row
+
+from ..daos import BacktestFoldDAO
+from ..models import BacktestFold
+from .base import BaseRepository
+
+
+class BacktestFoldRepository(BaseRepository[BacktestFold, BacktestFoldDAO]):
+    dao_class = BacktestFoldDAO
+
+    def find_for_run(
+        self, run: str, variable: str, model: str
+    ) -> list[BacktestFold]:
+        return self.dao.list_for_run(run, variable, model)
+
+    def done(
+        self, run: str, plan: str, variable: str, model: str
+    ) -> set[tuple[int, datetime]]:
+        """``(station_id, origin)`` of every fold already evaluated."""
+        return {
+            (row[0], row[1])
+            for row in self.dao.list_origins(run, plan, variable, model)
+        }
+
+    def plans(self, run: str) -> set[str]:
+        """Plans the folds stored under ``run`` were evaluated with."""
+        return set(self.dao.list_plans(run))
+
+    def summary(self, run: str) -> list[Row[Any]]:
+        return self.dao.summarize(run)
+
+    def record_many(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        self.dao.insert_many(rows)
+        self.session.commit()
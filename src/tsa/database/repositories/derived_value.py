@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+
+from ..daos import DerivedValueDAO
+from ..models import DerivedValue
+from .base import BaseRepository
+
+
+class DerivedValueRepository(BaseRepository[DerivedValue, DerivedValueDAO]):
+    dao_class = DerivedValueDAO
+
+    def find_values(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[tuple[int, datetime, float]]:
+        rows = self.dao.list_values(station_ids, variable, start=start, end=end)
+        return [(row[0], row[1], row[2]) for row in rows]
+
+    def replace_range(
+        self,
+        station_ids: Sequence[int],
+        variables: Sequence[str],
+        start: datetime,
+        end: datetime,
+        rows: Sequence[Mapping[str, Any]],
+    ) -> None:
+        """Replace every value of ``variables`` in ``[start, end)``."""
+        self.dao.delete_range(station_ids, variables, start, end)
+        self.dao.insert_many(rows)
+        self.session.commit()
@@ -0,0 +1,25 @@
+from ..daos import FittedModelDAO
+from ..models import FittedModel
+from .base import BaseRepository
+
+
+class FittedModelRepository(BaseRepository[FittedModel, FittedModelDAO]):
+    dao_class = FittedModelDAO
+
+    def get_for(self, station_id: int, variable: str) -> FittedModel | None:
+        return self.dao.get_by_station_and_variable(station_id, variable)
+
+    def find_for_station(self, station_id: int) -> list[FittedModel]:
+        return self.dao.list_by_station(station_id)
+
+    def find_for_variable(self, variable: str) -> list[FittedModel]:
+        return self.dao.list_by_variable(variable)
+
+    def save(
+        self, *, station_id: int, variable: str, **data: object
+    ) -> FittedModel:
+        """Insert or replace the registered model of a station/variable."""
+        existing = self.dao.get_by_station_and_variable(station_id, variable)
+        if existing:
+            return self.dao.update(existing, **data)
+        return self.dao.create(station_id=station_id, variable=variable, **data)
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+
+from ..daos import ImputedValueDAO
+from ..models import ImputedValue
+from .base import BaseRepository
+
+
+class ImputedValueRepository(BaseRepository[ImputedValue, ImputedValueDAO]):
+    dao_class = ImputedValueDAO
+
+    def replace_range(
+        self,
+        station_ids: Sequence[int],
+        variable: str,
+        start: datetime,
+        end: datetime,
+        rows: Sequence[Mapping[str, Any]],
+    ) -> None:
+        """Replace every imputed value of ``variable`` in ``[start, end)``."""
+        self.dao.delete_range(station_ids, variable, start, end)
+        self.dao.insert_many(rows)
+        self.session.commit()
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from ..daos import ModelCandidateDAO
+from ..models import ModelCandidate
+from .base import BaseRepository
+
+
+class ModelCandidateRepository(
+    BaseRepository[ModelCandidate, ModelCandidateDAO]
+):
+    dao_class = ModelCandidateDAO
+
+    def find_for_window(
+        self,
+        station_id: int,
+        variable: str,
+        train_start: datetime,
+        train_end: datetime,
+    ) -> list[ModelCandidate]:
+        return self.dao.list_for_window(
+            station_id, variable, train_start, train_end
+        )
+
+    def best(
+        self,
+        station_id: int,
+        variable: str,
+        train_start: datetime,
+        train_end: datetime,
+        *,
+        criterion: str = "aic",
+    ) -> ModelCandidate | None:
+        """Return the fitted candidate with the lowest ``criterion``."""
+        fitted = [
+            candidate
+            for candidate in self.find_for_window(
+                station_id, variable, train_start, train_end
+            )
+            if getattr(candidate, criterion) is not None
+        ]
+        if not fitted:
+            return None
+        return min(fitted, key=lambda candidate: getattr(candidate, criterion))
+
+    def record(self, candidate: ModelCandidate) -> ModelCandidate:
+        return self.dao.create(**candidate.model_dump(exclude={"id"}))
@@ -1,11 +1,62 @@
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import Row
 
 from ..daos import ObservationDAO
-from ..models import Observation
+from ..functions import AGGREGATES, BUCKET_UNITS, Aggregate, Bucket
+from ..models import OBSERVATION_VARIABLES, Observation
 from .base import BaseRepository
 
 
+@dataclass(frozen=True)
+class HourlyArray:
+    """Observations laid out on a regular hourly axis.
+
+    ``values`` has shape ``(hours, stations, variables)`` and holds ``NaN``
+    wherever a station has no reading for that hour.
+    """
+
+    times: npt.NDArray[np.datetime64]
+    station_ids: tuple[int, ...]
+    variables: tuple[str, ...]
+    values: npt.NDArray[np.float64]
+
+    def variable(self, name: str) -> npt.NDArray[np.float64]:
+        """Return the ``(hours, stations)`` matrix of a single variable."""
+        return self.values[:, :, self.variables.index(name)]
+
+    def station(self, station_id: int) -> npt.NDArray[np.float64]:
+        """Return the ``(hours, variables)`` matrix of a single station."""
+        return self.values[:, self.station_ids.index(station_id), :]
+
+
+@dataclass(frozen=True)
+class BucketArray:
+    """Aggregates of time buckets laid out on a regular axis.
+
+    ``values`` has shape ``(buckets, stations, columns)``, with columns named
+    ``<variable>_<aggregate>``, and holds ``NaN`` wherever a station has no
+    reading in that bucket.
+    """
+
+    times: npt.NDArray[np.datetime64]
+    station_ids: tuple[int, ...]
+    columns: tuple[str, ...]
+    values: npt.NDArray[np.float64]
+
+    def column(self, name: str) -> npt.NDArray[np.float64]:
+        """Return the ``(buckets, stations)`` matrix of a single column."""
+        return self.values[:, :, self.columns.index(name)]
+
+    def station(self, station_id: int) -> npt.NDArray[np.float64]:
+        """Return the ``(buckets, columns)`` matrix of a single station."""
+        return self.values[:, self.station_ids.index(station_id), :]
+
+
 class ObservationRepository(BaseRepository[Observation, ObservationDAO]):
     dao_class = ObservationDAO
 
@@ -42,7 +93,260 @@ class ObservationRepository(BaseRepository[Observation, ObservationDAO]):
                 persisted.append(self.dao.create(**obs.model_dump(exclude={"id"})))
         return persisted
 
+    def insert_rows(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Bulk-insert new observations given as column dicts."""
+        self.dao.insert_many(rows)
+
     def find_for_station(
         self, station_id: int, *, limit: int | None = None
     ) -> list[Observation]:
         return self.dao.list_by_station(station_id, limit=limit)
+
+    def time_span(
+        self, station_ids: Sequence[int]
+    ) -> tuple[datetime | None, datetime | None]:
+        return self.dao.datetime_range(station_ids)
+
+    def find_values(
+        self,
+        station_ids: Sequence[int],
+        variables: Sequence[str],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Row[Any]]:
+        """``(station_id, datetime, *variables)`` rows, ordered by station."""
+        unknown = set(variables) - set(OBSERVATION_VARIABLES)
+        if unknown:
+            raise ValueError(f"Variáveis desconhecidas: {sorted(unknown)}")
+        return self.dao.list_values(station_ids, variables, start=start, end=end)
+
+    def stream_values(
+        self,
+        station_ids: Sequence[int],
+        variables: Sequence[str],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = 50_000,
+    ) -> Iterator[Sequence[Row[Any]]]:
+        """``find_values`` in batches, from a server-side cursor."""
+        unknown = set(variables) - set(OBSERVATION_VARIABLES)
+        if unknown:
+            raise ValueError(f"Variáveis desconhecidas: {sorted(unknown)}")
+        return self.dao.iter_values(
+            station_ids, variables, start=start, end=end, batch_size=batch_size
+        )
+
+    def time_spans(
+        self, station_ids: Sequence[int]
+    ) -> dict[int, tuple[datetime, datetime]]:
+        return self.dao.datetime_ranges(station_ids)
+
+    def export_batches(
+        self,
+        station_id: int,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = 50_000,
+    ) -> Iterator[Sequence[Row[Any]]]:
+        """Observation rows with station metadata, see ``EXPORT_COLUMNS``."""
+        return self.dao.iter_export(
+            station_id, start=start, end=end, batch_size=batch_size
+        )
+
+    def load_hourly(
+        self,
+        station_ids: Sequence[int],
+        variables: Sequence[str],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> HourlyArray:
+        """Load ``variables`` for ``station_ids`` into a dense hourly array.
+
+        The time axis spans ``[start, end)`` when both are given, otherwise
+        the range actually present in the database.
+        """
+        unknown = set(variables) - set(OBSERVATION_VARIABLES)
+        if unknown:
+            raise ValueError(f"Variáveis desconhecidas: {sorted(unknown)}")
+        ids = tuple(sorted(set(station_ids)))
+        rows = self.dao.list_values(ids, variables, start=start, end=end)
+
+        row_stations = np.fromiter(
+            (row[0] for row in rows), dtype=np.int64, count=len(rows)
+        )
+        row_times = np.array(
+            [row[1] for row in rows], dtype="datetime64[h]"
+        ).reshape(len(rows))
+        row_values = np.array(
+            [row[2:] for row in rows], dtype=np.float64
+        ).reshape(len(rows), len(variables))
+
+        if start:
+            first = np.datetime64(start, "h")
+        else:
+            first = row_times.min() if rows else None
+        if end:
+            last = _ceil_hour(end)
+        else:
+            last = row_times.max() + 1 if rows else None
+        if first is None or last is None:
+            times = np.array([], dtype="datetime64[h]")
+        else:
+            times = np.arange(first, last, dtype="datetime64[h]")
+
+        n_hours = len(times)
+        values = np.full((n_hours, len(ids), len(variables)), np.nan)
+        if rows:
+            hour_index = (row_times - times[0]).astype(np.int64)
+            station_index = np.searchsorted(np.asarray(ids), row_stations)
+            values[hour_index, station_index, :] = row_values
+        return HourlyArray(
+            times=times,
+            station_ids=ids,
+            variables=tuple(variables),
+            values=values,
+        )
+
+    def hourly_axis(
+        self,
+        station_ids: Sequence[int],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> npt.NDArray[np.datetime64]:
+        """The time axis ``load_hourly`` would use, without loading rows."""
+        first, last = start, end
+        if not start or not end:
+            first, last = self.time_span(station_ids)
+            if first is None or last is None:
+                return np.array([], dtype="datetime64[h]")
+        lower = np.datetime64(start or first, "h")
+        upper = _ceil_hour(end) if end else np.datetime64(last, "h") + 1
+        return np.arange(lower, upper, dtype="datetime64[h]")
+
+    def iter_hourly(
+        self,
+        station_ids: Sequence[int],
+        variables: Sequence[str],
+        times: npt.NDArray[np.datetime64],
+        *,
+        batch_size: int = 50_000,
+    ) -> Iterator[
+        tuple[
+            npt.NDArray[np.int64], npt.NDArray[np.intp], npt.NDArray[np.float64]
+        ]
+    ]:
+        """Stream readings within ``times`` as ``(hour, station, values)``.
+
+        ``hour`` indexes ``times`` and ``station`` the sorted
+        ``station_ids``; ``values`` has one column per variable. Only one
+        batch of rows is held at a time, so callers can fill arrays of any
+        size, e.g. in shared memory, without the copy ``load_hourly`` makes.
+        """
+        unknown = set(variables) - set(OBSERVATION_VARIABLES)
+        if unknown:
+            raise ValueError(f"Variáveis desconhecidas: {sorted(unknown)}")
+        if not len(times):
+            return
+        ids = np.asarray(sorted(set(station_ids)))
+        for rows in self.dao.iter_values(
+            ids.tolist(),
+            variables,
+            start=times[0].astype(datetime),
+            end=(times[-1] + 1).astype(datetime),
+            batch_size=batch_size,
+        ):
+            row_times = np.array(
+                [row[1] for row in rows], dtype="datetime64[h]"
+            )
+            yield (
+                (row_times - times[0]).astype(np.int64),
+                np.searchsorted(
+                    ids, np.fromiter((row[0] for row in rows), np.int64)
+                ),
+                np.array([row[2:] for row in rows], dtype=np.float64).reshape(
+                    len(rows), len(variables)
+                ),
+            )
+
+    def aggregate(
+        self,
+        station_ids: Sequence[int],
+        aggregates: Mapping[str, Sequence[Aggregate]],
+        *,
+        bucket: Bucket = "day",
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> BucketArray:
+        """Aggregate variables per ``bucket`` in the database.
+
+        ``aggregates`` maps variables to the aggregates wanted for each, e.g.
+        ``{"precipitation": ["sum"], "air_temperature": ["mean", "max"]}``.
+        Only one row per station and bucket leaves the database, instead of
+        every hourly reading as with ``load_hourly``.
+        """
+        unknown = set(aggregates) - set(OBSERVATION_VARIABLES)
+        if unknown:
+            raise ValueError(f"Variáveis desconhecidas: {sorted(unknown)}")
+        invalid = {
+            name for names in aggregates.values() for name in names
+        } - set(AGGREGATES)
+        if invalid:
+            raise ValueError(f"Agregações desconhecidas: {sorted(invalid)}")
+        unit = BUCKET_UNITS[bucket]
+        columns = tuple(
+            f"{variable}_{name}"
+            for variable, names in aggregates.items()
+            for name in names
+        )
+        ids = tuple(sorted(set(station_ids)))
+        rows = self.dao.aggregate(
+            ids, aggregates, bucket=bucket, start=start, end=end
+        )
+
+        row_stations = np.fromiter(
+            (row[0] for row in rows), dtype=np.int64, count=len(rows)
+        )
+        row_times = np.array(
+            [row[1] for row in rows], dtype=f"datetime64[{unit}]"
+        ).reshape(len(rows))
+        row_values = np.array(
+            [row[2:] for row in rows], dtype=np.float64
+        ).reshape(len(rows), len(columns))
+
+        if start:
+            first = np.datetime64(start, unit)
+        else:
+            first = row_times.min() if rows else None
+        if end:
+            last = _ceil(end, unit)
+        else:
+            last = row_times.max() + 1 if rows else None
+        if first is None or last is None:
+            times = np.array([], dtype=f"datetime64[{unit}]")
+        else:
+            times = np.arange(first, last, dtype=f"datetime64[{unit}]")
+
+        values = np.full((len(times), len(ids), len(columns)), np.nan)
+        if rows:
+            bucket_index = (row_times - times[0]).astype(np.int64)
+            station_index = np.searchsorted(np.asarray(ids), row_stations)
+            values[bucket_index, station_index, :] = row_values
+        return BucketArray(
+            times=times, station_ids=ids, columns=columns, values=values
+        )
+
+
+def _ceil(value: datetime, unit: str) -> np.datetime64:
+    """First ``unit`` boundary at or after ``value``."""
+    floor = np.datetime64(value, unit)
+    return floor if floor == np.datetime64(value, "us") else floor + 1
+
+
+def _ceil_hour(value: datetime) -> np.datetime64:
+    micros = np.datetime64(value, "us") + np.timedelta64(3_599_999_999, "us")
+    return micros.astype("datetime64[h]")
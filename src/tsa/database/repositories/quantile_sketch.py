@@ -0,0 +1,91 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+import numpy as np
+import numpy.typing as npt
+
+from ...sketches import TDigest, monthly_digests
+from ..daos import QuantileSketchDAO
+from ..models import QuantileSketch
+from .base import BaseRepository
+
+
+class QuantileSketchRepository(
+    BaseRepository[QuantileSketch, QuantileSketchDAO]
+):
+    dao_class = QuantileSketchDAO
+
+    def replace_monthly(
+        self,
+        station_id: int,
+        variable: str,
+        times: npt.NDArray[np.datetime64],
+        values: npt.NDArray[np.float64],
+    ) -> int:
+        """Store one digest per month of ``values``, replacing old ones.
+
+        Returns the number of months written.
+        """
+        digests = monthly_digests(times, values)
+        months = [month.astype(datetime) for month in digests]
+        months = [datetime(month.year, month.month, 1) for month in months]
+        self.dao.delete_months(station_id, variable, months)
+        self.dao.insert_many(
+            [
+                {
+                    "station_id": station_id,
+                    "variable": variable,
+                    "month": month,
+                    "count": int(digest.count),
+                    "digest": digest.to_bytes(),
+                }
+                for month, digest in zip(months, digests.values())
+            ]
+        )
+        return len(months)
+
+    def merged(
+        self,
+        variable: str,
+        *,
+        station_ids: Sequence[int] | None = None,
+        state_ids: Sequence[int] | None = None,
+        region_ids: Sequence[int] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> TDigest:
+        """Merge every stored digest in the selected stations and months."""
+        digests = [
+            TDigest.from_bytes(data)
+            for data in self.dao.list_digests(
+                variable,
+                station_ids=station_ids,
+                state_ids=state_ids,
+                region_ids=region_ids,
+                start=start,
+                end=end,
+            )
+        ]
+        return TDigest().merge(digests)
+
+    def quantiles(
+        self,
+        variable: str,
+        q: Sequence[float],
+        *,
+        station_ids: Sequence[int] | None = None,
+        state_ids: Sequence[int] | None = None,
+        region_ids: Sequence[int] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> npt.NDArray[np.float64]:
+        """Approximate percentiles without touching the observations."""
+        digest = self.merged(
+            variable,
+            station_ids=station_ids,
+            state_ids=state_ids,
+            region_ids=region_ids,
+            start=start,
+            end=end,
+        )
+        return digest.quantile(q)
@@ -1,3 +1,6 @@
+from typing import ClassVar, Hashable, Sequence
+
+from ...spatial import StationIndex
 from ..daos import StationDAO
 from ..models import Station
 from .base import BaseRepository
@@ -6,6 +9,8 @@ from .base import BaseRepository
 class StationRepository(BaseRepository[Station, StationDAO]):
     dao_class = StationDAO
 
+    _indexes: ClassVar[dict[Hashable, StationIndex]] = {}
+
     def get_by_code(self, code: str) -> Station | None:
         return self.dao.get_by_code(code)
 
@@ -30,3 +35,41 @@ class StationRepository(BaseRepository[Station, StationDAO]):
         if station:
             return self.dao.update(station, **data)
         return self.dao.create(code=code, **data)
+
+    def locations(
+        self,
+        *,
+        codes: Sequence[str] | None = None,
+        state_codes: Sequence[str] | None = None,
+        region_codes: Sequence[str] | None = None,
+    ) -> list[tuple[int, str, str, str]]:
+        return self.dao.list_locations(
+            codes=codes, state_codes=state_codes, region_codes=region_codes
+        )
+
+    def spatial_index(self, *, altitude_weight: float = 0.0) -> StationIndex:
+        """Nearest-neighbour index over all stations.
+
+        The index is shared across repositories and only rebuilt when the
+        stations table changes.
+        """
+        key = (
+            str(self.session.get_bind().url),
+            altitude_weight,
+            self.dao.fingerprint(),
+        )
+        index = self._indexes.get(key)
+        if index is None:
+            stations = [
+                station for station in self.dao.list() if station.id is not None
+            ]
+            index = StationIndex(
+                [station.id for station in stations],  # type: ignore[misc]
+                [station.latitude for station in stations],
+                [station.longitude for station in stations],
+                [station.altitude for station in stations],
+                altitude_weight=altitude_weight,
+            )
+            self._indexes.clear()
+            self._indexes[key] = index
+        return index
@@ -0,0 +1,24 @@
+from ..daos import StructuralModelDAO
+from ..models import StructuralModel
+from .base import BaseRepository
+
+
+class StructuralModelRepository(
+    BaseRepository[StructuralModel, StructuralModelDAO]
+):
+    dao_class = StructuralModelDAO
+
+    def get_for(self, station_id: int, variable: str) -> StructuralModel | None:
+        return self.dao.get_by_station_and_variable(station_id, variable)
+
+    def find_for_variable(self, variable: str) -> list[StructuralModel]:
+        return self.dao.list_by_variable(variable)
+
+    def save(
+        self, *, station_id: int, variable: str, **data: object
+    ) -> StructuralModel:
+        """Insert or replace the filter state of a station/variable."""
+        existing = self.dao.get_by_station_and_variable(station_id, variable)
+        if existing:
+            return self.dao.update(existing, **data)
+        return self.dao.create(station_id=station_id, variable=variable, **data)
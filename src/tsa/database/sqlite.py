@@ -0,0 +1,102 @@
+import logging
+import sqlite3
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+
+from sqlalchemy import Engine, Index, Table, event
+from sqlalchemy.pool import QueuePool
+from sqlmodel import create_engine
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "inmet"
+
+
+def sqlite_engine(path: Path, *, echo: bool = False) -> Engine:
+    """Engine over a SQLite file that stands in for the ``inmet`` schema.
+
+    Every connection opens an empty in-memory main database and attaches
+    ``path`` as ``inmet``, so the schema-qualified models and raw SQL work
+    unchanged. The file is put in WAL mode, so readers (``serve``, the
+    analyses) do not block a running load.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(
+        "sqlite://",
+        echo=echo,
+        poolclass=QueuePool,
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(engine, "connect", partial(_configure, path=path))
+    return engine
+
+
+def _configure(
+    connection: sqlite3.Connection, _: object, *, path: Path
+) -> None:
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"ATTACH DATABASE ? AS {SCHEMA}", (str(path),))
+        cursor.execute(f"PRAGMA {SCHEMA}.journal_mode = WAL")
+        cursor.execute(f"PRAGMA {SCHEMA}.synchronous = NORMAL")
+        cursor.execute("PRAGMA foreign_keys = ON")
+        cursor.execute("PRAGMA busy_timeout = 30000")
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def bulk_load(
+    engine: Engine,
+    *,
+    defer_indexes: Sequence[Table] = (),
+    cache_mib: int = 512,
+) -> Iterator[None]:
+    """Tune SQLite connections for a large load.
+
+    Inside the block, connections checked out from ``engine`` commit
+    without ``fsync`` (``synchronous = OFF``) and keep ``cache_mib`` MiB of
+    pages in memory, and the secondary indexes of ``defer_indexes`` are
+    dropped, to be built once at the end instead of updated row by row. A
+    crash mid-load can lose the last transactions but, with WAL, never
+    corrupts the file.
+
+    Sessions must be closed before the block ends. Does nothing on other
+    databases.
+    """
+    if engine.dialect.name != "sqlite":
+        yield
+        return
+
+    def tune(connection: sqlite3.Connection, *_: object) -> None:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA {SCHEMA}.synchronous = OFF")
+            cursor.execute(f"PRAGMA {SCHEMA}.cache_size = -{cache_mib * 1024}")
+            cursor.execute("PRAGMA temp_store = MEMORY")
+        finally:
+            cursor.close()
+
+    indexes: list[Index] = [
+        index
+        for table in defer_indexes
+        for index in table.indexes
+        if not index.unique
+    ]
+    with engine.begin() as connection:
+        for index in indexes:
+            index.drop(connection, checkfirst=True)
+    event.listen(engine, "checkout", tune)
+    try:
+        yield
+    finally:
+        event.remove(engine, "checkout", tune)
+        # Pooled connections keep their pragmas; start over with fresh ones.
+        engine.dispose()
+        with engine.begin() as connection:
+            for index in indexes:
+                logger.info("Criando o índice %s...", index.name)
+                index.create(connection, checkfirst=True)
+            connection.exec_driver_sql(f"PRAGMA {SCHEMA}.optimize")
@@ -0,0 +1,354 @@
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import threading
+from collections.abc import Buffer, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from sqlalchemy import Engine, Row
+from sqlmodel import Session
+
+from .database.daos.observation import EXPORT_COLUMNS
+from .database.repositories import ObservationRepository, StationRepository
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["parquet", "csv"]
+
+SUFFIXES: dict[ExportFormat, str] = {"parquet": ".parquet", "csv": ".csv.gz"}
+
+MANIFEST = "_manifest.jsonl"
+
+
+@dataclass(frozen=True)
+class ExportTask:
+    """One output file: a station-year.
+
+    ``latest`` is the station's latest reading in ``[start, end)`` when the
+    export was planned (``end`` if it has readings past the period), so a
+    file written before newer hours were ingested is not taken as complete.
+    """
+
+    station_id: int
+    station_code: str
+    state_code: str
+    region_code: str
+    year: int
+    start: datetime
+    end: datetime
+    latest: datetime
+
+    def path(self, fmt: ExportFormat) -> Path:
+        """Hive-style location, readable as a partitioned dataset."""
+        return (
+            Path(f"region={self.region_code}")
+            / f"state={self.state_code}"
+            / f"station={self.station_code}"
+            / f"{self.year}{SUFFIXES[fmt]}"
+        )
+
+
+@dataclass(frozen=True)
+class ExportSummary:
+    written: int
+    skipped: int
+    failed: int
+    rows: int
+
+
+def _arrow_schema() -> "pa.Schema":
+    import pyarrow as pa
+
+    types = {
+        "region_code": pa.string(),
+        "state_code": pa.string(),
+        "station_code": pa.string(),
+        "city": pa.string(),
+        "datetime": pa.timestamp("us"),
+    }
+    return pa.schema(
+        [(name, types.get(name, pa.float64())) for name in EXPORT_COLUMNS]
+    )
+
+
+class ObservationExporter:
+    """Write observations with station metadata as partitioned files.
+
+    Each station-year becomes one file under
+    ``region=<r>/state=<uf>/station=<code>/<year>.<ext>``, written by a
+    pool of workers that each hold their own database connection. Rows are
+    streamed from a server-side cursor (or ``COPY ... TO STDOUT`` for CSV
+    on PostgreSQL), so memory stays bounded by ``batch_size`` per worker.
+
+    Files are written to a temporary name and renamed when complete, and
+    every finished file is recorded in ``_manifest.jsonl``. Files whose
+    manifest entry already covers the requested period and the station's
+    latest reading in it are skipped, so an interrupted export resumes
+    where it stopped; files from a narrower ``start``/``end``, or written
+    before newer hours were ingested, are written again.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        root: Path,
+        *,
+        fmt: ExportFormat = "parquet",
+        workers: int = 4,
+        batch_size: int = 50_000,
+        compression: str = "zstd",
+    ) -> None:
+        self.engine = engine
+        self.root = root
+        self.fmt = fmt
+        self.workers = workers
+        self.batch_size = batch_size
+        self.compression = compression
+        self._manifest_lock = threading.Lock()
+
+    def plan(
+        self,
+        *,
+        station_codes: Sequence[str] | None = None,
+        state_codes: Sequence[str] | None = None,
+        region_codes: Sequence[str] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[ExportTask]:
+        """Station-years with observations matching the filters."""
+        with Session(self.engine) as session:
+            locations = StationRepository(session).locations(
+                codes=station_codes,
+                state_codes=state_codes,
+                region_codes=region_codes,
+            )
+            spans = ObservationRepository(session).time_spans(
+                [station_id for station_id, *_ in locations]
+            )
+        tasks = []
+        for station_id, code, state_code, region_code in locations:
+            if station_id not in spans:
+                continue
+            first, last = spans[station_id]
+            for year in range(first.year, last.year + 1):
+                year_start = datetime(year, 1, 1)
+                year_end = datetime(year + 1, 1, 1)
+                task_start = max(year_start, start) if start else year_start
+                task_end = min(year_end, end) if end else year_end
+                if task_start >= task_end:
+                    continue
+                tasks.append(
+                    ExportTask(
+                        station_id=station_id,
+                        station_code=code,
+                        state_code=state_code,
+                        region_code=region_code,
+                        year=year,
+                        start=task_start,
+                        end=task_end,
+                        latest=min(last, task_end),
+                    )
+                )
+        return tasks
+
+    def _exported(self) -> dict[Path, tuple[datetime, datetime, datetime]]:
+        """Period and latest reading of each file, as of its last entry."""
+        manifest = self.root / MANIFEST
+        if not manifest.exists():
+            return {}
+        periods: dict[Path, tuple[datetime, datetime, datetime]] = {}
+        with manifest.open() as fp:
+            for line in fp:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by an interrupted run.
+                    continue
+                if "latest" not in entry:
+                    # Written before the latest reading was recorded.
+                    continue
+                periods[Path(entry["path"])] = (
+                    datetime.fromisoformat(entry["start"]),
+                    datetime.fromisoformat(entry["end"]),
+                    datetime.fromisoformat(entry["latest"]),
+                )
+        return periods
+
+    def _done(
+        self,
+        task: ExportTask,
+        exported: dict[Path, tuple[datetime, datetime, datetime]],
+    ) -> bool:
+        path = task.path(self.fmt)
+        if path not in exported or not (self.root / path).exists():
+            return False
+        start, end, latest = exported[path]
+        return start <= task.start and task.end <= end and task.latest <= latest
+
+    def run(self, tasks: Sequence[ExportTask]) -> ExportSummary:
+        exported = self._exported()
+        pending = [task for task in tasks if not self._done(task, exported)]
+        skipped = len(tasks) - len(pending)
+        if skipped:
+            logger.info("%d arquivos já exportados, ignorados.", skipped)
+        written = failed = rows = 0
+        executor = ThreadPoolExecutor(self.workers)
+        futures = {
+            executor.submit(self._export, task): task for task in pending
+        }
+        try:
+            for future in as_completed(futures):
+                task = futures[future]
+                try:
+                    count = future.result()
+                except Exception:
+                    failed += 1
+                    logger.exception(
+                        "Falha ao exportar %s.", task.path(self.fmt)
+                    )
+                    continue
+                written += 1
+                rows += count
+                logger.info(
+                    "%s: %d linhas (%d/%d).",
+                    task.path(self.fmt),
+                    count,
+                    written + failed,
+                    len(pending),
+                )
+        finally:
+            # On Ctrl+C, let running files finish but start no new ones;
+            # the next run picks up from there.
+            executor.shutdown(cancel_futures=True)
+        return ExportSummary(
+            written=written, skipped=skipped, failed=failed, rows=rows
+        )
+
+    def _export(self, task: ExportTask) -> int:
+        target = self.root / task.path(self.fmt)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f".{target.name}.partial")
+        try:
+            with Session(self.engine) as session:
+                if self.fmt == "parquet":
+                    count = self._write_parquet(session, task, partial)
+                elif session.get_bind().dialect.name == "postgresql":
+                    count = self._copy_csv(session, task, partial)
+                else:
+                    count = self._write_csv(session, task, partial)
+            os.replace(partial, target)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        self._record(task, target, count)
+        return count
+
+    def _batches(
+        self, session: Session, task: ExportTask
+    ) -> Iterator[Sequence[Row[Any]]]:
+        return ObservationRepository(session).export_batches(
+            task.station_id,
+            start=task.start,
+            end=task.end,
+            batch_size=self.batch_size,
+        )
+
+    def _write_parquet(
+        self, session: Session, task: ExportTask, path: Path
+    ) -> int:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _arrow_schema()
+        count = 0
+        with pq.ParquetWriter(
+            path, schema, compression=self.compression
+        ) as writer:
+            for batch in self._batches(session, task):
+                columns = list(zip(*batch))
+                writer.write_table(
+                    pa.Table.from_arrays(
+                        [
+                            pa.array(column, type=field.type)
+                            for column, field in zip(columns, schema)
+                        ],
+                        schema=schema,
+                    )
+                )
+                count += len(batch)
+        return count
+
+    def _write_csv(self, session: Session, task: ExportTask, path: Path) -> int:
+        count = 0
+        with gzip.open(path, "wt", newline="", encoding="utf-8") as fp:
+            writer = csv.writer(fp)
+            writer.writerow(EXPORT_COLUMNS)
+            for batch in self._batches(session, task):
+                writer.writerows(_csv_row(row) for row in batch)
+                count += len(batch)
+        return count
+
+    def _copy_csv(self, session: Session, task: ExportTask, path: Path) -> int:
+        """Let PostgreSQL render the CSV with ``COPY ... TO STDOUT``."""
+        statement = ObservationRepository(session).dao.export_statement(
+            task.station_id, start=task.start, end=task.end
+        )
+        connection = session.connection()
+        compiled = statement.compile(dialect=connection.dialect)
+        cursor = connection.connection.cursor()
+        try:
+            query = cursor.mogrify(compiled.string, compiled.params).decode()
+            with gzip.open(path, "wb") as raw:
+                counter = _LineCounter(raw)
+                cursor.copy_expert(
+                    f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)",
+                    counter,
+                )
+        finally:
+            cursor.close()
+        return counter.lines - 1
+
+    def _record(self, task: ExportTask, path: Path, rows: int) -> None:
+        entry = {
+            **asdict(task),
+            "path": str(path.relative_to(self.root)),
+            "rows": rows,
+            "exported_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        line = json.dumps(entry, default=str)
+        with self._manifest_lock, (self.root / MANIFEST).open("a") as fp:
+            fp.write(line + "\n")
+
+
+def _csv_row(row: Row[Any]) -> list[object]:
+    return [
+        value.isoformat(sep=" ") if isinstance(value, datetime) else value
+        for value in row
+    ]
+
+
+class _LineCounter(io.RawIOBase):
+    """File wrapper that counts the lines ``copy_expert`` writes through it."""
+
+    def __init__(self, target: io.BufferedIOBase) -> None:
+        self.target = target
+        self.lines = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Buffer) -> int:
+        chunk = bytes(data)
+        self.lines += chunk.count(b"\n")
+        self.target.write(chunk)
+        return len(chunk)
@@ -0,0 +1,545 @@
+import logging
+import re
+import unicodedata
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+
+import chardet
+import pandas as pd
+from sqlmodel import Session, SQLModel, select, text
+
+from ._settings import settings
+from .analysis.derived import DerivedStage
+from .analysis.forecasting import ModelRegistry
+from .analysis.smoothing import OnlineSmoother
+from .database.connector import Connector
+from .database.models import (
+    OBSERVATION_VARIABLES,
+    City,
+    DerivedValue,
+    Observation,
+    QuantileSketch,
+    Region,
+    State,
+    Station,
+)
+from .database.repositories import (
+    DerivedValueRepository,
+    FittedModelRepository,
+    ObservationRepository,
+    QuantileSketchRepository,
+    StructuralModelRepository,
+)
+from .database.sqlite import bulk_load
+from .instrumentation import Profiler, RunMetrics, profiled
+
+logger = logging.getLogger(__name__)
+
+META_ROWS = 8
+CHUNK_SIZE = 500
+
+REGION_NAMES = {
+    "N": "Norte",
+    "NE": "Nordeste",
+    "CO": "Centro-Oeste",
+    "SE": "Sudeste",
+    "S": "Sul",
+}
+
+STATE_NAMES = {
+    "AC": "Acre",
+    "AL": "Alagoas",
+    "AP": "Amapá",
+    "AM": "Amazonas",
+    "BA": "Bahia",
+    "CE": "Ceará",
+    "DF": "Distrito Federal",
+    "ES": "Espírito Santo",
+    "GO": "Goiás",
+    "MA": "Maranhão",
+    "MT": "Mato Grosso",
+    "MS": "Mato Grosso do Sul",
+    "MG": "Minas Gerais",
+    "PA": "Pará",
+    "PB": "Paraíba",
+    "PR": "Paraná",
+    "PE": "Pernambuco",
+    "PI": "Piauí",
+    "RJ": "Rio de Janeiro",
+    "RN": "Rio Grande do Norte",
+    "RS": "Rio Grande do Sul",
+    "RO": "Rondônia",
+    "RR": "Roraima",
+    "SC": "Santa Catarina",
+    "SP": "São Paulo",
+    "SE": "Sergipe",
+    "TO": "Tocantins",
+}
+
+META_MAP = {
+    "regiao": "region_code",
+    "uf": "state_code",
+    "estacao": "station_name",
+    "codigo_wmo": "station_code",
+    "latitude": "latitude",
+    "longitude": "longitude",
+    "altitude": "altitude",
+    "data_de_fundacao": "start_date",
+}
+
+OBSERVATION_MAP = {
+    "precipitacao_total_horario_mm": "precipitation",
+    "pressao_atmosferica_ao_nivel_da_estacao_horaria_mb": "atmospheric_pressure",
+    "pressao_atmosferica_max_na_hora_ant_aut_mb": "prev_max_pressure",
+    "pressao_atmosferica_min_na_hora_ant_aut_mb": "prev_min_pressure",
+    "radiacao_global_kj_m2": "global_radiation",
+    "temperatura_do_ar_bulbo_seco_horaria_c": "air_temperature",
+    "temperatura_do_ponto_de_orvalho_c": "dew_point_temperature",
+    "temperatura_maxima_na_hora_ant_aut_c": "max_temperature",
+    "temperatura_minima_na_hora_ant_aut_c": "min_temperature",
+    "temperatura_orvalho_max_na_hora_ant_aut_c": "max_dew_point_temperature",
+    "temperatura_orvalho_min_na_hora_ant_aut_c": "min_dew_point_temperature",
+    "umidade_rel_max_na_hora_ant_aut": "max_relative_humidity",
+    "umidade_rel_min_na_hora_ant_aut": "min_relative_humidity",
+    "umidade_relativa_do_ar_horaria": "relative_humidity",
+    "vento_direcao_horaria_gr_gr": "wind_direction",
+    "vento_rajada_maxima_m_s": "max_wind_gust",
+    "vento_velocidade_horaria_m_s": "wind_speed",
+}
+
+COLUMNS = [
+    "data",
+    "hora_utc",
+    "precipitacao_total_horario_mm",
+    "pressao_atmosferica_ao_nivel_da_estacao_horaria_mb",
+    "pressao_atmosferica_max_na_hora_ant_aut_mb",
+    "pressao_atmosferica_min_na_hora_ant_aut_mb",
+    "radiacao_global_kj_m2",
+    "temperatura_do_ar_bulbo_seco_horaria_c",
+    "temperatura_do_ponto_de_orvalho_c",
+    "temperatura_maxima_na_hora_ant_aut_c",
+    "temperatura_minima_na_hora_ant_aut_c",
+    "temperatura_orvalho_max_na_hora_ant_aut_c",
+    "temperatura_orvalho_min_na_hora_ant_aut_c",
+    "umidade_rel_max_na_hora_ant_aut",
+    "umidade_rel_min_na_hora_ant_aut",
+    "umidade_relativa_do_ar_horaria",
+    "vento_direcao_horaria_gr_gr",
+    "vento_rajada_maxima_m_s",
+    "vento_velocidade_horaria_m_s",
+]
+
+
+@dataclass(frozen=True)
+class StationMetadata:
+    region_code: str
+    state_code: str
+    station_name: str
+    station_code: str
+    latitude: float
+    longitude: float
+    altitude: float
+    start_date: str | None
+    city_name: str | None
+
+
+def find_encoding(file_path: Path) -> str:
+    with file_path.open("rb") as f:
+        raw_data = f.read(10000)
+    result = chardet.detect(raw_data)
+    encoding = result["encoding"] or "utf-8"
+    return encoding
+
+
+def normalize_token(value: str) -> str:
+    normalized = (
+        unicodedata.normalize("NFKD", value)
+        .encode("ascii", "ignore")
+        .decode("ascii")
+    )
+    normalized = normalized.lower()
+    normalized = normalized.removesuffix("(yyyy-mm-dd)")
+    normalized = re.sub(r"[^a-z0-9]+", "_", normalized)
+    return normalized.strip("_")
+
+
+def parse_metadata(csv_path: Path) -> StationMetadata:
+    values: dict[str, str] = {}
+    with csv_path.open(encoding="latin-1") as fp:
+        for _ in range(META_ROWS):
+            line = fp.readline()
+            if not line:
+                break
+            parts = line.strip().split(";", maxsplit=1)
+            if len(parts) != 2:
+                continue
+
+            label, raw_value = parts
+            label = normalize_token(label.rstrip(":"))
+            if label in META_MAP:
+                values[META_MAP[label]] = raw_value.strip()
+
+    station_code = values.get("station_code")
+    if not station_code:
+        raise ValueError(f"Código da estação não encontrado em {csv_path.name}")
+
+    return StationMetadata(
+        region_code=values.get("region_code", "").upper(),
+        state_code=values.get("state_code", "").upper(),
+        station_name=values.get("station_name", "").title(),
+        station_code=station_code.upper(),
+        latitude=_to_float(values.get("latitude")),
+        longitude=_to_float(values.get("longitude")),
+        altitude=_to_float(values.get("altitude")),
+        start_date=values.get("start_date"),
+        city_name=infer_city_name(csv_path),
+    )
+
+
+def infer_city_name(csv_path: Path) -> str | None:
+    parts = csv_path.stem.split("_")
+    if len(parts) < 6:
+        return None
+    city_parts = parts[4:5]
+    if not city_parts:
+        return None
+    city = " ".join(part.replace("-", " ") for part in city_parts).strip()
+    return city.title() if city else None
+
+
+def _to_float(raw: str) -> float:
+    raw = raw.replace(",", ".")
+    return float(raw)
+
+
+def load_observations(
+    csv_path: Path, encoding: str | None = None
+) -> pd.DataFrame:
+    encoding = encoding or find_encoding(csv_path)
+    df = pd.read_csv(  # type: ignore[call-overload]
+        csv_path,
+        sep=";",
+        skiprows=META_ROWS,
+        encoding=encoding,
+        decimal=",",
+        na_values=["-9999", -9999],
+        engine="python",
+    )
+    df = df.loc[:, ~df.columns.str.contains("^Unnamed", case=False, na=False)]
+    # normalized_cols = [normalize_token(str(col)) for col in df.columns]
+    df.columns = COLUMNS
+    df = df.dropna(how="all", subset=OBSERVATION_MAP)
+
+    required = {"data", "hora_utc"}
+    if not required.issubset(set(df.columns)):
+        missing = required - set(df.columns)
+        raise ValueError(
+            f"Colunas obrigatórias ausentes em {csv_path.name}: {missing}"
+        )
+
+    df = df.assign(
+        datetime=pd.to_datetime(
+            df["data"].str.replace("/", "-") + " " + df["hora_utc"],
+            format="%Y-%m-%d %H:%M",
+            errors="coerce",
+        )
+    )
+    df = df.dropna(subset=["datetime"])
+
+    rename_map = {
+        source: target
+        for source, target in OBSERVATION_MAP.items()
+        if source in df.columns
+    }
+    df = df.rename(columns=rename_map)
+    return df[["datetime", *rename_map.values()]]
+
+
+def ensure_region(session: Session, code: str) -> Region:
+    region = session.exec(select(Region).where(Region.code == code)).first()
+    if region:
+        return region
+    region = Region(code=code, name=REGION_NAMES.get(code, code))
+    session.add(region)
+    session.commit()
+    session.refresh(region)
+    return region
+
+
+def ensure_state(session: Session, code: str, region_id: int) -> State:
+    state = session.exec(select(State).where(State.code == code)).first()
+    if state:
+        if state.region_id != region_id:
+            state.region_id = region_id
+            session.add(state)
+            session.commit()
+            session.refresh(state)
+        return state
+    state = State(
+        code=code,
+        name=STATE_NAMES.get(code, code),
+        region_id=region_id,
+    )
+    session.add(state)
+    session.commit()
+    session.refresh(state)
+    return state
+
+
+def ensure_city(session: Session, name: str, state_id: int) -> City:
+    statement = select(City).where(City.name == name, City.state_id == state_id)
+    logger.debug("Ensuring city with statement: %s", statement)
+    city = session.exec(statement).first()
+    logger.debug("City found: %r", city)
+    if city:
+        return city
+    city = City(name=name, state_id=state_id)
+    session.add(city)
+    session.commit()
+    session.refresh(city)
+    return city
+
+
+def ensure_station(
+    session: Session, metadata: StationMetadata, state_id: int, city_id: int
+) -> Station:
+    station = session.exec(
+        select(Station).where(Station.code == metadata.station_code)
+    ).first()
+    if station:
+        station.latitude = metadata.latitude
+        station.longitude = metadata.longitude
+        station.altitude = metadata.altitude
+        station.city_id = city_id
+        station.state_id = state_id
+        session.add(station)
+        session.commit()
+        session.refresh(station)
+        logger.debug("Updated station %s in database.", station)
+        return station
+
+    station = Station(
+        code=metadata.station_code,
+        latitude=metadata.latitude,
+        longitude=metadata.longitude,
+        altitude=metadata.altitude,
+        city_id=city_id,
+        state_id=state_id,
+    )
+    session.add(station)
+    session.commit()
+    session.refresh(station)
+    return station
+
+
+def observation_rows(
+    rows: pd.DataFrame, station_id: int
+) -> list[dict[str, object]]:
+    """Column dicts for ``ObservationRepository.insert_rows``.
+
+    Much cheaper than building ``Observation`` models: values are converted
+    column by column and missing readings become ``None``.
+    """
+    columns = [column for column in OBSERVATION_VARIABLES if column in rows]
+    values = rows[columns].astype(object)
+    records = values.where(rows[columns].notna(), None).to_dict("records")
+    for record, timestamp in zip(
+        records, pd.DatetimeIndex(rows["datetime"]).to_pydatetime(), strict=True
+    ):
+        record["station_id"] = station_id
+        record["datetime"] = timestamp
+    return records
+
+
+def update_sketches(
+    repository: QuantileSketchRepository,
+    station_id: int,
+    observations_df: pd.DataFrame,
+) -> None:
+    """Replace the station's monthly sketches covered by the file.
+
+    INMET files hold whole station-years, so rebuilding every month they
+    touch from the file alone keeps reloading a file idempotent.
+    """
+    times = observations_df["datetime"].to_numpy(dtype="datetime64[ns]")
+    for variable in OBSERVATION_VARIABLES:
+        if variable not in observations_df:
+            continue
+        values = observations_df[variable].to_numpy(dtype=float)
+        repository.replace_monthly(station_id, variable, times, values)
+    repository.session.commit()
+
+
+def populate(
+    data_dir: Path,
+    pattern: str,
+    *,
+    truncate: bool = False,
+    update_models: bool = True,
+    sketches: bool = True,
+    derived: bool = True,
+    smooth: bool = True,
+    report: Path | None = None,
+    prometheus: Path | None = None,
+    profile: Profiler | None = None,
+    profile_file: str | None = None,
+) -> None:
+    """Load every CSV matching ``pattern`` and update the dependent tables."""
+    csv_files = sorted(data_dir.glob(pattern))
+    if not csv_files:
+        raise FileNotFoundError(
+            f"Nenhum CSV encontrado em {data_dir} usando padrão '{pattern}'."
+        )
+
+    connector = Connector(settings=settings.db)
+    engine = connector.engine
+    metrics = RunMetrics("populate-db")
+    metrics.attach(engine)
+    profile_target = profile_file or csv_files[0].name
+    profile_dir = next((p.parent for p in (report, prometheus) if p), Path())
+
+    # Without model or filter updates nothing reads observations back during
+    # the load, so on SQLite their index can be built once at the end.
+    deferred = [] if update_models or smooth else [Observation.__table__]
+    with (
+        bulk_load(engine, defer_indexes=deferred),  # type: ignore[list-item]
+        Session(engine) as session,
+    ):
+        registry = ModelRegistry(
+            FittedModelRepository(session), ObservationRepository(session)
+        )
+        sketch_repository = QuantileSketchRepository(session)
+        derived_stage = DerivedStage(
+            ObservationRepository(session), DerivedValueRepository(session)
+        )
+        smoother = OnlineSmoother(
+            StructuralModelRepository(session),
+            ObservationRepository(session),
+            DerivedValueRepository(session),
+        )
+        if truncate:
+            logger.info("Truncando tabelas...")
+            if connector.is_sqlite:
+                # No TRUNCATE ... CASCADE: empty every table, dependents
+                # first. Deleting every row also restarts the ids.
+                for sa_table in reversed(SQLModel.metadata.sorted_tables):
+                    session.exec(text(f"DELETE FROM {sa_table.fullname}"))  # type: ignore[call-overload]
+            else:
+                for table in [
+                    DerivedValue,
+                    QuantileSketch,
+                    Observation,
+                    Station,
+                    City,
+                    State,
+                    Region,
+                ]:
+                    qualified: str = table.__table__.fullname  # type: ignore[attr-defined]
+                    session.exec(  # type: ignore[call-overload]
+                        text(
+                            f"TRUNCATE TABLE {qualified} RESTART IDENTITY CASCADE"
+                        )
+                    )
+            session.commit()
+        for csv_path in csv_files:
+            logger.info("Processando %s...", csv_path.name)
+            try:
+                with ExitStack() as stack:
+                    if profile is not None and csv_path.name == profile_target:
+                        suffix = "prof" if profile == "cprofile" else "txt"
+                        output = profile_dir / f"{csv_path.stem}.{suffix}"
+                        stack.enter_context(profiled(profile, output))
+                    _load_file(
+                        session,
+                        csv_path,
+                        metrics,
+                        registry=registry if update_models else None,
+                        sketch_repository=sketch_repository
+                        if sketches
+                        else None,
+                        derived_stage=derived_stage if derived else None,
+                        smoother=smoother if smooth else None,
+                    )
+            except ValueError as e:
+                logger.error("Erro ao processar %s: %s", csv_path.name, e)
+                continue
+            finally:
+                # Rewritten after every file so long loads can be followed.
+                if report:
+                    metrics.write_json(report)
+                if prometheus:
+                    metrics.write_prometheus(prometheus)
+
+    summary = metrics.report()
+    logger.info(
+        "Banco populado com sucesso: %d observações em %.1f s (%.0f linhas/s).",
+        summary["rows"],
+        summary["seconds"],
+        summary["rows_per_second"],
+    )
+
+
+def _load_file(
+    session: Session,
+    csv_path: Path,
+    metrics: RunMetrics,
+    *,
+    registry: ModelRegistry | None,
+    sketch_repository: QuantileSketchRepository | None,
+    derived_stage: DerivedStage | None,
+    smoother: OnlineSmoother | None,
+) -> None:
+    """Load one CSV, timing each stage in ``metrics``."""
+    with metrics.file(csv_path) as file_metrics:
+        with metrics.span("read"):
+            metadata = parse_metadata(csv_path)
+        logger.debug("metadata = %r", metadata)
+        with metrics.span("encoding"):
+            encoding = find_encoding(csv_path)
+        with metrics.span("parse", size=file_metrics.bytes) as stage:
+            observations_df = load_observations(csv_path, encoding)
+            stage.rows += len(observations_df)
+        file_metrics.rows = len(observations_df)
+        logger.info("%d observações carregadas.", len(observations_df))
+
+        with metrics.span("dimensions"):
+            region = ensure_region(session, metadata.region_code)
+            state = ensure_state(session, metadata.state_code, region.id)
+            city_name = metadata.city_name or metadata.station_name
+            city = ensure_city(session, city_name, state.id)
+            station = ensure_station(session, metadata, state.id, city.id)
+
+        observations = ObservationRepository(session)
+        with metrics.span("insert"):
+            rows = observation_rows(observations_df, station.id)
+        for offset in range(0, len(rows), CHUNK_SIZE):
+            chunk = rows[offset : offset + CHUNK_SIZE]
+            with metrics.span("insert", rows=len(chunk)):
+                observations.insert_rows(chunk)
+            with metrics.span("commit"):
+                session.commit()
+        if derived_stage is not None:
+            with metrics.span("derived", rows=len(observations_df)):
+                derived_stage.apply(
+                    station.id,
+                    observations_df["datetime"].to_numpy(
+                        dtype="datetime64[ns]"
+                    ),
+                    {
+                        column: observations_df[column].to_numpy(float)
+                        for column in derived_stage.inputs
+                        if column in observations_df
+                    },
+                )
+        if sketch_repository is not None:
+            with metrics.span("sketches", rows=len(observations_df)):
+                update_sketches(sketch_repository, station.id, observations_df)
+        if registry is not None:
+            with metrics.span("models"):
+                registry.update(station.id)
+        if smoother is not None:
+            with metrics.span("smoothing"):
+                smoother.update(station.id)
+        rate = file_metrics.rows / max(sum(file_metrics.stages.values()), 1e-9)
+        logger.info("%s: %.0f linhas/s.", csv_path.name, rate)
@@ -0,0 +1,301 @@
+import cProfile
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Literal
+
+from sqlalchemy import Engine, event
+
+Profiler = Literal["cprofile", "tracemalloc"]
+
+
+def peak_rss() -> int | None:
+    """Peak resident set size of this process in bytes, if available."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class StageMetrics:
+    seconds: float = 0.0
+    calls: int = 0
+    rows: int = 0
+    bytes: int = 0
+    round_trips: int = 0
+
+    def summary(self) -> dict[str, float]:
+        result: dict[str, float] = asdict(self)
+        if self.seconds > 0:
+            result["rows_per_second"] = self.rows / self.seconds
+            result["bytes_per_second"] = self.bytes / self.seconds
+        return result
+
+
+@dataclass
+class FileMetrics:
+    name: str
+    bytes: int
+    rows: int = 0
+    status: str = "ok"
+    stages: dict[str, float] = field(default_factory=dict)
+
+
+class RunMetrics:
+    """Timing spans and counters of a batch job.
+
+    ``span`` accumulates wall time, rows and bytes per stage; statements
+    sent through an ``attach``-ed engine are counted as round trips of the
+    innermost open span. ``file`` groups the spans of one input file. The
+    totals are exported as a JSON run report or as a Prometheus textfile
+    (for node_exporter's textfile collector).
+    """
+
+    def __init__(self, job: str) -> None:
+        self.job = job
+        self.started_at = datetime.now(UTC)
+        self._start = time.perf_counter()
+        self.stages: dict[str, StageMetrics] = {}
+        self.counters: dict[str, int] = {}
+        self.files: list[FileMetrics] = []
+        self._open: list[str] = []
+
+    def attach(self, engine: Engine) -> None:
+        """Count every statement executed on ``engine``."""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count(*_: object) -> None:
+            self.count("db_round_trips")
+            if self._open:
+                self._stage(self._open[-1]).round_trips += 1
+
+    def _stage(self, name: str) -> StageMetrics:
+        return self.stages.setdefault(name, StageMetrics())
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def span(
+        self, stage: str, *, rows: int = 0, size: int = 0
+    ) -> Iterator[StageMetrics]:
+        """Time the block as one call of ``stage``.
+
+        Rows only known inside the block can be added to the yielded
+        metrics.
+        """
+        metrics = self._stage(stage)
+        self._open.append(stage)
+        start = time.perf_counter()
+        try:
+            yield metrics
+        finally:
+            elapsed = time.perf_counter() - start
+            self._open.pop()
+            metrics.seconds += elapsed
+            metrics.calls += 1
+            metrics.rows += rows
+            metrics.bytes += size
+            if self.files and self.files[-1].status == "running":
+                stages = self.files[-1].stages
+                stages[stage] = stages.get(stage, 0.0) + elapsed
+
+    @contextmanager
+    def file(self, path: Path) -> Iterator[FileMetrics]:
+        """Group the spans of one input file; errors mark it as failed."""
+        metrics = FileMetrics(
+            name=path.name, bytes=path.stat().st_size, status="running"
+        )
+        self.files.append(metrics)
+        try:
+            yield metrics
+        except BaseException:
+            metrics.status = "error"
+            self.count("files_failed")
+            raise
+        else:
+            metrics.status = "ok"
+            self.count("files_loaded")
+
+    def _totals(self) -> tuple[float, int, int]:
+        elapsed = time.perf_counter() - self._start
+        rows = sum(f.rows for f in self.files)
+        size = sum(f.bytes for f in self.files)
+        return elapsed, rows, size
+
+    def report(self) -> dict[str, object]:
+        elapsed, rows, size = self._totals()
+        return {
+            "job": self.job,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "seconds": elapsed,
+            "rows": rows,
+            "bytes": size,
+            "rows_per_second": rows / elapsed,
+            "bytes_per_second": size / elapsed,
+            "peak_rss_bytes": peak_rss(),
+            "counters": dict(self.counters),
+            "stages": {name: m.summary() for name, m in self.stages.items()},
+            "files": [asdict(f) for f in self.files],
+        }
+
+    def write_json(self, path: Path) -> None:
+        _write_atomic(path, json.dumps(self.report(), indent=2))
+
+    def prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        prefix = f"tsa_{self.job.replace('-', '_')}"
+        elapsed, rows, size = self._totals()
+
+        def by_stage(attribute: str) -> dict[str, float]:
+            return {
+                f'{{stage="{name}"}}': getattr(stage, attribute)
+                for name, stage in self.stages.items()
+            }
+
+        metrics: list[tuple[str, str, str, dict[str, float]]] = [
+            (
+                "stage_seconds_total",
+                "counter",
+                "Wall time per stage.",
+                by_stage("seconds"),
+            ),
+            (
+                "stage_calls_total",
+                "counter",
+                "Spans per stage.",
+                by_stage("calls"),
+            ),
+            (
+                "stage_rows_total",
+                "counter",
+                "Rows handled per stage.",
+                by_stage("rows"),
+            ),
+            (
+                "stage_bytes_total",
+                "counter",
+                "Bytes read per stage.",
+                by_stage("bytes"),
+            ),
+            (
+                "stage_db_round_trips_total",
+                "counter",
+                "Statements sent to the database per stage.",
+                by_stage("round_trips"),
+            ),
+            *(
+                (f"{name}_total", "counter", f"Total {name}.", {"": value})
+                for name, value in sorted(self.counters.items())
+            ),
+            (
+                "duration_seconds",
+                "gauge",
+                "Duration of the run.",
+                {"": elapsed},
+            ),
+            (
+                "rows_per_second",
+                "gauge",
+                "Rows per second of the run.",
+                {"": rows / elapsed},
+            ),
+            (
+                "bytes_per_second",
+                "gauge",
+                "Bytes per second of the run.",
+                {"": size / elapsed},
+            ),
+            (
+                "last_run_timestamp_seconds",
+                "gauge",
+                "Start of the run (Unix time).",
+                {"": self.started_at.timestamp()},
+            ),
+        ]
+        rss = peak_rss()
+        if rss is not None:
+            metrics.append(
+                (
+                    "peak_rss_bytes",
+                    "gauge",
+                    "Peak resident set size.",
+                    {"": rss},
+                )
+            )
+
+        lines = []
+        for name, kind, help_text, samples in metrics:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(
+                f"{prefix}_{name}{labels} {value}"
+                for labels, value in samples.items()
+            )
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path) -> None:
+        # The textfile collector may read at any time, so never expose a
+        # partially written file.
+        _write_atomic(path, self.prometheus())
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fp:
+            fp.write(content)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def profiled(kind: Profiler, output: Path, *, top: int = 25) -> Iterator[None]:
+    """Profile the block with cProfile or tracemalloc and save the result.
+
+    cProfile stats are written in ``pstats`` format (open them with
+    ``python -m pstats`` or snakeviz); tracemalloc writes the ``top``
+    allocation sites as text.
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if kind == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(output)
+        return
+
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if not already_tracing:
+            tracemalloc.stop()
+        statistics = snapshot.statistics("lineno")[:top]
+        output.write_text(
+            f"peak traced: {peak / 2**20:.1f} MiB\n"
+            + "\n".join(str(stat) for stat in statistics)
+            + "\n"
+        )
@@ -1,12 +1,143 @@
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Literal, TextIO
 
+LogFormat = Literal["text", "json"]
 
-class Logger(logging.Logger):
-    def __init__(self, name: str, level: int = logging.INFO) -> None:
-        super().__init__(name, level)
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# Loggers configured by ``configure_logging``; third-party libraries keep
+# the root logger's WARNING level.
+PACKAGES = ("tsa", "cli")
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else came from ``extra=``.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message"}
+
+_listener: QueueListener | None = None
+_output: logging.Handler | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including fields passed with ``extra=``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, object] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        payload.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in _RECORD_ATTRIBUTES
         )
-        handler.setFormatter(formatter)
-        self.addHandler(handler)
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread.
+
+    ``QueueHandler.prepare`` runs the formatter on the calling thread so
+    records can be pickled; the queue here never leaves the process, so
+    only the message is merged with its arguments (they may be mutated
+    later) and timestamps, JSON encoding and tracebacks are rendered by
+    the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def configure_logging(
+    level: int | str | None = None,
+    *,
+    fmt: LogFormat | None = None,
+    stream: TextIO | None = None,
+) -> None:
+    """Configure logging for the ``tsa`` and ``cli`` packages.
+
+    This is the single configuration point: modules only call
+    ``logging.getLogger(__name__)``. Records go through a queue to a
+    background listener that writes them to ``stream`` (stderr by
+    default), so the threads doing the work never block on I/O. ``level``
+    and ``fmt`` default to the ``TSA_LOG_LEVEL`` (``INFO``) and
+    ``TSA_LOG_FORMAT`` (``text`` or ``json``) environment variables.
+    Calling it again replaces the previous configuration.
+    """
+    global _listener, _output
+
+    level = level or os.environ.get("TSA_LOG_LEVEL", "INFO").upper()
+    fmt = fmt or os.environ.get("TSA_LOG_FORMAT", "text")  # type: ignore[assignment]
+    if fmt not in ("text", "json"):
+        raise ValueError(f"Formato de log desconhecido: {fmt!r}")
+
+    if _listener is not None:
+        _listener.stop()
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, QueueHandler)]:
+        root.removeHandler(handler)
+    if _output is not None:
+        # Left on the root logger by a forked child, see _after_fork_in_child.
+        root.removeHandler(_output)
+
+    _output = logging.StreamHandler(stream or sys.stderr)
+    _output.setFormatter(
+        JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT)
+    )
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _listener = QueueListener(records, _output, respect_handler_level=True)
+    _listener.start()
+    root.addHandler(_DeferredQueueHandler(records))
+    for name in PACKAGES:
+        logging.getLogger(name).setLevel(level)
+
+
+@atexit.register
+def _flush() -> None:
+    # Drain the queue before the interpreter exits.
+    if _listener is not None:
+        _listener.stop()
+
+
+# Process pools fork workers on Linux. The listener thread is stopped
+# around the fork, so the child does not inherit a half-copied thread, and
+# the child writes its records directly: nothing would drain its copy of
+# the queue.
+def _before_fork() -> None:
+    if _listener is not None:
+        _listener.stop()
+
+
+def _after_fork_in_parent() -> None:
+    if _listener is not None:
+        _listener.start()
+
+
+def _after_fork_in_child() -> None:
+    global _listener
+    if _listener is None or _output is None:
+        return
+    _listener = None
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, QueueHandler)]:
+        root.removeHandler(handler)
+    root.addHandler(_output)
+
+
+os.register_at_fork(
+    before=_before_fork,
+    after_in_parent=_after_fork_in_parent,
+    after_in_child=_after_fork_in_child,
+)
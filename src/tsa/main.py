@@ -1,12 +1,15 @@
+import click
 from sqlmodel import Session, text
+
+from tsa import settings
 from tsa.database.connector import Connector
-from tsa.settings import Settings
 
-def main() -> None:
 
-    settings = Settings()
-    commector = Connector(settings=settings.db)
-    with Session(commector.engine) as session:
+@click.command()
+def main() -> None:
+    """Testa a conexão com o banco de dados."""
+    connector = Connector(settings=settings.db)
+    with Session(connector.engine) as session:
         stmt = text("SELECT 1, 2")
         result = session.exec(stmt)
-        print(f"Database connection test result: {result.all()}")
\ No newline at end of file
+        click.echo(f"Database connection test result: {result.all()}")
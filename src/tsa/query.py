@@ -0,0 +1,501 @@
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+from sqlalchemy import Select, and_, case
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import Session, col, select
+
+from .database.functions import (
+    AGGREGATES,
+    BUCKETS,
+    Aggregate,
+    Bucket,
+    time_bucket,
+)
+from .database.models import (
+    OBSERVATION_VARIABLES,
+    City,
+    Observation,
+    Region,
+    State,
+    Station,
+)
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+# Station metadata that can be selected next to the observations. They are
+# also columns of the exported Parquet files, see ``tsa.export``.
+LOCATION_COLUMNS = (
+    "region_code",
+    "state_code",
+    "station_code",
+    "city",
+    "latitude",
+    "longitude",
+    "altitude",
+)
+
+
+@dataclass(frozen=True)
+class _Plan:
+    station_codes: tuple[str, ...] = ()
+    state_codes: tuple[str, ...] = ()
+    region_codes: tuple[str, ...] = ()
+    start: datetime | None = None
+    end: datetime | None = None
+    locations: tuple[str, ...] = ()
+    variables: tuple[str, ...] = OBSERVATION_VARIABLES
+    masks: tuple[tuple[str, float | None, float | None], ...] = ()
+    bucket: Bucket | None = None
+    aggregates: tuple[tuple[str, Aggregate], ...] = ()
+    limit: int | None = None
+
+
+class ObservationQuery:
+    """Lazy, composable query over observations and station locations.
+
+    Each method returns a new query, so partial queries can be shared and
+    extended. Nothing runs until :meth:`collect` or :meth:`stream`; then
+    the whole chain becomes a single SQL statement (filters, joins with
+    only the tables needed, QC masks and ``GROUP BY`` all pushed to the
+    database) or, for a directory written by ``export``, a Parquet scan
+    that prunes partitions and reads only the projected columns.
+
+    >>> query = (
+    ...     ObservationQuery()
+    ...     .states("SP", "RJ")
+    ...     .period(datetime(2020, 1, 1), datetime(2021, 1, 1))
+    ...     .mask("air_temperature", low=-10, high=45)
+    ...     .resample("day", {"air_temperature": ["mean", "max"]})
+    ... )
+    >>> frame = query.collect(session)
+    """
+
+    def __init__(self, plan: _Plan | None = None) -> None:
+        self._plan = plan or _Plan()
+
+    def _with(self, **changes: object) -> "ObservationQuery":
+        return ObservationQuery(replace(self._plan, **changes))  # type: ignore[arg-type]
+
+    def stations(self, *codes: str) -> "ObservationQuery":
+        """Keep only these station codes; replaces a previous selection."""
+        return self._with(station_codes=tuple(codes))
+
+    def states(self, *codes: str) -> "ObservationQuery":
+        """Keep only stations in these UFs."""
+        return self._with(state_codes=tuple(code.upper() for code in codes))
+
+    def regions(self, *codes: str) -> "ObservationQuery":
+        """Keep only stations in these regions."""
+        return self._with(region_codes=tuple(code.upper() for code in codes))
+
+    def period(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> "ObservationQuery":
+        """Keep observations in ``[start, end)``."""
+        return self._with(start=start, end=end)
+
+    def select(self, *columns: str) -> "ObservationQuery":
+        """Project variables and location columns.
+
+        ``station_code`` and the time column are always part of the output.
+        """
+        unknown = (
+            set(columns) - set(OBSERVATION_VARIABLES) - set(LOCATION_COLUMNS)
+        )
+        if unknown:
+            raise ValueError(f"Colunas desconhecidas: {sorted(unknown)}")
+        return self._with(
+            locations=tuple(c for c in columns if c in LOCATION_COLUMNS),
+            variables=tuple(c for c in columns if c in OBSERVATION_VARIABLES),
+        )
+
+    def mask(
+        self,
+        variable: str,
+        *,
+        low: float | None = None,
+        high: float | None = None,
+    ) -> "ObservationQuery":
+        """Treat readings of ``variable`` outside ``[low, high]`` as missing.
+
+        Masked readings become null before any aggregation, so they do not
+        count towards means or ``count``. A new mask of the same variable
+        replaces the previous one.
+        """
+        if variable not in OBSERVATION_VARIABLES:
+            raise ValueError(f"Variável desconhecida: {variable!r}")
+        masks = tuple(m for m in self._plan.masks if m[0] != variable)
+        return self._with(masks=(*masks, (variable, low, high)))
+
+    def resample(
+        self, bucket: Bucket, aggregates: Mapping[str, Sequence[Aggregate]]
+    ) -> "ObservationQuery":
+        """Aggregate per station and ``bucket``.
+
+        Output columns are named ``<variable>_<aggregate>`` and replace the
+        selected variables; selected location columns are kept.
+        """
+        if bucket not in BUCKETS:
+            raise ValueError(f"Intervalo desconhecido: {bucket!r}")
+        unknown = set(aggregates) - set(OBSERVATION_VARIABLES)
+        if unknown:
+            raise ValueError(f"Variáveis desconhecidas: {sorted(unknown)}")
+        pairs = tuple(
+            (variable, name)
+            for variable, names in aggregates.items()
+            for name in names
+        )
+        invalid = {name for _, name in pairs} - set(AGGREGATES)
+        if invalid:
+            raise ValueError(f"Agregações desconhecidas: {sorted(invalid)}")
+        return self._with(bucket=bucket, aggregates=pairs)
+
+    def limit(self, rows: int) -> "ObservationQuery":
+        return self._with(limit=rows)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Columns of the result, in order."""
+        plan = self._plan
+        keys = (
+            "station_code",
+            *(c for c in plan.locations if c != "station_code"),
+        )
+        if plan.bucket:
+            return (*keys, "bucket", *(f"{v}_{a}" for v, a in plan.aggregates))
+        return (*keys, "datetime", *plan.variables)
+
+    # SQL
+
+    def statement(self) -> Select[Any]:
+        """The single SQL statement this query runs."""
+        plan = self._plan
+        locations: dict[str, ColumnElement[Any]] = {
+            "region_code": col(Region.code),
+            "state_code": col(State.code),
+            "station_code": col(Station.code),
+            "city": col(City.name),
+            "latitude": col(Station.latitude),
+            "longitude": col(Station.longitude),
+            "altitude": col(Station.altitude),
+        }
+        masks = {variable: (low, high) for variable, low, high in plan.masks}
+
+        def value(variable: str) -> ColumnElement[Any]:
+            column = col(getattr(Observation, variable))
+            if variable not in masks:
+                return column
+            low, high = masks[variable]
+            bounds = [
+                condition
+                for condition in (
+                    column >= low if low is not None else None,
+                    column <= high if high is not None else None,
+                )
+                if condition is not None
+            ]
+            if not bounds:
+                return column
+            return case((and_(*bounds), column), else_=None)
+
+        keys = [
+            locations[name].label(name)
+            for name in self.columns
+            if name in LOCATION_COLUMNS
+        ]
+        if plan.bucket:
+            bucket = time_bucket(plan.bucket, col(Observation.datetime))
+            statement = (
+                select(  # type: ignore[call-overload]
+                    *keys,
+                    bucket.label("bucket"),
+                    *(
+                        AGGREGATES[name](value(variable)).label(
+                            f"{variable}_{name}"
+                        )
+                        for variable, name in plan.aggregates
+                    ),
+                )
+                .group_by(*keys, bucket)
+                .order_by(col(Station.code), bucket)
+            )
+        else:
+            statement = select(  # type: ignore[call-overload]
+                *keys,
+                Observation.datetime,
+                *(value(v).label(v) for v in plan.variables),
+            ).order_by(col(Station.code), Observation.datetime)
+
+        # Join only what the filters and projection refer to.
+        used = set(self.columns) | {
+            name
+            for name, codes in (
+                ("state_code", plan.state_codes),
+                ("region_code", plan.region_codes),
+            )
+            if codes
+        }
+        statement = statement.join_from(
+            Observation, Station, col(Station.id) == Observation.station_id
+        )
+        if "city" in used:
+            statement = statement.join(City, col(City.id) == Station.city_id)
+        if used & {"state_code", "region_code"}:
+            statement = statement.join(State, col(State.id) == Station.state_id)
+        if "region_code" in used:
+            statement = statement.join(
+                Region, col(Region.id) == State.region_id
+            )
+
+        if plan.station_codes:
+            statement = statement.where(
+                col(Station.code).in_(plan.station_codes)
+            )
+        if plan.state_codes:
+            statement = statement.where(col(State.code).in_(plan.state_codes))
+        if plan.region_codes:
+            statement = statement.where(col(Region.code).in_(plan.region_codes))
+        if plan.start:
+            statement = statement.where(Observation.datetime >= plan.start)
+        if plan.end:
+            statement = statement.where(Observation.datetime < plan.end)
+        if plan.limit is not None:
+            statement = statement.limit(plan.limit)
+        return statement  # type: ignore[no-any-return]
+
+    # Parquet
+
+    def _dataset(self, root: Path) -> "ds.Dataset":
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        partitioning = ds.partitioning(
+            pa.schema(
+                [
+                    ("region", pa.string()),
+                    ("state", pa.string()),
+                    ("station", pa.string()),
+                ]
+            ),
+            flavor="hive",
+        )
+        return ds.dataset(root, format="parquet", partitioning=partitioning)
+
+    def _filter(self) -> "ds.Expression | None":
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        plan = self._plan
+        # Partition fields come from the directory names, so these prune
+        # whole files before anything is read.
+        conditions = [
+            ds.field(field).isin(codes)
+            for field, codes in (
+                ("station", plan.station_codes),
+                ("state", plan.state_codes),
+                ("region", plan.region_codes),
+            )
+            if codes
+        ]
+        if plan.start:
+            conditions.append(
+                ds.field("datetime")
+                >= pa.scalar(plan.start, pa.timestamp("us"))
+            )
+        if plan.end:
+            conditions.append(
+                ds.field("datetime") < pa.scalar(plan.end, pa.timestamp("us"))
+            )
+        if not conditions:
+            return None
+        expression = conditions[0]
+        for condition in conditions[1:]:
+            expression = expression & condition
+        return expression
+
+    def _scan_columns(self) -> list[str]:
+        plan = self._plan
+        keys = [c for c in self.columns if c in LOCATION_COLUMNS]
+        if plan.bucket:
+            variables = list(dict.fromkeys(v for v, _ in plan.aggregates))
+        else:
+            variables = list(plan.variables)
+        return [*keys, "datetime", *variables]
+
+    def _prepare(self, table: "pa.Table") -> "pa.Table":
+        """Apply masks and aggregation to a scanned table."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        plan = self._plan
+        for variable, low, high in plan.masks:
+            if variable not in table.column_names:
+                continue
+            values = table[variable]
+            keep = pc.is_valid(values)
+            if low is not None:
+                keep = pc.and_(keep, pc.greater_equal(values, low))
+            if high is not None:
+                keep = pc.and_(keep, pc.less_equal(values, high))
+            table = table.set_column(
+                table.schema.get_field_index(variable),
+                variable,
+                pc.if_else(keep, values, pa.scalar(None, values.type)),
+            )
+        if not plan.bucket:
+            return table.select(list(self.columns))
+        keys = [c for c in self.columns if c in LOCATION_COLUMNS]
+        table = table.append_column(
+            "bucket", pc.floor_temporal(table["datetime"], unit=plan.bucket)
+        )
+        # pyarrow names its outputs ``<column>_<function>``, as we do.
+        grouped = table.group_by([*keys, "bucket"]).aggregate(
+            [(variable, name) for variable, name in plan.aggregates]
+        )
+        return grouped.select(list(self.columns))
+
+    def _sort(self, table: "pa.Table") -> "pa.Table":
+        time = "bucket" if self._plan.bucket else "datetime"
+        return table.sort_by(
+            [("station_code", "ascending"), (time, "ascending")]
+        )
+
+    # Execution
+
+    def collect(self, source: Session | Path) -> pd.DataFrame:
+        """Run the query against a database session or Parquet directory."""
+        if isinstance(source, Session):
+            rows = source.exec(self.statement()).all()  # type: ignore[call-overload]
+            return pd.DataFrame(rows, columns=list(self.columns))
+        scanner = self._dataset(source).scanner(
+            columns=self._scan_columns(), filter=self._filter()
+        )
+        table = self._sort(self._prepare(scanner.to_table()))
+        if self._plan.limit is not None:
+            table = table.slice(0, self._plan.limit)
+        return table.to_pandas()
+
+    def stream(
+        self, source: Session | Path, *, batch_size: int = 50_000
+    ) -> Iterator[pd.DataFrame]:
+        """Run the query and yield the result in bounded chunks.
+
+        From a database, rows come from a server-side cursor where
+        supported. From Parquet, raw rows come one record batch at a time,
+        and aggregates one file at a time: files hold one station-year, so
+        no bucket spans two of them.
+        """
+        columns = list(self.columns)
+        if isinstance(source, Session):
+            statement = self.statement().execution_options(
+                stream_results=True, yield_per=batch_size
+            )
+            for rows in source.exec(statement).partitions():  # type: ignore[call-overload]
+                yield pd.DataFrame(rows, columns=columns)
+            return
+
+        import pyarrow as pa
+
+        remaining = self._plan.limit
+        dataset = self._dataset(source)
+        filter_ = self._filter()
+        fragments = sorted(
+            dataset.get_fragments(filter=filter_), key=lambda f: f.path
+        )
+        for fragment in fragments:
+            scanner = fragment.scanner(
+                schema=dataset.schema,
+                columns=self._scan_columns(),
+                filter=filter_,
+                batch_size=batch_size,
+            )
+            if self._plan.bucket:
+                tables = [self._sort(self._prepare(scanner.to_table()))]
+            else:
+                tables = (
+                    self._prepare(pa.Table.from_batches([batch]))
+                    for batch in scanner.to_batches()
+                )
+            for table in tables:
+                if remaining is not None:
+                    table = table.slice(0, remaining)
+                    remaining -= table.num_rows
+                if table.num_rows:
+                    yield table.to_pandas()
+                if remaining == 0:
+                    return
+
+    def explain(self, source: Session | Path | None = None) -> str:
+        """Describe the plan and, for a session, the database's own plan."""
+        plan = self._plan
+        lines = ["ObservationQuery"]
+        filters = [
+            f"{name} IN ({', '.join(codes)})"
+            for name, codes in (
+                ("station_code", plan.station_codes),
+                ("state_code", plan.state_codes),
+                ("region_code", plan.region_codes),
+            )
+            if codes
+        ]
+        if plan.start:
+            filters.append(f"datetime >= {plan.start.isoformat(sep=' ')}")
+        if plan.end:
+            filters.append(f"datetime < {plan.end.isoformat(sep=' ')}")
+        lines.append(f"  filter: {' AND '.join(filters) or '-'}")
+        for variable, low, high in plan.masks:
+            lines.append(
+                f"  mask: {variable} outside "
+                f"[{'-inf' if low is None else low}, "
+                f"{'inf' if high is None else high}] -> NULL"
+            )
+        if plan.bucket:
+            lines.append(
+                f"  aggregate: {plan.bucket} by "
+                f"{', '.join(c for c in self.columns if c in LOCATION_COLUMNS)}"
+            )
+        lines.append(f"  output: {', '.join(self.columns)}")
+        if plan.limit is not None:
+            lines.append(f"  limit: {plan.limit}")
+
+        if isinstance(source, Path):
+            dataset = self._dataset(source)
+            filter_ = self._filter()
+            files = list(dataset.get_fragments(filter=filter_))
+            lines.append("Parquet scan")
+            lines.append(f"  root: {source}")
+            lines.append(f"  files: {len(files)} after partition pruning")
+            lines.append(f"  columns: {', '.join(self._scan_columns())}")
+            lines.append(f"  predicate: {filter_}")
+            return "\n".join(lines)
+
+        dialect = (
+            source.get_bind().dialect
+            if source is not None
+            else postgresql.dialect()
+        )
+        sql = str(
+            self.statement().compile(
+                dialect=dialect, compile_kwargs={"literal_binds": True}
+            )
+        )
+        lines.append("SQL")
+        lines.extend(f"  {line}" for line in sql.splitlines())
+        if source is not None:
+            prefix = (
+                "EXPLAIN QUERY PLAN" if dialect.name == "sqlite" else "EXPLAIN"
+            )
+            result = source.connection().exec_driver_sql(f"{prefix} {sql}")
+            lines.append("Database plan")
+            lines.extend(
+                f"  {' | '.join(str(value) for value in row)}" for row in result
+            )
+        return "\n".join(lines)
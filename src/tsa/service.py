@@ -0,0 +1,473 @@
+import json
+import logging
+import socketserver
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import batched
+from pathlib import Path
+from typing import BinaryIO, TypeVar
+from urllib.parse import parse_qs, urlsplit
+
+from sqlalchemy import Engine, text
+from sqlmodel import Session
+
+from .database.models import OBSERVATION_VARIABLES
+from .database.repositories import (
+    ObservationRepository,
+    QuantileSketchRepository,
+    StationRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+NDJSON = "application/x-ndjson"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+@dataclass(frozen=True)
+class Table:
+    """Query result shared by every request that asked for it.
+
+    Streamed results have ``rows`` read lazily from a cursor; they belong
+    to a single request and name their Arrow ``types`` up front.
+    """
+
+    columns: tuple[str, ...]
+    rows: Iterable[Sequence[object]]
+    types: tuple[str, ...] | None = None
+
+
+class Coalescer:
+    """Run identical concurrent calls once and share the result.
+
+    The first caller for a key runs the function; callers arriving while
+    it is in flight wait for the same result instead of issuing the query
+    again. Nothing is kept once the call finishes, so results are never
+    stale.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: dict[Hashable, Future[object]] = {}
+
+    def run(self, key: Hashable, function: Callable[[], T]) -> tuple[T, bool]:
+        """Return the result and whether it came from another caller."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if future is None:
+                future = self._in_flight[key] = Future()
+        if not leader:
+            return future.result(), True  # type: ignore[return-value]
+        try:
+            result = function()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+
+@dataclass
+class EndpointMetrics:
+    requests: int = 0
+    coalesced: int = 0
+    errors: int = 0
+    latency_sum: float = 0.0
+    buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+
+
+class ServiceMetrics:
+    """Request counts, latency histograms and coalescing hit rate."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.queries = 0
+
+    def observe(
+        self, endpoint: str, seconds: float, *, coalesced: bool, error: bool
+    ) -> None:
+        with self._lock:
+            metrics = self.endpoints.setdefault(endpoint, EndpointMetrics())
+            metrics.requests += 1
+            metrics.coalesced += coalesced
+            metrics.errors += error
+            metrics.latency_sum += seconds
+            bucket = next(
+                (
+                    i
+                    for i, bound in enumerate(LATENCY_BUCKETS)
+                    if seconds <= bound
+                ),
+                len(LATENCY_BUCKETS),
+            )
+            metrics.buckets[bucket] += 1
+
+    def query_executed(self) -> None:
+        with self._lock:
+            self.queries += 1
+
+    def prometheus(self) -> str:
+        with self._lock:
+            endpoints = {
+                name: EndpointMetrics(
+                    m.requests,
+                    m.coalesced,
+                    m.errors,
+                    m.latency_sum,
+                    list(m.buckets),
+                )
+                for name, m in self.endpoints.items()
+            }
+            queries = self.queries
+        lines = [
+            "# HELP tsa_service_queries_total Queries sent to the database.",
+            "# TYPE tsa_service_queries_total counter",
+            f"tsa_service_queries_total {queries}",
+        ]
+        for name, help_text, attribute in (
+            ("requests_total", "Requests served.", "requests"),
+            (
+                "coalesced_total",
+                "Requests answered by a query already in flight.",
+                "coalesced",
+            ),
+            ("errors_total", "Requests that failed.", "errors"),
+        ):
+            lines.append(f"# HELP tsa_service_{name} {help_text}")
+            lines.append(f"# TYPE tsa_service_{name} counter")
+            lines.extend(
+                f'tsa_service_{name}{{endpoint="{endpoint}"}} '
+                f"{getattr(m, attribute)}"
+                for endpoint, m in endpoints.items()
+            )
+        lines.append(
+            "# HELP tsa_service_hit_ratio Share of requests served by "
+            "coalescing."
+        )
+        lines.append("# TYPE tsa_service_hit_ratio gauge")
+        lines.extend(
+            f'tsa_service_hit_ratio{{endpoint="{endpoint}"}} '
+            f"{m.coalesced / m.requests if m.requests else 0.0}"
+            for endpoint, m in endpoints.items()
+        )
+        lines.append(
+            "# HELP tsa_service_latency_seconds Request latency, including "
+            "serialization."
+        )
+        lines.append("# TYPE tsa_service_latency_seconds histogram")
+        for endpoint, m in endpoints.items():
+            cumulative = 0
+            for bound, count in zip(
+                (*LATENCY_BUCKETS, "+Inf"), m.buckets, strict=True
+            ):
+                cumulative += count
+                lines.append(
+                    f'tsa_service_latency_seconds_bucket{{endpoint="{endpoint}",'
+                    f'le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f'tsa_service_latency_seconds_sum{{endpoint="{endpoint}"}} '
+                f"{m.latency_sum}"
+            )
+            lines.append(
+                f'tsa_service_latency_seconds_count{{endpoint="{endpoint}"}} '
+                f"{m.requests}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+class QueryService:
+    """Read-only queries over the repositories, shared by many clients.
+
+    Every request borrows a connection from the engine's pool, runs in a
+    transaction that is never committed (and is marked read-only where the
+    database supports it), and goes through a :class:`Coalescer`, so a
+    burst of identical requests costs one query. Endpoints in ``streamed``
+    instead keep their connection while the response is written, reading
+    one cursor batch at a time, and are not coalesced.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.coalescer = Coalescer()
+        self.metrics = ServiceMetrics()
+        self.endpoints: dict[str, Callable[[dict[str, list[str]]], Table]] = {
+            "stations": self.stations,
+            "observations": self.observations,
+            "percentiles": self.percentiles,
+        }
+        self.streamed = {"observations"}
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        with Session(self.engine) as session:
+            dialect = self.engine.dialect.name
+            if dialect == "postgresql":
+                session.connection(
+                    execution_options={"postgresql_readonly": True}
+                )
+            elif dialect == "sqlite":
+                session.execute(text("PRAGMA query_only = ON"))
+            try:
+                yield session
+            finally:
+                session.rollback()
+
+    def query(
+        self, endpoint: str, params: dict[str, list[str]]
+    ) -> tuple[Table, bool]:
+        """Run ``endpoint`` with URL query ``params``, coalescing duplicates."""
+        handler = self.endpoints[endpoint]
+        if endpoint in self.streamed:
+            self.metrics.query_executed()
+            return handler(params), False
+        key = (
+            endpoint,
+            tuple(sorted((name, tuple(v)) for name, v in params.items())),
+        )
+
+        def run() -> Table:
+            self.metrics.query_executed()
+            return handler(params)
+
+        return self.coalescer.run(key, run)
+
+    def stations(self, params: dict[str, list[str]]) -> Table:
+        with self._session() as session:
+            locations = StationRepository(session).locations(
+                codes=params.get("code"),
+                state_codes=params.get("state"),
+                region_codes=params.get("region"),
+            )
+        return Table(("id", "code", "state_code", "region_code"), locations)
+
+    def observations(self, params: dict[str, list[str]]) -> Table:
+        station_ids = [int(v) for v in _required(params, "station")]
+        variables = params.get("variable") or list(OBSERVATION_VARIABLES)
+        unknown = set(variables) - set(OBSERVATION_VARIABLES)
+        if unknown:
+            raise ValueError(f"Variáveis desconhecidas: {sorted(unknown)}")
+        rows = self._observation_rows(
+            station_ids,
+            variables,
+            _datetime(params, "start"),
+            _datetime(params, "end"),
+        )
+        return Table(
+            ("station_id", "datetime", *variables),
+            rows,
+            ("int64", "timestamp[us]", *(["double"] * len(variables))),
+        )
+
+    def _observation_rows(
+        self,
+        station_ids: Sequence[int],
+        variables: Sequence[str],
+        start: datetime | None,
+        end: datetime | None,
+    ) -> Iterator[Sequence[object]]:
+        with self._session() as session:
+            for rows in ObservationRepository(session).stream_values(
+                station_ids, variables, start=start, end=end
+            ):
+                yield from rows
+
+    def percentiles(self, params: dict[str, list[str]]) -> Table:
+        variable = _required(params, "variable")[0]
+        q = [float(v) for v in params.get("q", ["0.05", "0.5", "0.95"])]
+        station_ids = [int(v) for v in params.get("station", [])]
+        with self._session() as session:
+            values = QuantileSketchRepository(session).quantiles(
+                variable,
+                q,
+                station_ids=station_ids or None,
+                start=_datetime(params, "start"),
+                end=_datetime(params, "end"),
+            )
+        return Table(("q", variable), list(zip(q, values.tolist())))
+
+
+def _required(params: dict[str, list[str]], name: str) -> list[str]:
+    if not params.get(name):
+        raise ValueError(f"Parâmetro obrigatório ausente: {name}")
+    return params[name]
+
+
+def _datetime(params: dict[str, list[str]], name: str) -> datetime | None:
+    values = params.get(name)
+    return datetime.fromisoformat(values[0]) if values else None
+
+
+def _json_default(value: object) -> object:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} não é serializável")
+
+
+def write_ndjson(table: Table, out: BinaryIO, chunk_rows: int = 5000) -> None:
+    for chunk in batched(table.rows, chunk_rows):
+        out.write(
+            "".join(
+                json.dumps(dict(zip(table.columns, row)), default=_json_default)
+                + "\n"
+                for row in chunk
+            ).encode()
+        )
+
+
+def write_arrow(table: Table, out: BinaryIO, chunk_rows: int = 65536) -> None:
+    import pyarrow as pa
+
+    chunks = batched(table.rows, chunk_rows)
+    first = next(chunks, ())
+    if table.types is not None:
+        schema = pa.schema(
+            [
+                (name, pa.type_for_alias(type_))
+                for name, type_ in zip(table.columns, table.types, strict=True)
+            ]
+        )
+    else:
+        columns = list(zip(*first)) or [() for _ in table.columns]
+        schema = pa.table(
+            {
+                name: pa.array(column)
+                for name, column in zip(table.columns, columns)
+            }
+        ).schema
+    with pa.ipc.new_stream(out, schema) as writer:
+        for chunk in (first, *chunks) if first else ():
+            writer.write_batch(
+                pa.record_batch(
+                    [
+                        pa.array(column, type=f.type)
+                        for column, f in zip(zip(*chunk), schema)
+                    ],
+                    schema=schema,
+                )
+            )
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """``GET /<endpoint>?...`` returning NDJSON, or Arrow IPC on request.
+
+    Arrow is chosen with ``?format=arrow`` or an ``Accept`` header of
+    ``application/vnd.apache.arrow.stream``. ``/metrics`` serves the
+    Prometheus metrics and ``/health`` a liveness check.
+    """
+
+    service: QueryService
+
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlsplit(self.path)
+        endpoint = url.path.strip("/")
+        params = parse_qs(url.query)
+        if endpoint == "health":
+            return self._send_text(HTTPStatus.OK, "ok\n")
+        if endpoint == "metrics":
+            return self._send_text(
+                HTTPStatus.OK, self.service.metrics.prometheus()
+            )
+
+        if endpoint not in self.service.endpoints:
+            return self._send_error(
+                HTTPStatus.NOT_FOUND, "Endpoint desconhecido."
+            )
+
+        fmt = params.pop("format", [""])[0]
+        arrow = fmt == "arrow" or ARROW_STREAM in self.headers.get("Accept", "")
+        start = time.perf_counter()
+        try:
+            table, coalesced = self.service.query(endpoint, params)
+        except Exception as e:
+            self.service.metrics.observe(
+                endpoint,
+                time.perf_counter() - start,
+                coalesced=False,
+                error=True,
+            )
+            if isinstance(e, ValueError):
+                return self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            logger.exception("Falha ao atender %s.", self.path)
+            return self._send_error(
+                HTTPStatus.INTERNAL_SERVER_ERROR, "Erro interno."
+            )
+
+        # Without a Content-Length the body streams until the connection
+        # closes, so large results never have to be serialized up front.
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", ARROW_STREAM if arrow else NDJSON)
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            (write_arrow if arrow else write_ndjson)(table, self.wfile)
+        finally:
+            self.service.metrics.observe(
+                endpoint,
+                time.perf_counter() - start,
+                coalesced=coalesced,
+                error=False,
+            )
+
+    def _send_text(self, status: HTTPStatus, body: str) -> None:
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        data = json.dumps({"error": message}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address.
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        logger.debug("%s %s", self.address_string(), format % args)
+
+
+class _UnixHTTPServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    daemon_threads = True
+
+
+def make_server(
+    service: QueryService,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Path | None = None,
+) -> socketserver.BaseServer:
+    """HTTP server on ``host:port`` or, if given, a Unix socket."""
+    handler = type("BoundQueryHandler", (QueryHandler,), {"service": service})
+    if socket_path is not None:
+        socket_path.unlink(missing_ok=True)
+        return _UnixHTTPServer(str(socket_path), handler)
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,261 @@
+import weakref
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from .database.repositories import HourlyArray, ObservationRepository
+
+FloatArray = npt.NDArray[np.float64]
+
+
+@dataclass(frozen=True)
+class SharedBlock:
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+@dataclass(frozen=True)
+class SharedHandle:
+    """Picklable description of a :class:`SharedDataset`.
+
+    This is all a worker receives; :func:`attach` maps the blocks it names.
+    """
+
+    times: SharedBlock
+    station_ids: tuple[int, ...]
+    variables: tuple[str, ...]
+    columns: tuple[SharedBlock, ...]
+
+
+class SharedView:
+    """Read-only arrays of a dataset, mapped from shared memory.
+
+    ``times`` is the hourly axis and :meth:`variable` the ``(hours,
+    stations)`` matrix of one variable, as in ``HourlyArray``; nothing is
+    copied.
+    """
+
+    def __init__(
+        self, handle: SharedHandle, blocks: Mapping[str, SharedMemory]
+    ) -> None:
+        self.handle = handle
+        self._blocks = dict(blocks)
+        self.times = self._array(handle.times)
+        self._columns = {
+            name: self._array(block)
+            for name, block in zip(
+                handle.variables, handle.columns, strict=True
+            )
+        }
+
+    def _array(self, block: SharedBlock) -> npt.NDArray[np.generic]:
+        array: npt.NDArray[np.generic] = np.ndarray(
+            block.shape,
+            dtype=np.dtype(block.dtype),
+            buffer=self._blocks[block.name].buf,
+        )
+        array.flags.writeable = False
+        return array
+
+    @property
+    def station_ids(self) -> tuple[int, ...]:
+        return self.handle.station_ids
+
+    @property
+    def variables(self) -> tuple[str, ...]:
+        return self.handle.variables
+
+    def variable(self, name: str) -> FloatArray:
+        """Return the ``(hours, stations)`` matrix of a single variable."""
+        return self._columns[name]  # type: ignore[return-value]
+
+    def column(self, name: str, station_id: int) -> FloatArray:
+        """Return the hourly series of one variable at one station."""
+        return self.variable(name)[:, self.station_ids.index(station_id)]
+
+
+# Views mapped by this process, so that every task a worker runs over the
+# same dataset reuses one mapping. Forked workers inherit the owner's view.
+_attached: dict[SharedHandle, SharedView] = {}
+
+
+def attach(handle: SharedHandle) -> SharedView:
+    """Map the dataset described by ``handle`` into this process."""
+    view = _attached.get(handle)
+    if view is None:
+        blocks = {
+            block.name: SharedMemory(name=block.name)
+            for block in (handle.times, *handle.columns)
+        }
+        view = _attached[handle] = SharedView(handle, blocks)
+    return view
+
+
+def detach(handle: SharedHandle) -> None:
+    """Forget this process's mapping of ``handle``, if any."""
+    _attached.pop(handle, None)
+
+
+def _release(handle: SharedHandle, blocks: Sequence[SharedMemory]) -> None:
+    detach(handle)
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            # Arrays still point into the block; the mapping goes with them.
+            pass
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedDataset:
+    """Station observations held once in shared memory.
+
+    Each variable is a ``(hours, stations)`` float64 block and the hourly
+    axis another one. Process pools submit :attr:`handle`, a few names and
+    shapes, and workers call :func:`attach` to read the same pages instead
+    of unpickling their own copy of the data.
+
+    Use it as a context manager; nested ``with`` blocks share the dataset
+    and the memory is unlinked when the outermost one exits (or, failing
+    that, when the dataset is garbage collected or the interpreter exits).
+    """
+
+    def __init__(
+        self,
+        times: npt.NDArray[np.datetime64],
+        station_ids: Sequence[int],
+        columns: Mapping[str, FloatArray | None],
+    ) -> None:
+        """Copy ``columns`` into new blocks; ``None`` leaves one all ``NaN``."""
+        blocks: list[SharedMemory] = []
+        descriptions: list[SharedBlock] = []
+        times = np.asarray(times, dtype="datetime64[h]")
+        empty = np.broadcast_to(np.nan, (len(times), len(station_ids)))
+        sources: list[npt.NDArray[np.generic]] = [
+            times,
+            *(
+                empty if values is None else np.asarray(values, np.float64)
+                for values in columns.values()
+            ),
+        ]
+        try:
+            for source in sources:
+                block = SharedMemory(create=True, size=max(source.nbytes, 1))
+                blocks.append(block)
+                target: npt.NDArray[np.generic] = np.ndarray(
+                    source.shape, dtype=source.dtype, buffer=block.buf
+                )
+                target[...] = source
+                del target
+                descriptions.append(
+                    SharedBlock(block.name, source.shape, source.dtype.str)
+                )
+        except BaseException:
+            for block in blocks:
+                block.close()
+                block.unlink()
+            raise
+        self.handle = SharedHandle(
+            times=descriptions[0],
+            station_ids=tuple(station_ids),
+            variables=tuple(columns),
+            columns=tuple(descriptions[1:]),
+        )
+        self._blocks = blocks
+        self.view = _attached[self.handle] = SharedView(
+            self.handle, {block.name: block for block in blocks}
+        )
+        self._references = 0
+        self._finalizer = weakref.finalize(self, _release, self.handle, blocks)
+
+    @classmethod
+    def from_hourly(cls, hourly: "HourlyArray") -> "SharedDataset":
+        return cls(
+            hourly.times,
+            hourly.station_ids,
+            {name: hourly.variable(name) for name in hourly.variables},
+        )
+
+    @classmethod
+    def load(
+        cls,
+        observations: "ObservationRepository",
+        station_ids: Sequence[int],
+        variables: Sequence[str],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> "SharedDataset":
+        """Load observations straight into shared memory.
+
+        The blocks are sized from the time axis and filled one batch of
+        rows at a time, so no private copy of the dataset is ever built.
+        """
+        ids = sorted(set(station_ids))
+        times = observations.hourly_axis(ids, start=start, end=end)
+        dataset = cls(times, ids, dict.fromkeys(variables))
+        try:
+            targets = [
+                dataset._writable(index) for index in range(len(variables))
+            ]
+            for hours, stations, values in observations.iter_hourly(
+                ids, variables, times
+            ):
+                for index, target in enumerate(targets):
+                    target[hours, stations] = values[:, index]
+            del targets
+        except BaseException:
+            dataset.close()
+            raise
+        return dataset
+
+    def _writable(self, index: int) -> FloatArray:
+        """Writable array over column ``index``, for the owner to fill."""
+        block = self.handle.columns[index]
+        return np.ndarray(
+            block.shape, dtype=np.float64, buffer=self._blocks[index + 1].buf
+        )
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def acquire(self) -> "SharedDataset":
+        if self.closed:
+            raise RuntimeError("Conjunto compartilhado já foi liberado.")
+        self._references += 1
+        return self
+
+    def release(self) -> None:
+        self._references -= 1
+        if self._references <= 0:
+            self.close()
+
+    def close(self) -> None:
+        """Unlink the blocks now; views handed out must not be used after."""
+        if self.closed:
+            return
+        del self.view
+        self._finalizer()
+
+    def __enter__(self) -> "SharedDataset":
+        return self.acquire()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.release()
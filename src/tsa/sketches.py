@@ -0,0 +1,147 @@
+from collections.abc import Iterable
+
+import numpy as np
+import numpy.typing as npt
+
+FloatArray = npt.NDArray[np.float64]
+
+DEFAULT_DELTA = 200.0
+
+_HEADER = np.dtype(np.float64)
+_BODY = np.dtype(np.float32)
+
+
+class TDigest:
+    """Mergeable quantile sketch (merging t-digest with the ``k1`` scale).
+
+    Centroids are kept sorted and compressed in one vectorized pass: after
+    sorting, every centroid is assigned to a unit interval of
+    ``k(q) = delta / (2 * pi) * asin(2q - 1)`` and each interval is merged
+    with ``np.add.reduceat``. The scale keeps centroids small near the tails,
+    so extreme percentiles stay accurate with about ``delta / 2`` centroids.
+    """
+
+    def __init__(
+        self,
+        means: FloatArray | None = None,
+        weights: FloatArray | None = None,
+        *,
+        delta: float = DEFAULT_DELTA,
+        minimum: float = np.inf,
+        maximum: float = -np.inf,
+    ) -> None:
+        self.delta = delta
+        self.means: FloatArray = (
+            np.empty(0) if means is None else np.asarray(means, np.float64)
+        )
+        self.weights: FloatArray = (
+            np.empty(0) if weights is None else np.asarray(weights, np.float64)
+        )
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def from_values(
+        cls, values: npt.ArrayLike, *, delta: float = DEFAULT_DELTA
+    ) -> "TDigest":
+        digest = cls(delta=delta)
+        digest.update(values)
+        return digest
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values: npt.ArrayLike) -> None:
+        """Add raw values, ignoring ``NaN``."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self._compress(
+            np.concatenate([self.means, values]),
+            np.concatenate([self.weights, np.ones(len(values))]),
+        )
+
+    def merge(self, others: Iterable["TDigest"]) -> "TDigest":
+        """Return a new digest combining this one with ``others``."""
+        digests = [self, *others]
+        merged = TDigest(
+            delta=self.delta,
+            minimum=min(digest.minimum for digest in digests),
+            maximum=max(digest.maximum for digest in digests),
+        )
+        merged._compress(
+            np.concatenate([digest.means for digest in digests]),
+            np.concatenate([digest.weights for digest in digests]),
+        )
+        return merged
+
+    def _compress(self, means: FloatArray, weights: FloatArray) -> None:
+        if not len(means):
+            self.means, self.weights = means, weights
+            return
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        quantile = (cumulative - weights / 2) / cumulative[-1]
+        scale = self.delta / (2 * np.pi) * np.arcsin(2 * quantile - 1)
+        group = np.floor(scale - scale[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q: npt.ArrayLike) -> FloatArray:
+        """Estimate the quantiles ``q`` (in ``[0, 1]``)."""
+        q = np.asarray(q, dtype=np.float64)
+        if not len(self.means):
+            return np.full(q.shape, np.nan)
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        return np.interp(
+            q * total,
+            np.r_[0.0, centers, total],
+            np.r_[self.minimum, self.means, self.maximum],
+        )
+
+    def to_bytes(self) -> bytes:
+        """Compact encoding: float64 min/max, then float32 means and weights."""
+        header = np.array([self.minimum, self.maximum], dtype=_HEADER)
+        body = np.concatenate([self.means, self.weights]).astype(_BODY)
+        return header.tobytes() + body.tobytes()
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, *, delta: float = DEFAULT_DELTA
+    ) -> "TDigest":
+        header_size = 2 * _HEADER.itemsize
+        minimum, maximum = np.frombuffer(data[:header_size], dtype=_HEADER)
+        body = np.frombuffer(data[header_size:], dtype=_BODY)
+        means, weights = np.split(body.astype(np.float64), 2)
+        return cls(
+            means,
+            weights,
+            delta=delta,
+            minimum=float(minimum),
+            maximum=float(maximum),
+        )
+
+
+def monthly_digests(
+    times: npt.NDArray[np.datetime64],
+    values: FloatArray,
+    *,
+    delta: float = DEFAULT_DELTA,
+) -> dict[np.datetime64, TDigest]:
+    """Build one digest per calendar month of ``values``."""
+    months = times.astype("datetime64[M]")
+    order = np.argsort(months, kind="stable")
+    unique, starts = np.unique(months[order], return_index=True)
+    groups = np.split(values[order], starts[1:])
+    digests = {
+        month: TDigest.from_values(group, delta=delta)
+        for month, group in zip(unique, groups)
+    }
+    return {month: digest for month, digest in digests.items() if digest.count}
@@ -0,0 +1,176 @@
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+EARTH_RADIUS_KM = 6371.0088
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+
+class StationIndex:
+    """Nearest-neighbour index over station coordinates.
+
+    Horizontal distances are great-circle (haversine) distances in km. With
+    a non-zero ``altitude_weight`` the distance becomes
+    ``sqrt(d_h**2 + (altitude_weight * d_z)**2)``, with ``d_z`` the altitude
+    difference in km, so stations at very different heights rank further
+    away. Queries stay exact because the penalized distance never undercuts
+    the haversine one used to search the tree.
+    """
+
+    def __init__(
+        self,
+        station_ids: Sequence[int],
+        latitude: Sequence[float],
+        longitude: Sequence[float],
+        altitude: Sequence[float],
+        *,
+        altitude_weight: float = 0.0,
+    ) -> None:
+        self.station_ids: IntArray = np.asarray(station_ids, dtype=np.int64)
+        self.altitude_km: FloatArray = np.asarray(altitude, float) / 1000.0
+        self.altitude_weight = altitude_weight
+        self._position = {
+            int(station_id): row
+            for row, station_id in enumerate(self.station_ids)
+        }
+        self._coordinates = np.radians(
+            np.column_stack([latitude, longitude]).astype(np.float64)
+        )
+        # Imported here so the repositories, which build indexes on demand,
+        # do not load scikit-learn on import.
+        from sklearn.neighbors import BallTree
+
+        self._tree = BallTree(self._coordinates, metric="haversine")
+
+    def __len__(self) -> int:
+        return len(self.station_ids)
+
+    def _targets(
+        self,
+        latitude: FloatArray | float,
+        longitude: FloatArray | float,
+        altitude: FloatArray | float | None,
+    ) -> tuple[FloatArray, FloatArray]:
+        points = np.radians(
+            np.column_stack(
+                [np.atleast_1d(latitude), np.atleast_1d(longitude)]
+            ).astype(np.float64)
+        )
+        if altitude is None:
+            heights = np.full(len(points), np.nan)
+        else:
+            heights = np.broadcast_to(
+                np.asarray(altitude, float) / 1000.0, len(points)
+            )
+        return points, heights
+
+    def _penalized(
+        self, horizontal: FloatArray, rows: IntArray, heights: FloatArray
+    ) -> FloatArray:
+        if not self.altitude_weight:
+            return horizontal
+        vertical = self.altitude_weight * (
+            self.altitude_km[rows] - heights[:, np.newaxis]
+        )
+        return np.hypot(horizontal, np.nan_to_num(vertical))
+
+    def query(
+        self,
+        latitude: FloatArray | float,
+        longitude: FloatArray | float,
+        k: int,
+        *,
+        altitude: FloatArray | float | None = None,
+    ) -> tuple[IntArray, FloatArray]:
+        """Return ids and distances (km) of the ``k`` nearest stations.
+
+        Both arrays have shape ``(points, k)`` and are sorted by distance.
+        """
+        points, heights = self._targets(latitude, longitude, altitude)
+        k = min(k, len(self))
+        n_candidates = k if not self.altitude_weight else min(2 * k, len(self))
+        ids = np.empty((len(points), k), dtype=np.int64)
+        distances = np.empty((len(points), k))
+        pending = np.arange(len(points))
+        while len(pending):
+            angles, rows = self._tree.query(points[pending], k=n_candidates)
+            horizontal = angles * EARTH_RADIUS_KM
+            effective = self._penalized(horizontal, rows, heights[pending])
+            order = np.argsort(effective, axis=1, kind="stable")[:, :k]
+            best = np.take_along_axis(effective, order, axis=1)
+            # A row is settled once its k-th distance cannot be beaten by a
+            # station outside the candidate set.
+            settled = (n_candidates == len(self)) | (
+                best[:, -1] <= horizontal[:, -1]
+            )
+            done = pending[settled]
+            ids[done] = self.station_ids[
+                np.take_along_axis(rows, order, axis=1)[settled]
+            ]
+            distances[done] = best[settled]
+            pending = pending[~settled]
+            n_candidates = min(2 * n_candidates, len(self))
+        return ids, distances
+
+    def query_radius(
+        self,
+        latitude: FloatArray | float,
+        longitude: FloatArray | float,
+        radius_km: float,
+        *,
+        altitude: FloatArray | float | None = None,
+    ) -> list[tuple[IntArray, FloatArray]]:
+        """Return ids and distances (km) of stations within ``radius_km``.
+
+        One ``(ids, distances)`` pair per query point, sorted by distance.
+        """
+        points, heights = self._targets(latitude, longitude, altitude)
+        rows_per_point, angles_per_point = self._tree.query_radius(
+            points,
+            r=radius_km / EARTH_RADIUS_KM,
+            return_distance=True,
+            sort_results=True,
+        )
+        results: list[tuple[IntArray, FloatArray]] = []
+        for rows, angles, height in zip(
+            rows_per_point, angles_per_point, heights
+        ):
+            effective = self._penalized(
+                angles[np.newaxis] * EARTH_RADIUS_KM,
+                rows,
+                np.array([height]),
+            )[0]
+            keep = effective <= radius_km
+            order = np.argsort(effective[keep], kind="stable")
+            results.append(
+                (self.station_ids[rows[keep][order]], effective[keep][order])
+            )
+        return results
+
+    def neighbours(
+        self, station_ids: Sequence[int], k: int
+    ) -> tuple[IntArray, FloatArray]:
+        """The ``k`` nearest other stations of each indexed station."""
+        rows = np.array(
+            [self._position[station_id] for station_id in station_ids]
+        )
+        latitude, longitude = np.degrees(self._coordinates[rows]).T
+        ids, distances = self.query(
+            latitude,
+            longitude,
+            k + 1,
+            altitude=self.altitude_km[rows] * 1000.0,
+        )
+        own = ids == np.asarray(station_ids)[:, np.newaxis]
+        # Drop each station from its own neighbour list, or the farthest
+        # candidate when duplicated coordinates push it out of first place.
+        own[~own.any(axis=1), -1] = True
+        keep = ~own
+        n_rows = len(rows)
+        return (
+            ids[keep].reshape(n_rows, -1),
+            distances[keep].reshape(n_rows, -1),
+        )